@@ -0,0 +1,314 @@
+"""
+Synthesis Cache for ReadAloud.
+
+This module provides a content-addressed on-disk cache of synthesized audio.
+Entries are keyed by a hash of the normalized text and every setting that
+changes the output (engine, model, voice, temperature, seed), and the cache
+is kept under a size limit by evicting the least recently used entries.
+
+The cache directory can be shared by several processes (CLI, web interface,
+Higgs service); recency is tracked through file modification times so every
+process sees the same LRU order.
+
+Entries can be stored as WAV, FLAC or Opus. The same class also serves as the
+archive tier for older outputs, typically with Opus and a longer retention.
+"""
+
+import os
+import json
+import time
+import uuid
+import shutil
+import hashlib
+import threading
+from typing import Optional, Dict, Any, Callable
+
+from .audio_utils import AUDIO_FORMATS, format_for_path, transcode, compressed_formats_available
+
+
+DEFAULT_CACHE_DIR = './audio_output/cache'
+DEFAULT_MAX_SIZE_MB = 500
+
+# Model behind each engine when its config section names none. Keys use model
+# names rather than install paths, so the CLI, web interface and Higgs service
+# build the same key for the same request.
+DEFAULT_MODELS = {
+    'higgs_audio': 'bosonai/higgs-audio-v2-generation-3B-base',
+    'coqui': 'tts_models/en/ljspeech/tacotron2-DDC'
+}
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text so trivially different inputs share a cache entry."""
+    return ' '.join(text.split())
+
+
+def make_cache_key(text: str, engine: str, model: str = '', voice: Optional[str] = None,
+                   temperature: Optional[float] = None, seed: Optional[int] = None) -> str:
+    """
+    Build the cache key for a synthesis request.
+
+    Args:
+        text: Text to synthesize
+        engine: Engine identifier ('higgs_audio', 'coqui', ...)
+        model: Model path or name
+        voice: Voice or reference audio ('default' is treated as no voice)
+        temperature: Sampling temperature
+        seed: Random seed
+
+    Returns:
+        Hex digest identifying the audio this request produces
+    """
+    if voice in ('', 'default'):
+        voice = None
+    if temperature is not None:
+        temperature = round(float(temperature), 4)
+
+    material = json.dumps(
+        [normalize_text(text), engine, model or '', voice, temperature, seed],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+
+def model_id(engine_id: str, engine_config: Optional[Dict[str, Any]] = None) -> str:
+    """Model identity of an engine for cache keys: its configured model name or the default."""
+    return (engine_config or {}).get('model_name') or DEFAULT_MODELS.get(engine_id, '')
+
+
+def key_for(engine_id: str, engine_config: Optional[Dict[str, Any]], text: str,
+            voice: Optional[str] = None, temperature: Optional[float] = None,
+            seed: Optional[int] = None) -> str:
+    """
+    Build the cache key for a request to an engine; every entry point uses this.
+
+    Args:
+        engine_id: Engine identifier ('higgs_audio', 'coqui', ...)
+        engine_config: The engine's config section ('higgs_config', 'coqui_config')
+        text: Text to synthesize
+        voice: Voice the engine is actually given (None if it uses its default)
+        temperature: Sampling temperature
+        seed: Random seed
+
+    Returns:
+        Hex digest identifying the audio this request produces
+    """
+    return make_cache_key(text, engine_id, model_id(engine_id, engine_config),
+                          voice=voice, temperature=temperature, seed=seed)
+
+
+class AudioCache:
+    """Content-addressed audio cache with LRU eviction."""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_size_mb: float = DEFAULT_MAX_SIZE_MB,
+                 enabled: bool = True, audio_format: str = 'wav', quality: Optional[float] = None,
+                 max_age_days: Optional[float] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding cached audio files
+            max_size_mb: Size limit; oldest entries are evicted beyond it
+            enabled: When False, lookups always miss and nothing is stored
+            audio_format: Storage format ('wav', 'flac' or 'opus')
+            quality: Compression level for FLAC/Opus, 0.0 to 1.0
+            max_age_days: Entries unused for longer than this are evicted
+        """
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.max_size = int(max_size_mb * 1024 * 1024)
+        self.enabled = enabled
+        self.quality = quality
+        self.max_age = max_age_days * 86400 if max_age_days else None
+
+        if audio_format not in AUDIO_FORMATS:
+            raise ValueError(f"Unknown cache format: {audio_format}")
+        if audio_format != 'wav' and not compressed_formats_available():
+            print(f"soundfile is not installed; storing cache entries as WAV instead of {audio_format}")
+            audio_format = 'wav'
+        self.format = audio_format
+        self.extension = AUDIO_FORMATS[audio_format][0]
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if self.enabled:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]] = None,
+                    default_dir: str = DEFAULT_CACHE_DIR) -> "AudioCache":
+        """Create a cache from a 'cache' configuration section."""
+        config = config or {}
+        return cls(
+            cache_dir=config.get('path') or default_dir,
+            max_size_mb=config.get('max_size_mb', DEFAULT_MAX_SIZE_MB),
+            enabled=config.get('enabled', True),
+            audio_format=config.get('format', 'wav'),
+            quality=config.get('quality'),
+            max_age_days=config.get('max_age_days')
+        )
+
+    def path_for(self, key: str) -> str:
+        """Location of the cache entry for a key."""
+        return os.path.join(self.cache_dir, f"{key}{self.extension}")
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached file for a key, or None on a miss."""
+        if not self.enabled:
+            return None
+
+        # Entries written before a format change are still valid
+        extensions = [self.extension] + [ext for ext, _, _ in AUDIO_FORMATS.values() if ext != self.extension]
+        for extension in extensions:
+            path = os.path.join(self.cache_dir, f"{key}{extension}")
+            try:
+                # Touch the entry so it becomes the most recently used
+                os.utime(path, None)
+            except OSError:
+                continue
+
+            self.hits += 1
+            return path
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, audio_path: str, move: bool = True) -> str:
+        """
+        Store an audio file under a key.
+
+        Args:
+            key: Cache key from make_cache_key
+            audio_path: Freshly synthesized file
+            move: Move the file into the cache instead of copying it
+
+        Returns:
+            Path of the cache entry (audio_path itself if caching is disabled)
+        """
+        if not self.enabled or not os.path.exists(audio_path):
+            return audio_path
+
+        path = self.path_for(key)
+        if os.path.abspath(audio_path) == path:
+            self.evict()
+            return path
+
+        # Write under a unique name and rename so readers never see a partial file
+        temp_path = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+        if format_for_path(audio_path) != self.format:
+            try:
+                transcode(audio_path, temp_path, self.format, self.quality)
+            except Exception:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+            if move:
+                os.remove(audio_path)
+        elif move:
+            try:
+                os.replace(audio_path, temp_path)
+            except OSError:
+                # Different filesystem
+                shutil.move(audio_path, temp_path)
+        else:
+            shutil.copyfile(audio_path, temp_path)
+        os.replace(temp_path, path)
+
+        self.evict()
+        return path
+
+    def get_or_create(self, key: str, synthesize: Callable[[str], str]) -> str:
+        """
+        Return the cached file for a key, synthesizing it on a miss.
+
+        Args:
+            key: Cache key from make_cache_key
+            synthesize: Called with a suggested output path; returns the file it wrote
+
+        Returns:
+            Path of the audio file
+        """
+        cached = self.get(key)
+        if cached:
+            return cached
+
+        if not self.enabled:
+            return synthesize(None)
+
+        temp_path = os.path.join(self.cache_dir, f"{key}.{uuid.uuid4().hex[:8]}.tmp.wav")
+        try:
+            return self.put(key, synthesize(temp_path))
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def export(self, cached_path: str, output_path: str) -> str:
+        """Copy a cache entry to a path, decoding it if the output extension asks for another format."""
+        if format_for_path(cached_path) == format_for_path(output_path):
+            shutil.copyfile(cached_path, output_path)
+        else:
+            transcode(cached_path, output_path)
+        return output_path
+
+    def _entries(self):
+        """List (mtime, size, path) for every cached file."""
+        entries = []
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.is_file() and not entry.name.endswith('.tmp') and '.tmp.' not in entry.name:
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            pass
+        return entries
+
+    def evict(self):
+        """Delete expired entries, then least recently used ones until the cache fits its size limit."""
+        with self._lock:
+            entries = self._entries()
+
+            if self.max_age:
+                cutoff = time.time() - self.max_age
+                for mtime, _, path in entries:
+                    if mtime < cutoff:
+                        try:
+                            os.remove(path)
+                        except OSError:
+                            pass
+                entries = [entry for entry in entries if entry[0] >= cutoff]
+
+            total = sum(size for _, size, _ in entries)
+            if total <= self.max_size:
+                return
+
+            for _, size, path in sorted(entries):
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    continue
+                if total <= self.max_size:
+                    break
+
+    def clear(self):
+        """Remove every cached file."""
+        for _, _, path in self._entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache usage statistics."""
+        entries = self._entries()
+        return {
+            'enabled': self.enabled,
+            'path': self.cache_dir,
+            'format': self.format,
+            'entries': len(entries),
+            'size_mb': sum(size for _, size, _ in entries) / (1024 * 1024),
+            'max_size_mb': self.max_size / (1024 * 1024),
+            'hits': self.hits,
+            'misses': self.misses
+        }
@@ -0,0 +1,163 @@
+"""
+Playback-Time Audio Processing for ReadAloud.
+
+This module applies volume, speed and loudness normalization to PCM buffers
+just before playback. Cached audio stays untouched, so changing the volume or
+speed takes effect on the next playback without re-synthesizing anything.
+
+All operations are vectorized NumPy on float32 buffers shaped (frames,) or
+(frames, channels).
+"""
+
+import numpy as np
+
+
+# Phase vocoder frame and hop sizes (hop divides the frame for exact overlap-add)
+STRETCH_FFT_SIZE = 1024
+STRETCH_HOP = 256
+
+# Loudness is measured over 50 ms blocks, ignoring near-silent ones
+LOUDNESS_BLOCK = 0.05
+LOUDNESS_GATE_DB = -50.0
+
+
+def apply_gain(samples: np.ndarray, gain: float) -> np.ndarray:
+    """Scale a buffer, clipping to [-1, 1]."""
+    if gain == 1.0:
+        return samples
+    return np.clip(samples * np.float32(gain), -1.0, 1.0)
+
+
+def loudness_db(samples: np.ndarray, sample_rate: int) -> float:
+    """
+    Gated RMS level of a buffer in dBFS.
+    
+    Blocks quieter than LOUDNESS_GATE_DB (pauses between sentences) are
+    excluded so silence does not drag the measurement down.
+    
+    Returns:
+        Level in dB, or -inf for silent input
+    """
+    mono = samples.mean(axis=1) if samples.ndim > 1 else samples
+    block = max(1, int(sample_rate * LOUDNESS_BLOCK))
+    usable = len(mono) // block * block
+    blocks = mono[:usable].reshape(-1, block) if usable else mono[None, :]
+    
+    power = np.mean(blocks.astype(np.float64) ** 2, axis=1)
+    gated = power[power > 10 ** (LOUDNESS_GATE_DB / 10)]
+    if not gated.size:
+        return float('-inf')
+    return float(10 * np.log10(gated.mean()))
+
+
+def normalize_loudness(samples: np.ndarray, sample_rate: int, target_db: float = -20.0,
+                       max_gain_db: float = 20.0) -> np.ndarray:
+    """
+    Bring a buffer to a target loudness, limiting the peak to avoid clipping.
+    
+    Args:
+        samples: Audio buffer
+        sample_rate: Sample rate in Hz
+        target_db: Target gated RMS level in dBFS
+        max_gain_db: Upper bound on the boost applied to quiet audio
+    
+    Returns:
+        Normalized buffer
+    """
+    level = loudness_db(samples, sample_rate)
+    if not np.isfinite(level):
+        return samples
+    
+    gain = 10 ** (min(target_db - level, max_gain_db) / 20)
+    out = samples * np.float32(gain)
+    
+    peak = np.max(np.abs(out)) if out.size else 0.0
+    if peak > 0.99:
+        out *= np.float32(0.99 / peak)
+    return out
+
+
+def _frame_indices(n_frames: int, n_fft: int, hop: int) -> np.ndarray:
+    return np.arange(n_fft)[None, :] + hop * np.arange(n_frames)[:, None]
+
+
+def _time_stretch_mono(samples: np.ndarray, rate: float, n_fft: int, hop: int) -> np.ndarray:
+    window = np.hanning(n_fft).astype(np.float32)
+    padded = np.pad(samples, (n_fft // 2, n_fft))
+    
+    # Analysis STFT
+    n_frames = 1 + (len(padded) - n_fft) // hop
+    spectrum = np.fft.rfft(padded[_frame_indices(n_frames, n_fft, hop)] * window, axis=1)
+    
+    # Read the analysis frames at the new rate, interpolating magnitudes
+    steps = np.arange(0, n_frames - 1, rate)
+    index = steps.astype(int)
+    frac = (steps - index)[:, None]
+    magnitude = (1 - frac) * np.abs(spectrum[index]) + frac * np.abs(spectrum[index + 1])
+    
+    # Accumulate each bin's true phase advance so pitch is preserved
+    expected = 2 * np.pi * hop * np.arange(spectrum.shape[1]) / n_fft
+    delta = np.angle(spectrum[index + 1]) - np.angle(spectrum[index]) - expected
+    delta -= 2 * np.pi * np.round(delta / (2 * np.pi))
+    advance = np.vstack([np.zeros((1, spectrum.shape[1])), (expected + delta)[:-1]])
+    phase = np.angle(spectrum[0]) + np.cumsum(advance, axis=0)
+    
+    # Overlap-add synthesis with window-power normalization
+    frames = np.fft.irfft(magnitude * np.exp(1j * phase), n=n_fft, axis=1) * window
+    indices = _frame_indices(len(frames), n_fft, hop)
+    length = n_fft + hop * (len(frames) - 1)
+    out = np.zeros(length)
+    norm = np.zeros(length)
+    np.add.at(out, indices, frames)
+    np.add.at(norm, indices, np.broadcast_to(window ** 2, frames.shape))
+    out /= np.maximum(norm, 1e-3)
+    
+    start = n_fft // 2
+    return out[start:start + int(round(len(samples) / rate))].astype(np.float32)
+
+
+def time_stretch(samples: np.ndarray, rate: float, n_fft: int = STRETCH_FFT_SIZE,
+                 hop: int = STRETCH_HOP) -> np.ndarray:
+    """
+    Change playback speed without changing pitch (phase vocoder).
+    
+    Args:
+        samples: Audio buffer
+        rate: Speed factor (2.0 plays twice as fast)
+        n_fft: Analysis frame size
+        hop: Hop between analysis frames
+    
+    Returns:
+        Buffer about len(samples) / rate frames long
+    """
+    if rate == 1.0 or len(samples) < n_fft:
+        return samples
+    if rate <= 0:
+        raise ValueError(f"Speed must be positive, got {rate}")
+    
+    if samples.ndim > 1:
+        return np.stack([_time_stretch_mono(samples[:, channel], rate, n_fft, hop)
+                         for channel in range(samples.shape[1])], axis=1)
+    return _time_stretch_mono(samples, rate, n_fft, hop)
+
+
+def process(samples: np.ndarray, sample_rate: int, volume: float = 1.0, speed: float = 1.0,
+            normalize: bool = False, target_db: float = -20.0) -> np.ndarray:
+    """
+    Apply the playback chain: loudness normalization, speed, then volume.
+    
+    Args:
+        samples: Audio buffer
+        sample_rate: Sample rate in Hz
+        volume: Linear gain (1.0 leaves the level unchanged)
+        speed: Speed factor (1.0 leaves the timing unchanged)
+        normalize: Normalize loudness to target_db first
+        target_db: Loudness target in dBFS
+    
+    Returns:
+        Processed buffer
+    """
+    if normalize:
+        samples = normalize_loudness(samples, sample_rate, target_db)
+    samples = time_stretch(samples, speed)
+    return apply_gain(samples, volume)
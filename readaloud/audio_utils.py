@@ -0,0 +1,253 @@
+"""
+Audio Buffer Helpers for ReadAloud.
+
+This module converts between audio files, WAV bytes and in-memory PCM
+buffers. Buffers are float32 NumPy arrays in the range [-1, 1], shaped
+(frames,) for mono or (frames, channels) otherwise, always paired with their
+sample rate.
+
+WAV is handled with the standard library; FLAC and Opus need soundfile.
+"""
+
+import io
+import os
+import wave
+from typing import Tuple, Union, BinaryIO, Iterator, Optional
+
+import numpy as np
+
+
+# Storage formats: extension, libsndfile format and subtype
+AUDIO_FORMATS = {
+    'wav': ('.wav', 'WAV', 'PCM_16'),
+    'flac': ('.flac', 'FLAC', 'PCM_16'),
+    'opus': ('.opus', 'OGG', 'OPUS')
+}
+
+MIME_TYPES = {
+    'wav': 'audio/wav',
+    'flac': 'audio/flac',
+    'opus': 'audio/ogg'
+}
+
+# Sample rates the Opus encoder accepts
+OPUS_RATES = (8000, 12000, 16000, 24000, 48000)
+
+
+def to_float32(samples) -> np.ndarray:
+    """Convert engine output (list, int16 or float array) to a float32 buffer."""
+    array = np.asarray(samples)
+    if array.dtype == np.int16:
+        return array.astype(np.float32) / 32768.0
+    if array.dtype == np.int32:
+        return array.astype(np.float32) / 2147483648.0
+    return array.astype(np.float32, copy=False)
+
+
+def to_int16(samples: np.ndarray) -> np.ndarray:
+    """Convert a float buffer to 16-bit PCM, clipping out-of-range samples."""
+    # Same scale as to_float32, rounded, so PCM read from a file is written back unchanged
+    return np.clip(np.round(samples * 32768.0), -32768, 32767).astype('<i2')
+
+
+def write_wav(target: Union[str, BinaryIO], samples, sample_rate: int):
+    """
+    Write a buffer as 16-bit PCM WAV.
+
+    Args:
+        target: File path or writable binary file object
+        samples: Audio buffer
+        sample_rate: Sample rate in Hz
+    """
+    samples = to_float32(samples)
+    channels = 1 if samples.ndim == 1 else samples.shape[1]
+
+    with wave.open(target, 'wb') as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(int(sample_rate))
+        wav.writeframes(to_int16(samples).tobytes())
+
+
+def to_wav_bytes(samples, sample_rate: int) -> bytes:
+    """Encode a buffer as WAV bytes (for HTTP responses or caching)."""
+    buffer = io.BytesIO()
+    write_wav(buffer, samples, sample_rate)
+    return buffer.getvalue()
+
+
+def read_wav(source: Union[str, BinaryIO]) -> Tuple[np.ndarray, int]:
+    """
+    Read a WAV file into a float32 buffer.
+
+    Uses soundfile when installed (any format libsndfile supports) and the
+    standard library otherwise (8/16/32-bit PCM WAV).
+
+    Returns:
+        (samples, sample_rate)
+    """
+    try:
+        import soundfile as sf
+        samples, sample_rate = sf.read(source, dtype='float32')
+        return samples, sample_rate
+    except ImportError:
+        pass
+
+    with wave.open(source, 'rb') as wav:
+        channels = wav.getnchannels()
+        width = wav.getsampwidth()
+        sample_rate = wav.getframerate()
+        frames = wav.readframes(wav.getnframes())
+
+    if width == 1:
+        samples = (np.frombuffer(frames, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif width == 2:
+        samples = to_float32(np.frombuffer(frames, dtype='<i2'))
+    elif width == 4:
+        samples = to_float32(np.frombuffer(frames, dtype='<i4'))
+    else:
+        raise ValueError(f"Unsupported WAV sample width: {width * 8} bits")
+
+    if channels > 1:
+        samples = samples.reshape(-1, channels)
+    return samples, sample_rate
+
+
+def resample(samples: np.ndarray, from_rate: int, to_rate: int) -> np.ndarray:
+    """Linear-interpolation resampling (enough for speech between TTS engine rates)."""
+    if from_rate == to_rate or not len(samples):
+        return samples
+
+    frames = int(round(len(samples) * to_rate / from_rate))
+    positions = np.linspace(0, len(samples) - 1, frames)
+    if samples.ndim > 1:
+        return np.stack([np.interp(positions, np.arange(len(samples)), samples[:, channel])
+                         for channel in range(samples.shape[1])], axis=1).astype(np.float32)
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+
+
+class StreamResampler:
+    """
+    Linear-interpolation resampling of audio that arrives in blocks.
+
+    Resampling each block on its own restarts the interpolation grid at every
+    boundary (audible clicks); this carries the last sample and the position
+    of the next output sample over to the following block.
+    """
+
+    def __init__(self, from_rate: int, to_rate: int):
+        self.from_rate = from_rate
+        self.to_rate = to_rate
+        self._step = from_rate / float(to_rate)
+        self._position = 0.0
+        self._previous = None
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        """Resample the next block of the stream."""
+        if self.from_rate == self.to_rate or not len(samples):
+            return samples
+
+        if self._previous is not None:
+            samples = np.concatenate([self._previous, samples])
+        last = len(samples) - 1
+        count = int(np.floor((last - self._position) / self._step)) + 1 if last >= self._position else 0
+        positions = self._position + self._step * np.arange(count)
+
+        # Positions are relative to the first sample; the next block starts at the current last one
+        self._position += self._step * count - last
+        self._previous = samples[-1:]
+
+        indices = np.arange(len(samples))
+        if samples.ndim > 1:
+            return np.stack([np.interp(positions, indices, samples[:, channel])
+                             for channel in range(samples.shape[1])], axis=1).astype(np.float32)
+        return np.interp(positions, indices, samples).astype(np.float32)
+
+
+def format_for_path(path: str) -> str:
+    """Storage format implied by a file extension ('wav' if unknown)."""
+    extension = os.path.splitext(path)[1].lower()
+    for name, (format_extension, _, _) in AUDIO_FORMATS.items():
+        if extension == format_extension:
+            return name
+    return 'wav'
+
+
+def compressed_formats_available() -> bool:
+    """Whether FLAC/Opus encoding is possible (soundfile installed)."""
+    try:
+        import soundfile
+        return True
+    except ImportError:
+        return False
+
+
+def encode_audio(target: str, samples, sample_rate: int, audio_format: str = 'wav',
+                 quality: Optional[float] = None):
+    """
+    Write a buffer in a storage format.
+
+    Args:
+        target: Output path
+        samples: Audio buffer
+        sample_rate: Sample rate in Hz
+        audio_format: 'wav', 'flac' or 'opus'
+        quality: Compression level from 0.0 (fastest/largest) to 1.0 (smallest)
+    """
+    if audio_format == 'wav':
+        write_wav(target, samples, sample_rate)
+        return
+
+    import soundfile as sf
+
+    _, sf_format, subtype = AUDIO_FORMATS[audio_format]
+    samples = to_float32(samples)
+    if audio_format == 'opus' and sample_rate not in OPUS_RATES:
+        # Next supported rate up (22.05 kHz Coqui output becomes 24 kHz)
+        new_rate = min((rate for rate in OPUS_RATES if rate >= sample_rate), default=48000)
+        samples = resample(samples, sample_rate, new_rate)
+        sample_rate = new_rate
+
+    options = {}
+    if quality is not None:
+        options['compression_level'] = float(quality)
+    try:
+        sf.write(target, samples, sample_rate, format=sf_format, subtype=subtype, **options)
+    except TypeError:
+        if not options:
+            raise
+        # soundfile < 0.13 has no compression_level; use the codec default
+        sf.write(target, samples, sample_rate, format=sf_format, subtype=subtype)
+
+
+def transcode(source: str, target: str, audio_format: Optional[str] = None,
+              quality: Optional[float] = None):
+    """Re-encode an audio file (format defaults to the one implied by target)."""
+    samples, sample_rate = read_wav(source)
+    encode_audio(target, samples, sample_rate, audio_format or format_for_path(target), quality)
+
+
+def iter_blocks(path: str, blocksize: int = 8192) -> Iterator[Tuple[np.ndarray, int]]:
+    """
+    Decode a file incrementally.
+
+    Uses soundfile.blocks so compressed files start playing before they are
+    fully decoded; without soundfile the file is read in one piece.
+
+    Yields:
+        (samples, sample_rate) blocks in order
+    """
+    try:
+        import soundfile as sf
+    except ImportError:
+        yield read_wav(path)
+        return
+
+    sample_rate = sf.info(path).samplerate
+    for block in sf.blocks(path, blocksize=blocksize, dtype='float32'):
+        yield block, sample_rate
+
+
+def duration(samples: np.ndarray, sample_rate: int) -> float:
+    """Length of a buffer in seconds."""
+    return len(samples) / float(sample_rate) if sample_rate else 0.0
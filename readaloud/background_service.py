@@ -14,11 +14,13 @@ import logging
 from pathlib import Path
 from typing import Dict, Any, Optional
 
-# Add the project root to Python path
+# Add the project root to Python path (and its parent, for the readaloud package)
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from main import ReadAloud
 from config import Config
+from readaloud.audio_cache import AudioCache
 
 
 class BackgroundService:
@@ -31,6 +33,7 @@ class BackgroundService:
         self.running = False
         self.monitored_files = {}
         self.service_threads = {}
+        self.clipboard_watcher = None
         
         # Setup logging
         self._setup_logging()
@@ -81,6 +84,16 @@ class BackgroundService:
                 'voice': self.config.get('voice', 'default'),
                 'temperature': self.config.get('temperature', 0.3),
                 'seed': self.config.get('seed'),
+                'pipeline': self.config.get('pipeline', False),
+                'cache': self.config.get('cache', {}),
+                'playback': self.config.get('playback', {}),
+                'volume': self.config.get('volume', 1.0),
+                'speed': self.config.get('speed', 1.0),
+                'hedging': self.config.get('hedging', {}),
+                'calibration': self.config.get('calibration', {}),
+                'text_processing': self.config.get('text_processing', {}),
+                'documents': self.config.get('documents', {}),
+                'monitoring': self.config.get('monitoring', {}),
                 'background_mode': True
             }
             
@@ -125,6 +138,9 @@ class BackgroundService:
                 self.logger.info(f"Stopping {name} thread...")
                 # Signal threads to stop (they should check self.running)
         
+        if self.clipboard_watcher:
+            self.clipboard_watcher.stop()
+        
         # Stop ReadAloud
         if self.app:
             for trigger in self.app.triggers.values():
@@ -226,24 +242,25 @@ class BackgroundService:
     
     def _clipboard_monitor_loop(self):
         """Clipboard monitoring loop."""
-        import pyperclip
+        from readaloud.triggers.clipboard_watch import ClipboardWatcher
         
-        last_content = pyperclip.paste()
+        self.clipboard_watcher = ClipboardWatcher.from_config(self.config.get('monitoring', {}))
+        last_content = None
         
         while self.running:
             try:
-                current_content = pyperclip.paste()
-                
-                if current_content != last_content and current_content.strip():
-                    self.logger.info(f"Clipboard content changed, length: {len(current_content)}")
+                # Wakes on change notifications, or adaptive polling where none are available
+                for current_content in self.clipboard_watcher.changes(last_content):
+                    if not self.running:
+                        break
+                    self.logger.info(f"Clipboard content changed, length: {len(current_content)}, "
+                                     f"backend: {self.clipboard_watcher.backend}")
                     
                     # Process clipboard content
                     self._process_clipboard_content(current_content)
                     
                     last_content = current_content
                 
-                time.sleep(1)  # Check every second
-                
             except Exception as e:
                 self.logger.error(f"Error in clipboard monitor loop: {e}")
                 time.sleep(5)
@@ -251,12 +268,7 @@ class BackgroundService:
     def _process_clipboard_content(self, content: str):
         """Process clipboard content."""
         try:
-            # Check if content is suitable for TTS
-            if len(content) > 1000:
-                self.logger.info("Clipboard content too long, truncating")
-                content = content[:1000] + "..."
-            
-            # Generate and play audio
+            # Generate and play audio (long content is read segment by segment, not truncated)
             if self.app and self.app.tts_engine:
                 self.logger.info("Generating TTS for clipboard content")
                 self.app._handle_text(content)
@@ -321,7 +333,7 @@ class BackgroundService:
             self.logger.error(f"Error processing pending tasks: {e}")
     
     def _cleanup_old_audio_files(self):
-        """Clean up old audio files."""
+        """Archive (or delete) audio files older than an hour."""
         try:
             audio_dir = Path("./audio_output")
             if not audio_dir.exists():
@@ -330,10 +342,23 @@ class BackgroundService:
             current_time = time.time()
             max_age = 3600  # 1 hour
             
+            # Archive tier: older outputs are re-encoded (Opus by default) and kept for days
+            archive_config = self.config.get('archive') or {}
+            archive = None
+            if archive_config.get('enabled'):
+                archive = AudioCache.from_config(archive_config, str(audio_dir / 'archive'))
+            
             for audio_file in audio_dir.glob("*.wav"):
                 if current_time - audio_file.stat().st_mtime > max_age:
-                    audio_file.unlink()
-                    self.logger.debug(f"Cleaned up old audio file: {audio_file}")
+                    if archive:
+                        archive.put(audio_file.stem, str(audio_file))
+                        self.logger.debug(f"Archived old audio file: {audio_file}")
+                    else:
+                        audio_file.unlink()
+                        self.logger.debug(f"Cleaned up old audio file: {audio_file}")
+            
+            if archive:
+                archive.evict()
                     
         except Exception as e:
             self.logger.error(f"Error cleaning up audio files: {e}")
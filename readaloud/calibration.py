@@ -0,0 +1,188 @@
+"""
+Engine Calibration for ReadAloud.
+
+This module measures each TTS engine on the current machine (cold start
+latency, warm latency and real-time factor) and stores the results, so the
+'auto' engine mode can route each request by text length: short strings to
+the engine that answers fastest, long reads to the best engine that can keep
+up with playback.
+
+Run ``main.py --calibrate`` to (re)measure the installed engines.
+"""
+
+import os
+import json
+import time
+import platform
+import tempfile
+import statistics
+from typing import Optional, Dict, Any, List
+
+from .audio_utils import read_wav, duration
+
+
+DEFAULT_CALIBRATION_FILE = os.path.join(os.path.expanduser('~'), '.cache', 'readaloud', 'engine_calibration.json')
+
+# Texts up to this length are routed to the lowest-latency engine
+SHORT_TEXT_CHARS = 200
+
+# Typical speaking rate, used to estimate audio length from text
+WORDS_PER_SECOND = 2.5
+
+SHORT_SAMPLE = "Hello, this is a quick calibration sentence."
+LONG_SAMPLE = (
+    "Calibration measures how quickly this engine turns text into speech on this machine. "
+    "The result is compared with the length of the audio it produces, which gives the "
+    "real-time factor. Engines that generate audio faster than it plays back can stream "
+    "long documents without pauses, while slower engines are better kept for short phrases "
+    "or for cases where quality matters more than waiting."
+)
+
+
+def estimate_audio_seconds(text: str) -> float:
+    """Rough spoken duration of a text."""
+    return len(text.split()) / WORDS_PER_SECOND
+
+
+def _timed_synthesis(engine, text: str) -> Dict[str, float]:
+    """Synthesize once and return elapsed time and audio duration."""
+    fd, output_path = tempfile.mkstemp(suffix='.wav')
+    os.close(fd)
+    try:
+        start = time.time()
+        engine.synthesize(text, output_path=output_path)
+        elapsed = time.time() - start
+        samples, sample_rate = read_wav(output_path)
+        return {'elapsed': elapsed, 'audio_seconds': duration(samples, sample_rate)}
+    finally:
+        if os.path.exists(output_path):
+            os.remove(output_path)
+
+
+def _release_model(engine):
+    """Drop an engine's resident model so the next request is a real cold start."""
+    for name in ('unload', 'shutdown'):
+        release = getattr(engine, name, None)
+        if callable(release):
+            release()
+            return
+
+
+def calibrate_engine(engine, warm_runs: int = 2) -> Dict[str, Any]:
+    """
+    Measure an engine.
+    
+    Any resident model is released first, so the first request is timed
+    as the cold latency including model loading; later short requests give
+    the warm latency and a longer paragraph gives the real-time factor.
+    
+    Args:
+        engine: Available TTS engine
+        warm_runs: Number of warm short requests to take the median of
+    
+    Returns:
+        Calibration result for the engine
+    """
+    _release_model(engine)
+    cold = _timed_synthesis(engine, SHORT_SAMPLE)
+    warm = [_timed_synthesis(engine, SHORT_SAMPLE)['elapsed'] for _ in range(max(1, warm_runs))]
+    long_run = _timed_synthesis(engine, LONG_SAMPLE)
+    
+    audio_seconds = long_run['audio_seconds'] or estimate_audio_seconds(LONG_SAMPLE)
+    return {
+        'engine': engine.engine_id,
+        'model': engine.get_model_id(),
+        'cold_latency': cold['elapsed'],
+        'warm_latency': statistics.median(warm),
+        'rtf': long_run['elapsed'] / audio_seconds,
+        'chars_per_second': len(LONG_SAMPLE) / long_run['elapsed'] if long_run['elapsed'] else 0.0,
+        'host': platform.node(),
+        'measured_at': time.time()
+    }
+
+
+class EngineCalibration:
+    """Persistent store of engine calibration results, and the routing policy built on them."""
+    
+    def __init__(self, path: str = DEFAULT_CALIBRATION_FILE):
+        """
+        Initialize the calibration store.
+        
+        Args:
+            path: JSON file holding calibration results
+        """
+        self.path = path
+        self._results = None
+    
+    @staticmethod
+    def _key(engine_id: str, model_id: str) -> str:
+        return f"{engine_id}:{model_id}"
+    
+    @property
+    def results(self) -> Dict[str, Any]:
+        if self._results is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._results = json.load(f)
+            except (OSError, ValueError):
+                self._results = {}
+        return self._results
+    
+    def save(self):
+        """Write results to disk."""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.results, f, indent=2)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"Error saving calibration to {self.path}: {e}")
+    
+    def get(self, engine_id: str, model_id: str = '') -> Optional[Dict[str, Any]]:
+        """Stored result for an engine and model, or None if it was never calibrated."""
+        return self.results.get(self._key(engine_id, model_id))
+    
+    def get_for(self, engine) -> Optional[Dict[str, Any]]:
+        """Stored result for an engine instance."""
+        return self.get(engine.engine_id, engine.get_model_id())
+    
+    def calibrate(self, engine, warm_runs: int = 2) -> Dict[str, Any]:
+        """Measure an engine and store the result."""
+        result = calibrate_engine(engine, warm_runs)
+        self.results[self._key(result['engine'], result['model'])] = result
+        self.save()
+        return result
+    
+    def estimate_latency(self, engine, text: str) -> Optional[float]:
+        """Estimated seconds until a text is fully synthesized by a warm engine."""
+        result = self.get_for(engine)
+        if not result:
+            return None
+        return result['warm_latency'] + result['rtf'] * estimate_audio_seconds(text)
+    
+    def choose(self, text: str, engines: List, short_text_chars: int = SHORT_TEXT_CHARS):
+        """
+        Pick the engine for a text.
+        
+        Args:
+            text: Text about to be synthesized
+            engines: Candidate engines, highest quality first
+            short_text_chars: Texts up to this length go to the fastest engine
+        
+        Returns:
+            The chosen engine (the first candidate if none are calibrated)
+        """
+        calibrated = [engine for engine in engines if self.get_for(engine)]
+        if not calibrated:
+            return engines[0]
+        
+        fastest = min(calibrated, key=lambda engine: self.estimate_latency(engine, text))
+        if len(text) <= short_text_chars:
+            return fastest
+        
+        # Long reads: best engine that generates faster than real time
+        for engine in calibrated:
+            if self.get_for(engine)['rtf'] < 1.0:
+                return engine
+        return fastest
@@ -16,23 +16,94 @@ class Config:
         'voice': 'default',
         'temperature': 0.3,
         'seed': None,
+        'volume': 1.0,
+        'speed': 1.0,
+        'pipeline': False,
         'audio_output_path': './audio_output',
+        'playback': {
+            'backend': 'auto',
+            'blocksize': 512,
+            'barge_in': True,
+            'normalize': False,
+            'target_db': -20.0
+        },
+        'cache': {
+            'enabled': True,
+            'path': './audio_output/cache',
+            'max_size_mb': 500,
+            'format': 'wav',
+            'quality': None
+        },
+        'text_processing': {
+            'normalize': True,
+            'strip_markup': True,
+            'strip_urls': True,
+            'expand_numbers': True,
+            'expand_abbreviations': True,
+            'max_chars': 300,
+            'min_chars': 40,
+            'max_request_chars': 1000
+        },
+        'documents': {
+            'large_file_kb': 64,
+            'resume': False,
+            'bookmarks': None
+        },
+        'archive': {
+            'enabled': False,
+            'path': './audio_output/archive',
+            'max_size_mb': 500,
+            'max_age_days': 7,
+            'format': 'opus',
+            'quality': None
+        },
+        'calibration': {
+            'short_text_chars': 200
+        },
+        'hedging': {
+            'enabled': False,
+            'budget': 10.0,
+            'timeout': None
+        },
         'higgs_config': {
             'model_path': '',
             'python_path': 'python',
-            'higgs_script': 'examples/generation.py'
+            'higgs_script': 'examples/generation.py',
+            'use_worker': True,
+            'stream_lookahead': 2,
+            'voice_cache_dir': None
         },
         'coqui_config': {
-            'model_name': 'tts_models/en/ljspeech/tacotron2-DDC'
+            'model_name': 'tts_models/en/ljspeech/tacotron2-DDC',
+            'preload': True,
+            'idle_timeout': 600
         },
         'hotkeys': {
             'read_selection': 'ctrl+shift+r',
             'read_clipboard': 'ctrl+shift+c',
             'stop_audio': 'ctrl+shift+s'
         },
+        'speculative': {
+            'enabled': False,
+            'delay': 0.3,
+            'max_segments': 3,
+            'max_chars': 5000
+        },
         'monitoring': {
             'clipboard_interval': 1.0,
-            'file_check_interval': 1.0
+            'clipboard_min_interval': 0.25,
+            'clipboard_backend': 'auto',
+            'file_check_interval': 1.0,
+            'file_mode': 'diff',
+            'mmap_threshold_kb': 1024,
+            'debounce': 0.3,
+            'include': [],
+            'extensions': ['.txt', '.md', '.py', '.js', '.html'],
+            'exclude': ['.git/*', 'node_modules/*', '__pycache__/*'],
+            'min_size_kb': 0,
+            'max_size_kb': None,
+            'recursive': True,
+            'max_tracked_files': 4096
         }
     }
     
@@ -0,0 +1,198 @@
+"""
+Long-Document Reader for ReadAloud.
+
+This module reads text files lazily, one paragraph at a time, and turns them
+into synthesis segments on demand, so a 500-page book is read in constant
+memory. The position of the segment being played is kept as a byte-offset
+bookmark, which lets reading resume where it stopped.
+"""
+
+import os
+import json
+import time
+from typing import Optional, Dict, Any, Iterator, Tuple
+
+from .text_processing import TextProcessor
+from .text_utils import utf8_boundary
+
+
+DEFAULT_BOOKMARK_FILE = os.path.join(os.path.expanduser('~'), '.cache', 'readaloud', 'bookmarks.json')
+
+# Files larger than this are read as documents instead of in one piece
+LARGE_FILE_BYTES = 64 * 1024
+
+# Paragraphs (or unbroken lines) are cut at this size to bound memory
+MAX_PARAGRAPH_BYTES = 64 * 1024
+
+
+def bookmark_key(file_path: str) -> str:
+    """Key identifying a file in the bookmark store."""
+    return os.path.normcase(os.path.abspath(file_path))
+
+
+def is_large_file(file_path: str, threshold: int = LARGE_FILE_BYTES) -> bool:
+    """Whether a file should be read through DocumentReader."""
+    try:
+        return os.path.getsize(file_path) > threshold
+    except OSError:
+        return False
+
+
+class BookmarkStore:
+    """Persistent reading positions, keyed by file path."""
+
+    def __init__(self, path: str = DEFAULT_BOOKMARK_FILE):
+        """
+        Initialize the bookmark store.
+
+        Args:
+            path: JSON file holding bookmarks
+        """
+        self.path = path
+        self._bookmarks = None
+
+    @property
+    def bookmarks(self) -> Dict[str, Any]:
+        if self._bookmarks is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._bookmarks = json.load(f)
+            except (OSError, ValueError):
+                self._bookmarks = {}
+        return self._bookmarks
+
+    def save(self):
+        """Write bookmarks to disk."""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.bookmarks, f, indent=2)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"Error saving bookmarks to {self.path}: {e}")
+
+    def get(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Bookmark for a file, or None if there is none or the file changed.
+
+        Returns:
+            {'offset': paragraph byte offset, 'segment': segment index in that paragraph, ...}
+        """
+        bookmark = self.bookmarks.get(bookmark_key(file_path))
+        if not bookmark:
+            return None
+        try:
+            if os.path.getsize(file_path) < bookmark['offset']:
+                # File was truncated or replaced; the offset is meaningless now
+                return None
+        except OSError:
+            return None
+        return bookmark
+
+    def set(self, file_path: str, offset: int, segment: int = 0):
+        """Record the position of the segment being played."""
+        self.bookmarks[bookmark_key(file_path)] = {
+            'path': os.path.abspath(file_path),
+            'offset': offset,
+            'segment': segment,
+            'updated': time.time()
+        }
+        self.save()
+
+    def clear(self, file_path: str):
+        """Forget a file's position (it was read to the end)."""
+        if self.bookmarks.pop(bookmark_key(file_path), None) is not None:
+            self.save()
+
+
+class DocumentReader:
+    """Lazily split a text file into synthesis segments with their byte positions."""
+
+    def __init__(self, file_path: str, processor: Optional[TextProcessor] = None,
+                 encoding: str = 'utf-8'):
+        """
+        Initialize the document reader.
+
+        Args:
+            file_path: Text file to read
+            processor: Normalization and segmentation stage
+            encoding: File encoding (undecodable bytes are replaced)
+        """
+        self.file_path = file_path
+        self.processor = processor or TextProcessor()
+        self.encoding = encoding
+        self.segments_read = 0
+        self.exhausted = False
+
+    def iter_paragraphs(self, offset: int = 0) -> Iterator[Tuple[int, str]]:
+        """
+        Read paragraphs (blocks separated by blank lines) starting at a byte offset.
+
+        Yields:
+            (byte offset of the paragraph, paragraph text)
+        """
+        with open(self.file_path, 'rb') as f:
+            f.seek(offset)
+            position = offset
+            start = offset
+            lines = []
+            size = 0
+
+            while True:
+                line = f.readline(MAX_PARAGRAPH_BYTES)
+                if not line:
+                    break
+
+                if len(line) == MAX_PARAGRAPH_BYTES and not line.endswith(b'\n'):
+                    # Over-long line: cut at a space, or at least not inside a UTF-8 character
+                    cut = line.rfind(b' ') + 1 or utf8_boundary(line)
+                    f.seek(position + cut)
+                    line = line[:cut]
+
+                line_start = position
+                position += len(line)
+
+                if line.strip():
+                    if not lines:
+                        start = line_start
+                    lines.append(line)
+                    size += len(line)
+                    if size < MAX_PARAGRAPH_BYTES:
+                        continue
+
+                if lines:
+                    yield start, b''.join(lines).decode(self.encoding, errors='replace')
+                    lines = []
+                    size = 0
+
+            if lines:
+                yield start, b''.join(lines).decode(self.encoding, errors='replace')
+
+    def iter_segments(self, offset: int = 0, skip: int = 0) -> Iterator[Tuple[str, int, int]]:
+        """
+        Normalize and segment the document lazily.
+
+        Args:
+            offset: Byte offset of the paragraph to start at
+            skip: Segments of that first paragraph that were already read
+
+        Yields:
+            (segment text, paragraph byte offset, segment index within the paragraph)
+        """
+        self.exhausted = False
+        for paragraph_offset, paragraph in self.iter_paragraphs(offset):
+            segments = self.processor.process(paragraph)
+            for index in range(skip if paragraph_offset == offset else 0, len(segments)):
+                self.segments_read += 1
+                yield segments[index], paragraph_offset, index
+        self.exhausted = True
+
+    def preview(self, max_chars: int = 2000) -> str:
+        """Normalized text from the start of the document (for engine selection)."""
+        text = ""
+        for _, paragraph in self.iter_paragraphs():
+            text = f"{text} {self.processor.normalize(paragraph)}".strip()
+            if len(text) >= max_chars:
+                break
+        return text[:max_chars]
@@ -5,19 +5,35 @@ This module provides integration with Coqui TTS as a fallback option.
 """
 
 import os
+import time
 import tempfile
-from typing import Optional, Dict, Any, List
+import threading
+from typing import Optional, Dict, Any, List, Tuple, Iterator
 
 from ..tts_engine import TTSEngine
+from ..audio_utils import to_float32, write_wav
+from ..pipeline import split_into_chunks
 
 
 class CoquiTTSEngine(TTSEngine):
     """Coqui TTS engine implementation."""
     
+    engine_id = "coqui"
+    DEFAULT_MODEL = 'tts_models/en/ljspeech/tacotron2-DDC'
+    
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         self.config = config or {}
-        self.model_name = self.config.get('model_name', 'tts_models/en/ljspeech/tacotron2-DDC')
+        self.model_name = self.config.get('model_name', self.DEFAULT_MODEL)
+        self.idle_timeout = self.config.get('idle_timeout', 600)  # seconds; 0 keeps the model forever
+        self._tts = None
+        self._tts_lock = threading.RLock()
+        self._last_used = 0.0
+        self._idle_timer = None
         super().__init__(config)
+        
+        # Load the model in the background so the first request only pays inference
+        if self.is_available and self.config.get('preload', True):
+            threading.Thread(target=self._get_tts, name="CoquiPreload", daemon=True).start()
     
     def _check_availability(self) -> bool:
         """Check if Coqui TTS is available."""
@@ -28,6 +44,53 @@ class CoquiTTSEngine(TTSEngine):
             print("Coqui TTS not available. Install with: pip install TTS")
             return False
     
+    def _get_tts(self):
+        """Return the resident TTS model, loading it if needed."""
+        with self._tts_lock:
+            if self._tts is None:
+                from TTS.api import TTS
+                start = time.time()
+                self._tts = TTS(self.model_name)
+                print(f"Coqui TTS model loaded in {time.time() - start:.1f}s: {self.model_name}")
+            self._touch()
+            return self._tts
+    
+    def _touch(self):
+        """Mark the model as used and restart the idle countdown."""
+        self._last_used = time.time()
+        if not self.idle_timeout:
+            return
+        
+        if self._idle_timer:
+            self._idle_timer.cancel()
+        self._idle_timer = threading.Timer(self.idle_timeout, self._unload_if_idle)
+        self._idle_timer.daemon = True
+        self._idle_timer.start()
+    
+    def _unload_if_idle(self):
+        """Drop the model once it has not been used for idle_timeout seconds."""
+        with self._tts_lock:
+            if self._tts is not None and time.time() - self._last_used >= self.idle_timeout:
+                self.unload()
+    
+    def unload(self):
+        """Release the resident model."""
+        with self._tts_lock:
+            if self._tts is None:
+                return
+            self._tts = None
+            if self._idle_timer:
+                self._idle_timer.cancel()
+                self._idle_timer = None
+            
+            import gc
+            gc.collect()
+            print(f"Coqui TTS model unloaded: {self.model_name}")
+    
+    @property
+    def is_loaded(self) -> bool:
+        return self._tts is not None
+    
     def synthesize(self, text: str, output_path: Optional[str] = None, 
                   voice: Optional[str] = None, **kwargs) -> str:
         """
@@ -42,47 +105,97 @@ class CoquiTTSEngine(TTSEngine):
         Returns:
             Path to the generated audio file
         """
+        samples, sample_rate = self.synthesize_pcm(text, voice=voice, **kwargs)
+        
+        # Prepare output path
+        if not output_path:
+            output_path = tempfile.mktemp(suffix='.wav')
+        
+        write_wav(output_path, samples, sample_rate)
+        return output_path
+    
+    def synthesize_pcm(self, text: str, voice: Optional[str] = None, **kwargs) -> Tuple[Any, int]:
+        """
+        Synthesize text to an in-memory buffer, without touching the disk.
+        
+        Args:
+            text: Text to synthesize
+            voice: Voice to use (optional)
+            **kwargs: Additional parameters
+            
+        Returns:
+            (samples, sample_rate) with samples as a float32 NumPy array
+        """
         if not self.is_available:
             raise RuntimeError("Coqui TTS is not available")
         
+        # Scheduling hint for queued engines; Coqui runs requests as they come
+        kwargs.pop('background', None)
+        
         try:
-            from TTS.api import TTS
-            
-            # Prepare output path
-            if not output_path:
-                output_path = tempfile.mktemp(suffix='.wav')
+            # One inference at a time on the shared model
+            with self._tts_lock:
+                tts = self._get_tts()
+                
+                # Synthesize speech
+                wav = tts.tts(
+                    text=text,
+                    speaker=voice if voice else None,
+                    **kwargs
+                )
+                sample_rate = tts.synthesizer.output_sample_rate
+                self._touch()
             
-            # Initialize TTS
-            tts = TTS(self.model_name)
-            
-            # Synthesize speech
-            tts.tts_to_file(
-                text=text,
-                file_path=output_path,
-                speaker=voice if voice else None,
-                **kwargs
-            )
-            
-            return output_path
+            return to_float32(wav), sample_rate
             
         except Exception as e:
             raise RuntimeError(f"Coqui TTS synthesis failed: {e}")
     
+    def synthesize_stream(self, text: str, voice: Optional[str] = None, **kwargs) -> Iterator[Tuple[Any, int]]:
+        """
+        Synthesize text sentence by sentence on the resident model.
+        
+        Sentences are split with the model's own segmenter when it has one, so
+        the stream matches what a single synthesize() call would produce. The
+        model lock is released between sentences so other requests can
+        interleave with a long stream.
+        
+        Yields:
+            (samples, sample_rate) tuples in reading order
+        """
+        if not self.is_available:
+            raise RuntimeError("Coqui TTS is not available")
+        
+        with self._tts_lock:
+            synthesizer = getattr(self._get_tts(), 'synthesizer', None)
+        
+        splitter = getattr(synthesizer, 'split_into_sentences', None)
+        chunks = splitter(text) if splitter else split_into_chunks(text)
+        
+        for chunk in chunks:
+            if not chunk.strip():
+                continue
+            yield self.synthesize_pcm(chunk, voice=voice, **kwargs)
+    
     def get_available_voices(self) -> List[str]:
         """Get list of available voices."""
         try:
-            from TTS.api import TTS
-            tts = TTS(self.model_name)
+            tts = self._get_tts()
             return tts.speakers if hasattr(tts, 'speakers') else []
         except:
             return []
     
+    def get_model_id(self) -> str:
+        """Coqui models are identified by name."""
+        return self.model_name
+    
     def get_engine_info(self) -> Dict[str, str]:
         """Get information about the Coqui TTS engine."""
         return {
             "name": "Coqui TTS",
             "model": self.model_name,
             "available": str(self.is_available),
+            "loaded": str(self.is_loaded),
             "description": "Fast, lightweight TTS engine"
         }
     
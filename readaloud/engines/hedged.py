@@ -0,0 +1,245 @@
+"""
+Hedged TTS Engine Implementation
+
+This module provides a composite engine that sends each request to a primary
+engine and, if it has not produced audio within a latency budget, starts the
+fallback engines in parallel and keeps whichever result finishes first.
+"""
+
+import os
+import time
+import shutil
+import asyncio
+import tempfile
+import threading
+from typing import Optional, Dict, Any, List, Tuple
+
+from ..tts_engine import TTSEngine
+
+
+class HedgedEngine(TTSEngine):
+    """Composite engine with a per-request latency budget and failover."""
+    
+    engine_id = "hedged"
+    
+    def __init__(self, primary: TTSEngine, fallbacks: List[TTSEngine],
+                 config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the hedged engine.
+        
+        Args:
+            primary: Preferred engine, tried first for every request
+            fallbacks: Engines started when the primary misses its budget or fails
+            config: 'budget' (seconds before hedging) and 'timeout' (overall limit)
+        """
+        self.primary = primary
+        self.fallbacks = [engine for engine in fallbacks if engine.is_available]
+        self.engines = [primary] + self.fallbacks
+        self.budget = (config or {}).get('budget', 10.0)
+        self.timeout = (config or {}).get('timeout')
+        
+        self.stats = {
+            'requests': 0,
+            'hedged': 0,
+            'failovers': 0,
+            'errors': 0,  # engine attempts that failed or ran out of time
+            'wins': {engine.engine_id: 0 for engine in self.engines}
+        }
+        self._stats_lock = threading.Lock()
+        
+        # Requests from synchronous callers run on one background event loop
+        self._loop = None
+        self._loop_lock = threading.Lock()
+        super().__init__(config)
+    
+    def _check_availability(self) -> bool:
+        """Available when any member engine is."""
+        return any(engine.is_available for engine in self.engines)
+    
+    def voice_for(self, engine: TTSEngine, voice: Optional[str]) -> Optional[str]:
+        """
+        Voice to request from a member engine.
+        
+        Voices are engine-specific (a reference clip for Higgs, a speaker name
+        for Coqui), so only the primary receives the configured voice.
+        """
+        return voice if engine is self.primary else None
+    
+    def _record(self, key: str, winner: Optional[TTSEngine] = None):
+        with self._stats_lock:
+            if key:
+                self.stats[key] += 1
+            if winner is not None:
+                self.stats['wins'][winner.engine_id] += 1
+    
+    async def _attempt(self, engine: TTSEngine, text: str, output_path: str,
+                       voice: Optional[str], **kwargs) -> str:
+        return await engine.synthesize_async(
+            text, output_path=output_path, voice=self.voice_for(engine, voice), **kwargs
+        )
+    
+    async def synthesize_hedged_async(self, text: str, output_path: Optional[str] = None,
+                                      voice: Optional[str] = None, **kwargs) -> Tuple[str, TTSEngine]:
+        """
+        Synthesize with hedging and report which engine produced the audio.
+        
+        Args:
+            text: Text to synthesize
+            output_path: Path to save audio file
+            voice: Voice for the primary engine
+            **kwargs: Parameters passed to every engine
+        
+        Returns:
+            (audio file path, engine that won)
+        """
+        if not output_path:
+            output_path = tempfile.mktemp(suffix='.wav')
+        
+        self._record('requests')
+        start = time.time()
+        
+        # Each engine writes its own file; the winner's is moved to output_path
+        attempts = {}
+        
+        def launch(engine):
+            path = f"{output_path}.{engine.engine_id}.tmp.wav"
+            task = asyncio.ensure_future(self._attempt(engine, text, path, voice, **kwargs))
+            attempts[task] = (engine, path)
+        
+        launch(self.primary)
+        remaining = list(self.fallbacks)
+        errors = []
+        
+        try:
+            while attempts:
+                # Hold the fallbacks back until the primary exhausts its budget
+                wait_for = None
+                if remaining:
+                    wait_for = max(0.0, self.budget - (time.time() - start))
+                if self.timeout is not None:
+                    limit = max(0.0, self.timeout - (time.time() - start))
+                    wait_for = limit if wait_for is None else min(wait_for, limit)
+                
+                done, _ = await asyncio.wait(list(attempts), timeout=wait_for,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                
+                if not done:
+                    if self.timeout is not None and time.time() - start >= self.timeout:
+                        for _ in attempts:
+                            self._record('errors')
+                        raise RuntimeError(f"All engines exceeded the {self.timeout}s timeout")
+                    # Budget exceeded: hedge with every fallback
+                    self._record('hedged')
+                    print(f"{self.primary.engine_id} exceeded {self.budget}s budget, starting fallbacks")
+                    for engine in remaining:
+                        launch(engine)
+                    remaining = []
+                    continue
+                
+                for task in done:
+                    engine, path = attempts.pop(task)
+                    if task.exception() is None:
+                        shutil.move(task.result(), output_path)
+                        self._record(None, engine)
+                        return output_path, engine
+                    
+                    # Counted even when another engine goes on to win the request
+                    self._record('errors')
+                    errors.append(f"{engine.engine_id}: {task.exception()}")
+                    if os.path.exists(path):
+                        os.remove(path)
+                    if engine is self.primary and remaining:
+                        # Primary failed outright: fail over without waiting out the budget
+                        self._record('failovers')
+                        for fallback in remaining:
+                            launch(fallback)
+                        remaining = []
+            
+            raise RuntimeError(f"All engines failed: {'; '.join(errors)}")
+        
+        finally:
+            # Cancel the losers and discard whatever they already wrote
+            for task, (_, path) in attempts.items():
+                task.cancel()
+                if os.path.exists(path):
+                    os.remove(path)
+    
+    async def synthesize_async(self, text: str, output_path: Optional[str] = None,
+                               voice: Optional[str] = None, **kwargs) -> str:
+        """Asynchronous hedged synthesis."""
+        path, _ = await self.synthesize_hedged_async(text, output_path, voice, **kwargs)
+        return path
+    
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Start (once) the background event loop used by synchronous callers."""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="HedgedEngine", daemon=True).start()
+            return self._loop
+    
+    def synthesize_hedged(self, text: str, output_path: Optional[str] = None,
+                          voice: Optional[str] = None, **kwargs) -> Tuple[str, TTSEngine]:
+        """Synchronous synthesize_hedged_async()."""
+        future = asyncio.run_coroutine_threadsafe(
+            self.synthesize_hedged_async(text, output_path, voice, **kwargs), self._get_loop()
+        )
+        return future.result()
+    
+    def synthesize(self, text: str, output_path: Optional[str] = None,
+                  voice: Optional[str] = None, **kwargs) -> str:
+        """
+        Synthesize text with the first engine to finish.
+        
+        Args:
+            text: Text to synthesize
+            output_path: Path to save audio file
+            voice: Voice for the primary engine
+            **kwargs: Parameters passed to every engine
+        
+        Returns:
+            Path to the generated audio file
+        """
+        path, _ = self.synthesize_hedged(text, output_path, voice, **kwargs)
+        return path
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Hedge, failover and win counts with the derived rates."""
+        with self._stats_lock:
+            stats = dict(self.stats, wins=dict(self.stats['wins']))
+        
+        requests = stats['requests'] or 1
+        stats['hedge_rate'] = stats['hedged'] / requests
+        stats['win_rates'] = {name: wins / requests for name, wins in stats['wins'].items()}
+        return stats
+    
+    def shutdown(self):
+        """Stop the background loop and member engines."""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop = None
+        for engine in self.engines:
+            if hasattr(engine, 'shutdown'):
+                engine.shutdown()
+    
+    def get_available_voices(self) -> list:
+        """Voices of the primary engine."""
+        return self.primary.get_available_voices()
+    
+    def get_model_id(self) -> str:
+        return "+".join(f"{engine.engine_id}:{engine.get_model_id()}" for engine in self.engines)
+    
+    def get_engine_info(self) -> Dict[str, str]:
+        """Get information about the hedged engine."""
+        stats = self.get_stats()
+        return {
+            "name": "Hedged " + " / ".join(engine.get_engine_info().get("name", engine.engine_id)
+                                           for engine in self.engines),
+            "budget": f"{self.budget}s",
+            "available": str(self.is_available),
+            "requests": str(stats['requests']),
+            "hedge_rate": f"{stats['hedge_rate']:.0%}",
+            "errors": str(stats['errors']),
+            "wins": ", ".join(f"{name}={wins}" for name, wins in stats['wins'].items()),
+            "description": "Primary engine with latency-budget failover"
+        }
@@ -5,23 +5,113 @@ This module provides integration with the Higgs Audio TTS engine.
 """
 
 import os
+import asyncio
 import tempfile
 import subprocess
+import threading
 import json
-from typing import Optional, Dict, Any, List
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Optional, Dict, Any, List, Union, Tuple, Iterator, AsyncIterator
 from pathlib import Path
 
 from ..tts_engine import TTSEngine
+from ..audio_utils import read_wav
+from ..pipeline import split_into_chunks
+from ..higgs_worker import HiggsWorkerProcess, voice_cache_path, BACKGROUND_PRIORITY, DEFAULT_VOICE_CACHE_DIR
+from ..probe_cache import ProbeCache, DEFAULT_PROBE_CACHE, interpreter_fingerprint
+from ..audio_cache import model_id
+
+
+def _remove_when_done(future: Future, path: str):
+    """Delete a chunk's output now and again once the worker finishes writing it."""
+    remove = lambda *_: os.path.exists(path) and os.remove(path)
+    remove()
+    future.add_done_callback(remove)
+
+
+class _WorkerChunkStream:
+    """
+    Sentence chunks queued on the resident worker ahead of the one being consumed.
+    
+    Shared by synthesize_stream() and synthesize_stream_async(), which only
+    differ in how they wait for a chunk. Every chunk's temporary WAV is
+    deleted once it is read, when it fails, or when the stream is closed
+    early (then as soon as the worker finishes it).
+    """
+    
+    def __init__(self, engine: "HiggsAudioEngine", worker: HiggsWorkerProcess, text: str,
+                 voice: Optional[str], kwargs: Dict[str, Any]):
+        self.engine = engine
+        self.worker = worker
+        self.voice = voice
+        self.kwargs = kwargs
+        self.chunks = iter(split_into_chunks(text))
+        self.pending = deque()
+        self.current = None
+        for _ in range(max(1, engine.stream_lookahead)):
+            self._submit_next()
+    
+    def _submit_next(self):
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            return
+        fd, path = tempfile.mkstemp(suffix='.wav')
+        os.close(fd)
+        request = self.engine._worker_request(chunk, path, self.voice, **self.kwargs)
+        self.pending.append((self.worker.submit(request), path))
+    
+    def __iter__(self):
+        return self
+    
+    def __next__(self) -> Tuple[Future, str]:
+        """Next chunk's (worker future, output path); queues the chunk after it."""
+        if not self.pending:
+            raise StopIteration
+        self.current = self.pending.popleft()
+        self._submit_next()
+        return self.current
+    
+    def take(self, result: Dict[str, Any]) -> Tuple[Any, int]:
+        """Read the current chunk's audio and delete its file."""
+        future, path = self.current
+        self.current = None
+        if not result.get('success') or not os.path.exists(path):
+            _remove_when_done(future, path)
+            raise RuntimeError(f"Higgs Audio generation failed: {result.get('error', 'no audio produced')}")
+        try:
+            return read_wav(path)
+        finally:
+            os.remove(path)
+    
+    def close(self):
+        """Stream finished or abandoned: remove outputs of chunks not read yet."""
+        if self.current:
+            _remove_when_done(*self.current)
+            self.current = None
+        while self.pending:
+            _remove_when_done(*self.pending.popleft())
 
 
 class HiggsAudioEngine(TTSEngine):
     """Higgs Audio TTS engine implementation."""
     
+    engine_id = "higgs_audio"
+    
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         self.config = config or {}
         self.model_path = self.config.get('model_path', '')
         self.python_path = self.config.get('python_path', 'python')
         self.higgs_script = self.config.get('higgs_script', 'examples/generation.py')
+        self.use_worker = self.config.get('use_worker', True)
+        self.stream_lookahead = self.config.get('stream_lookahead', 2)
+        self.load_timeout = self.config.get('load_timeout', 300)
+        self.voice_cache_dir = os.path.abspath(os.path.expanduser(
+            self.config.get('voice_cache_dir') or DEFAULT_VOICE_CACHE_DIR
+        ))
+        self._worker = None
+        self._worker_lock = threading.Lock()
+        self.probe_cache = ProbeCache(self.config.get('probe_cache', DEFAULT_PROBE_CACHE))
         super().__init__(config)
     
     def _check_availability(self) -> bool:
@@ -51,26 +141,52 @@ class HiggsAudioEngine(TTSEngine):
                 print(f"Higgs Audio generation script not found at: {script_path}")
                 return False
             
-            # Check if Python dependencies are available
-            try:
-                result = subprocess.run(
-                    [self.python_path, "-c", "import torch, transformers"],
-                    capture_output=True,
-                    text=True
-                )
-                if result.returncode != 0:
-                    print("Required Python packages not available. Please install torch and transformers.")
-                    return False
-            except FileNotFoundError:
-                print(f"Python interpreter not found at: {self.python_path}")
-                return False
-            
-            return True
+            # Check if Python dependencies are available (cached across runs)
+            return self._probe_dependencies()
             
         except Exception as e:
             print(f"Error checking Higgs Audio availability: {e}")
             return False
     
+    def _probe_key(self) -> Dict[str, Any]:
+        """Everything the dependency probe result depends on."""
+        key = interpreter_fingerprint(self.python_path)
+        key['model_path'] = os.path.abspath(self.model_path)
+        return key
+    
+    def _probe_dependencies(self) -> bool:
+        """Check that the Higgs interpreter can import torch and transformers."""
+        key = self._probe_key()
+        cached = self.probe_cache.get(self.engine_id, key)
+        if cached is not None:
+            if not cached['available']:
+                print(cached['message'])
+            return cached['available']
+        
+        try:
+            result = subprocess.run(
+                [self.python_path, "-c", "import torch, transformers"],
+                capture_output=True,
+                text=True
+            )
+        except FileNotFoundError:
+            # Nothing to cache: the fingerprint changes once the interpreter exists
+            print(f"Python interpreter not found at: {self.python_path}")
+            return False
+        
+        available = result.returncode == 0
+        message = "" if available else "Required Python packages not available. Please install torch and transformers."
+        self.probe_cache.set(self.engine_id, key, available, message)
+        if message:
+            print(message)
+        return available
+    
+    def refresh_availability(self) -> bool:
+        """Discard the cached probe result and check again."""
+        self.probe_cache.clear(self.engine_id)
+        self.is_available = self._check_availability()
+        return self.is_available
+    
     def synthesize(self, text: str, output_path: Optional[str] = None, 
                   voice: Optional[str] = None, **kwargs) -> str:
         """
@@ -80,7 +196,8 @@ class HiggsAudioEngine(TTSEngine):
             text: Text to synthesize
             output_path: Path to save audio file
             voice: Voice reference audio file (optional)
-            **kwargs: Additional parameters (temperature, seed, etc.)
+            **kwargs: Additional parameters (temperature, seed, etc.); background=True
+                queues the request on the worker behind foreground requests
             
         Returns:
             Path to the generated audio file
@@ -92,23 +209,11 @@ class HiggsAudioEngine(TTSEngine):
         if not output_path:
             output_path = tempfile.mktemp(suffix='.wav')
         
-        # Prepare command arguments
-        cmd = [
-            self.python_path,
-            os.path.join(self.model_path, self.higgs_script),
-            "--transcript", text,
-            "--out_path", output_path
-        ]
-        
-        # Add optional parameters
-        if voice and os.path.exists(voice):
-            cmd.extend(["--ref_audio", voice])
+        worker = self._get_worker()
+        if worker:
+            return self._synthesize_with_worker(worker, text, output_path, voice, **kwargs)
         
-        # Add other parameters from kwargs
-        if 'temperature' in kwargs:
-            cmd.extend(["--temperature", str(kwargs['temperature'])])
-        if 'seed' in kwargs:
-            cmd.extend(["--seed", str(kwargs['seed'])])
+        cmd = self._generation_command(text, output_path, voice, **kwargs)
         
         try:
             # Run Higgs Audio generation
@@ -132,8 +237,233 @@ class HiggsAudioEngine(TTSEngine):
             print(f"stderr: {e.stderr}")
             raise RuntimeError(f"Higgs Audio generation failed: {e}")
     
-    def get_available_voices(self) -> List[str]:
-        """Get list of available reference voices."""
+    def _generation_command(self, text: str, output_path: str, voice: Optional[str] = None,
+                            **kwargs) -> List[str]:
+        """Build the generation script command line."""
+        # Prepare command arguments
+        cmd = [
+            self.python_path,
+            os.path.join(self.model_path, self.higgs_script),
+            "--transcript", text,
+            "--out_path", output_path
+        ]
+        
+        # Add optional parameters
+        if self.config.get('model_name'):
+            cmd.extend(["--model_path", self.config['model_name']])
+        if voice and os.path.exists(voice):
+            cmd.extend(["--ref_audio", voice])
+        
+        # Add other parameters from kwargs
+        if 'temperature' in kwargs:
+            cmd.extend(["--temperature", str(kwargs['temperature'])])
+        if 'seed' in kwargs:
+            cmd.extend(["--seed", str(kwargs['seed'])])
+        return cmd
+    
+    async def synthesize_async(self, text: str, output_path: Optional[str] = None,
+                               voice: Optional[str] = None, **kwargs) -> str:
+        """
+        Synthesize without blocking the event loop.
+        
+        Requests go to the resident worker through its pipe, so any number
+        can be in flight from one loop; without the worker the generation
+        script runs as an asyncio subprocess.
+        
+        Returns:
+            Path to the generated audio file
+        """
+        if not self.is_available:
+            raise RuntimeError("Higgs Audio is not available")
+        
+        if not output_path:
+            output_path = tempfile.mktemp(suffix='.wav')
+        
+        # Only blocks (in the executor) while the worker loads the model
+        worker = await asyncio.get_running_loop().run_in_executor(None, self._get_worker)
+        if worker:
+            future = worker.submit(self._worker_request(text, output_path, voice, **kwargs))
+            try:
+                result = await self._await_worker(future, kwargs.get('timeout'))
+            except asyncio.CancelledError:
+                # The worker still finishes the request; drop its output when it does
+                future.add_done_callback(lambda _: os.path.exists(output_path) and os.remove(output_path))
+                raise
+            if not result.get('success') or not os.path.exists(output_path):
+                raise RuntimeError(f"Higgs Audio generation failed: {result.get('error', 'no audio produced')}")
+            return output_path
+        
+        process = await asyncio.create_subprocess_exec(
+            *self._generation_command(text, output_path, voice, **kwargs),
+            cwd=self.model_path,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), kwargs.get('timeout'))
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            process.kill()
+            await process.wait()
+            raise
+        
+        if process.returncode != 0:
+            print(f"Higgs Audio generation failed with exit code {process.returncode}")
+            print(f"stderr: {stderr.decode(errors='replace')}")
+            raise RuntimeError(f"Higgs Audio generation failed with exit code {process.returncode}")
+        if not os.path.exists(output_path):
+            raise RuntimeError("Audio file was not generated")
+        return output_path
+    
+    async def _await_worker(self, future, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Wait for a worker response on the event loop (cancelling the wait leaves the request queued)."""
+        try:
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout)
+        except asyncio.TimeoutError:
+            return {"success": False, "error": "Generation timed out"}
+    
+    @staticmethod
+    def _wait_worker(future: Future, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Blocking counterpart of _await_worker()."""
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            return {"success": False, "error": "Generation timed out"}
+    
+    async def synthesize_stream_async(self, text: str, voice: Optional[str] = None,
+                                      **kwargs) -> AsyncIterator[Tuple[Any, int]]:
+        """
+        Asynchronous counterpart of synthesize_stream().
+        
+        Yields:
+            (samples, sample_rate) tuples in reading order
+        """
+        if not self.is_available:
+            raise RuntimeError("Higgs Audio is not available")
+        
+        worker = await asyncio.get_running_loop().run_in_executor(None, self._get_worker)
+        if not worker:
+            fd, path = tempfile.mkstemp(suffix='.wav')
+            os.close(fd)
+            try:
+                yield read_wav(await self.synthesize_async(text, path, voice, **kwargs))
+            finally:
+                os.remove(path)
+            return
+        
+        stream = _WorkerChunkStream(self, worker, text, voice, kwargs)
+        try:
+            for future, _ in stream:
+                yield stream.take(await self._await_worker(future, kwargs.get('timeout')))
+        finally:
+            stream.close()
+    
+    def _get_worker(self) -> Optional[HiggsWorkerProcess]:
+        """Start (once) the resident worker; None if it cannot load the model."""
+        if not self.use_worker:
+            return None
+        
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = HiggsWorkerProcess(
+                    self.python_path,
+                    self.model_path,
+                    warmup=False,
+                    voice_cache_dir=self.voice_cache_dir,
+                    model=self.get_model_id()
+                )
+                self._worker.start()
+            
+            if not self._worker.wait_ready(self.load_timeout):
+                print(f"Higgs Audio worker unavailable, using {self.higgs_script}: {self._worker.error}")
+                self._worker.stop()
+                self.use_worker = False
+                return None
+        
+        return self._worker
+    
+    def _worker_request(self, text: str, output_path: str, voice: Optional[str] = None,
+                        **kwargs) -> Dict[str, Any]:
+        """Build a worker synthesis request."""
+        request = {
+            "cmd": "synthesize",
+            "text": text,
+            "out_path": os.path.abspath(output_path),
+            "temperature": kwargs.get('temperature', 0.3),
+            "seed": kwargs.get('seed')
+        }
+        if voice and os.path.exists(voice):
+            request["ref_audio"] = os.path.abspath(voice)
+        if kwargs.get('background'):
+            request["priority"] = BACKGROUND_PRIORITY
+        return request
+    
+    def _synthesize_with_worker(self, worker: HiggsWorkerProcess, text: str, output_path: str,
+                                voice: Optional[str] = None, **kwargs) -> str:
+        """Synthesize on the resident worker (reference voices are prepared once and cached)."""
+        request = self._worker_request(text, output_path, voice, **kwargs)
+        result = worker.request(request, timeout=kwargs.get('timeout'))
+        if not result.get('success') or not os.path.exists(output_path):
+            raise RuntimeError(f"Higgs Audio generation failed: {result.get('error', 'no audio produced')}")
+        return output_path
+    
+    def synthesize_stream(self, text: str, voice: Optional[str] = None, **kwargs) -> Iterator[Tuple[Any, int]]:
+        """
+        Synthesize text as a stream of sentence-sized chunks.
+        
+        With the resident worker, up to stream_lookahead chunks are queued on
+        the worker ahead of the one being consumed so the model never idles
+        between sentences. Without it every generation.py run reloads the
+        model, so the whole text is synthesized in one run and yielded once.
+        
+        Yields:
+            (samples, sample_rate) tuples in reading order
+        """
+        if not self.is_available:
+            raise RuntimeError("Higgs Audio is not available")
+        
+        worker = self._get_worker()
+        if not worker:
+            yield self.synthesize_pcm(text, voice=voice, **kwargs)
+            return
+        
+        stream = _WorkerChunkStream(self, worker, text, voice, kwargs)
+        try:
+            for future, _ in stream:
+                yield stream.take(self._wait_worker(future, kwargs.get('timeout')))
+        finally:
+            stream.close()
+    
+    def shutdown(self):
+        """Stop the resident worker."""
+        if self._worker:
+            self._worker.stop()
+            self._worker = None
+    
+    def is_voice_prepared(self, voice: str) -> bool:
+        """Check whether a reference voice has a cached prepared representation."""
+        try:
+            return os.path.exists(voice_cache_path(self.voice_cache_dir, voice))
+        except OSError:
+            return False
+    
+    def prepare_voice(self, voice: str) -> bool:
+        """Prepare a reference voice ahead of its first synthesis."""
+        worker = self._get_worker()
+        if not worker or not os.path.exists(voice):
+            return False
+        
+        result = worker.request({"cmd": "prepare_voice", "ref_audio": os.path.abspath(voice)})
+        if not result.get('success'):
+            print(f"Error preparing voice {voice}: {result.get('error')}")
+        return result.get('success', False)
+    
+    def get_available_voices(self, with_status: bool = False) -> List[Union[str, Dict[str, Any]]]:
+        """
+        Get list of available reference voices.
+        
+        Args:
+            with_status: Return dicts with 'path' and 'prepared' instead of plain paths
+        """
         voices = []
         
         # Look for reference audio files in common locations
@@ -149,8 +479,14 @@ class HiggsAudioEngine(TTSEngine):
                     if file.lower().endswith(('.wav', '.mp3', '.flac')):
                         voices.append(os.path.join(ref_dir, file))
         
+        if with_status:
+            return [{'path': voice, 'prepared': self.is_voice_prepared(voice)} for voice in voices]
         return voices
     
+    def get_model_id(self) -> str:
+        """Higgs Audio is identified by the generation model it loads, not the repository path."""
+        return model_id(self.engine_id, self.config)
+    
     def get_engine_info(self) -> Dict[str, str]:
         """Get information about the Higgs Audio engine."""
         return {
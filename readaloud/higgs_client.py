@@ -9,48 +9,133 @@ import sys
 import json
 import time
 import subprocess
+import urllib.error
+import urllib.parse
+import urllib.request
 import pyperclip
 
+SERVICE_URL = os.environ.get("HIGGS_SERVICE_URL", "http://127.0.0.1:8765")
+
+class ServiceUnavailable(Exception):
+    """Raised when nothing is listening at the service address"""
+
+def _service_request(path, payload=None, timeout=120, url=SERVICE_URL):
+    """Send one request to the running service and decode the JSON reply"""
+    data = json.dumps(payload).encode('utf-8') if payload is not None else None
+    req = urllib.request.Request(
+        url + path,
+        data=data,
+        headers={'Content-Type': 'application/json'},
+        method='POST' if data is not None else 'GET'
+    )
+    
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            return json.loads(response.read().decode('utf-8'))
+    except urllib.error.HTTPError as e:
+        # The service answered; report its error instead of falling back
+        try:
+            return json.loads(e.read().decode('utf-8'))
+        except ValueError:
+            return {"success": False, "error": f"Service returned HTTP {e.code}"}
+    except urllib.error.URLError as e:
+        if isinstance(e.reason, ConnectionRefusedError):
+            raise ServiceUnavailable(str(e.reason))
+        raise
+
+def get_service_status(url=SERVICE_URL):
+    """Status of the running service, or None if no service is listening"""
+    try:
+        return _service_request('/status', timeout=2, url=url)
+    except (ServiceUnavailable, urllib.error.URLError, OSError):
+        return None
+
+def is_service_running(url=SERVICE_URL):
+    """Check whether a service is listening"""
+    return get_service_status(url) is not None
+
+def request_tts(text, output_filename=None, timeout=120, url=SERVICE_URL):
+    """Submit text to the running service; raises ServiceUnavailable if none is listening"""
+    return _service_request('/synthesize', {
+        "text": text,
+        "output_filename": output_filename,
+        "timeout": timeout
+    }, timeout=timeout + 5, url=url)
+
+def submit_job(text, output_filename=None, timeout=None, url=SERVICE_URL):
+    """Queue text on the running service without waiting; returns the job id or a rejection"""
+    return _service_request('/jobs', {
+        "text": text,
+        "output_filename": output_filename,
+        "timeout": timeout
+    }, timeout=10, url=url)
+
+def get_job(job_id, wait=None, url=SERVICE_URL):
+    """Get a job's state, optionally blocking up to `wait` seconds for it to finish"""
+    path = f"/jobs/{job_id}" + (f"?wait={wait}" if wait else "")
+    return _service_request(path, timeout=(wait or 0) + 10, url=url)
+
+def cancel_job(job_id, url=SERVICE_URL):
+    """Cancel a queued or running job"""
+    req = urllib.request.Request(f"{url}/jobs/{job_id}", method='DELETE')
+    with urllib.request.urlopen(req, timeout=10) as response:
+        return json.loads(response.read().decode('utf-8'))
+
+def fetch_audio(audio_file, timeout=30, url=SERVICE_URL):
+    """Download the bytes of a file generated by the service"""
+    name = urllib.parse.quote(os.path.basename(audio_file))
+    with urllib.request.urlopen(f"{url}/audio/{name}", timeout=timeout) as response:
+        return response.read()
+
 def call_higgs_service(text):
     """Call the Higgs Audio service"""
     try:
-        # Check if service is running
-        service_script = os.path.join(os.path.dirname(__file__), "higgs_service.py")
-        
-        # For now, we'll just call the service directly
-        # In a real implementation, this would use IPC or HTTP
         print("🎵 Calling Higgs Audio Service...")
         
-        # Generate unique filename
-        import uuid
-        output_filename = f"output_{uuid.uuid4().hex[:8]}.wav"
-        output_path = os.path.join("audio_output", output_filename)
+        try:
+            result = request_tts(text)
+            if result.get('success'):
+                print(f"✅ TTS generated: {result['audio_file']}")
+            return result
+        except ServiceUnavailable:
+            print("⚠️  No service listening, running a one-shot synthesis...")
         
-        # Call the service
-        cmd = [
-            sys.executable,
-            service_script,
-            "--text", text,
-            "--output", output_path
-        ]
-        
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=60  # Much shorter timeout since model should be loaded
-        )
-        
-        if result.returncode == 0 and os.path.exists(output_path):
-            print(f"✅ TTS generated: {output_path}")
-            return {"success": True, "audio_file": output_path}
-        else:
-            error_msg = result.stderr if result.stderr else result.stdout
-            return {"success": False, "error": f"Service call failed: {error_msg}"}
+        return _call_direct(text)
             
     except Exception as e:
         return {"success": False, "error": f"Service error: {str(e)}"}
 
+def _call_direct(text):
+    """Run a one-shot higgs_service.py process (loads the model for this request only)"""
+    service_script = os.path.join(os.path.dirname(__file__), "higgs_service.py")
+    
+    # Generate unique filename
+    import uuid
+    output_filename = f"output_{uuid.uuid4().hex[:8]}.wav"
+    output_path = os.path.join("audio_output", output_filename)
+    
+    # Call the service
+    cmd = [
+        sys.executable,
+        service_script,
+        "--text", text,
+        "--output", output_path
+    ]
+    
+    result = subprocess.run(
+        cmd,
+        capture_output=True,
+        text=True,
+        timeout=600  # Includes the model load
+    )
+    
+    if result.returncode == 0 and os.path.exists(output_path):
+        print(f"✅ TTS generated: {output_path}")
+        return {"success": True, "audio_file": output_path}
+    else:
+        error_msg = result.stderr if result.stderr else result.stdout
+        return {"success": False, "error": f"Service call failed: {error_msg}"}
+
 def main():
     """Main client entry point"""
     print("📋 Higgs Audio Client")
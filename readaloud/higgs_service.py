@@ -11,126 +11,544 @@ import time
 import threading
 import subprocess
 import tempfile
+from collections import deque, OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# Run as a script, this file needs the readaloud package on the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from readaloud.higgs_worker import HiggsWorkerProcess
+from readaloud.audio_cache import AudioCache, key_for, model_id
+from readaloud.audio_utils import MIME_TYPES, format_for_path
+
+# Local IPC endpoint (see higgs_client.py)
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8765
+
+# Longest a GET /jobs/<id>?wait=<seconds> request may block
+MAX_WAIT_SECONDS = 600
+
+class TTSJob:
+    """One queued synthesis request"""
+    
+    def __init__(self, text, output_path, temperature, timeout=None, cache_key=None, keep_output=False):
+        import uuid
+        self.id = uuid.uuid4().hex[:12]
+        self.text = text
+        self.output_path = output_path
+        self.temperature = temperature
+        self.cache_key = cache_key
+        self.keep_output = keep_output  # caller asked for this exact file
+        self.state = "queued"  # queued, running, done, failed, cancelled, timed_out
+        self.submitted_at = time.time()
+        self.deadline = self.submitted_at + timeout if timeout else None
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.done = threading.Event()
+    
+    def finish(self, state, result):
+        self.state = state
+        self.result = result
+        self.finished_at = time.time()
+        self.done.set()
+    
+    def to_dict(self):
+        waited = (self.started_at or time.time()) - self.submitted_at
+        return {
+            "job_id": self.id,
+            "state": self.state,
+            "text": self.text[:50],
+            "wait_time": waited,
+            "result": self.result
+        }
 
 class HiggsAudioService:
-    def __init__(self):
-        self.model_path = "H:/AI/higgs/higgs-audio"
-        self.python_path = "python"
-        self.script_path = "examples/generation.py"
-        self.output_dir = "C:/Project/ki-fu/readaloud/audio_output"
-        self.temperature = 0.3
-        self.is_ready = False
-        self.processing = False
+    def __init__(self, config=None):
+        config = config or {}
+        self.config = config
+        self.model_path = config.get('model_path', "H:/AI/higgs/higgs-audio")
+        self.python_path = config.get('python_path', "python")
+        self.output_dir = config.get('output_dir', "C:/Project/ki-fu/readaloud/audio_output")
+        self.temperature = config.get('temperature', 0.3)
+        self.load_timeout = config.get('load_timeout', 300)  # 5 minutes for initial load
+        self.request_timeout = config.get('request_timeout', 120)
+        self.max_queue_depth = config.get('max_queue_depth', 16)
+        self.num_workers = max(1, int(config.get('workers', 1)))
+        self.threads_per_worker = config.get('threads_per_worker') or (
+            max(1, (os.cpu_count() or 1) // self.num_workers) if self.num_workers > 1 else None
+        )
+        
+        # Pending jobs, oldest first; guarded by _cond
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._jobs = OrderedDict()  # job_id -> TTSJob, recent history included
+        self._running = set()
+        self._stop = False
+        self._loading = False  # workers are being started; jobs queue until one is ready
+        self._dispatcher = None
+        self._executor = None
+        self._stats = {"completed": 0, "failed": 0, "cancelled": 0, "rejected": 0, "timed_out": 0}
+        self._wait_times = deque(maxlen=50)
+        
+        # Each resident worker owns one loaded copy of the model
+        self.workers = [
+            HiggsWorkerProcess(
+                self.python_path,
+                self.model_path,
+                warmup=config.get('warmup', True),
+                device=config.get('device'),
+                threads=self.threads_per_worker,
+                name=f"worker-{i}",
+                # The model the cache keys name (see audio_cache.model_id)
+                model=model_id("higgs_audio", config)
+            )
+            for i in range(self.num_workers)
+        ]
         
         # Ensure output directory exists
         os.makedirs(self.output_dir, exist_ok=True)
         
+        # Shared synthesis cache (same keys as the CLI and web interface)
+        self.cache = AudioCache.from_config(config.get('cache'), os.path.join(self.output_dir, 'cache'))
+    
+    @property
+    def is_ready(self):
+        """True once at least one worker has the model loaded"""
+        return any(worker.is_ready for worker in self.workers)
+    
+    @property
+    def processing(self):
+        """True while a job is running on a worker"""
+        with self._cond:
+            return bool(self._running)
+    
+    @property
+    def can_serve(self):
+        """True while a worker is loading or alive, so queued jobs will eventually run"""
+        if self._stop:
+            return False
+        return self._loading or any(worker.is_alive() for worker in self.workers)
+    
+    @property
+    def error(self):
+        """Most recent worker error, if any"""
+        errors = [worker.error for worker in self.workers if worker.error]
+        return errors[-1] if errors else None
+        
     def start_service(self):
         """Start the persistent service"""
         print("🚀 Starting Higgs Audio Service...")
         print(f"   Model path: {self.model_path}")
         print(f"   Output dir: {self.output_dir}")
         
-        # Start model loading in background
+        # Start model loading in background; submit() queues jobs meanwhile
+        self._loading = True
         threading.Thread(target=self._load_model, daemon=True).start()
         
+        self._stop = False
+        self._executor = ThreadPoolExecutor(max_workers=self.num_workers, thread_name_prefix="HiggsJob")
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name="HiggsDispatcher", daemon=True)
+        self._dispatcher.start()
+    
+    def stop_service(self):
+        """Stop the dispatcher and the resident workers; queued jobs are cancelled"""
+        with self._cond:
+            self._stop = True
+        self._drain_queue("cancelled", "Service stopped")
+        
+        for worker in self.workers:
+            worker.stop()
+        
+        if self._executor:
+            self._executor.shutdown(wait=False)
+        
     def _load_model(self):
-        """Load the model in background"""
+        """Start the resident workers and wait for them to load the model"""
         try:
-            print("📥 Loading model into memory...")
+            print(f"📥 Loading model into memory ({self.num_workers} worker(s))...")
+            for worker in self.workers:
+                worker.start()
             
-            # Test model loading with a simple command
-            test_cmd = [
-                self.python_path,
-                os.path.join(self.model_path, self.script_path),
-                "--transcript", "Test",
-                "--out_path", os.path.join(self.output_dir, "test_load.wav"),
-                "--temperature", str(self.temperature)
-            ]
-            
-            print("   Running initial model load...")
-            result = subprocess.run(
-                test_cmd,
-                capture_output=True,
-                text=True,
-                cwd=self.model_path,
-                timeout=300  # 5 minutes for initial load
-            )
-            
-            if result.returncode == 0:
-                print("✅ Model loaded successfully!")
-                self.is_ready = True
-                
-                # Clean up test file
-                test_file = os.path.join(self.output_dir, "test_load.wav")
-                if os.path.exists(test_file):
-                    os.remove(test_file)
-            else:
-                print(f"❌ Model loading failed: {result.stderr}")
+            for worker in self.workers:
+                if worker.wait_ready(self.load_timeout):
+                    print(f"✅ Model loaded successfully on {worker.name}! ({worker.load_time:.1f}s)")
+                else:
+                    print(f"❌ Model loading failed on {worker.name}: {worker.error or 'timed out'}")
+                with self._cond:
+                    self._cond.notify_all()
                 
         except Exception as e:
             print(f"❌ Error loading model: {str(e)}")
+        finally:
+            self._loading = False
+        
+        # Jobs accepted during warmup cannot run if every worker failed to start
+        if not self.can_serve:
+            self._drain_queue("failed", f"Model failed to load: {self.error or 'no worker started'}", "failed")
     
-    def generate_tts(self, text, output_filename=None):
-        """Generate TTS audio"""
-        if not self.is_ready:
-            return {"success": False, "error": "Model not ready yet"}
+    def _drain_queue(self, state, error, stat=None):
+        """Finish every queued job with an error"""
+        with self._cond:
+            pending = list(self._queue)
+            self._queue.clear()
+            self._cond.notify_all()
         
-        if self.processing:
-            return {"success": False, "error": "Already processing another request"}
+        for job in pending:
+            self._finish(job, state, {"success": False, "error": error, "job_id": job.id}, stat)
+    
+    def wait_until_ready(self, timeout=None):
+        """Block until a worker has the model loaded; False if loading failed everywhere"""
+        deadline = time.time() + (self.load_timeout if timeout is None else timeout)
+        while time.time() < deadline:
+            if self.is_ready:
+                return True
+            if all(worker.state in ("failed", "exited", "stopped") for worker in self.workers):
+                return False
+            time.sleep(0.1)
+        return self.is_ready
+    
+    def submit(self, text, output_filename=None, timeout=None):
+        """Queue a synthesis job; rejected when the queue is full or no worker can start"""
+        keep_output = bool(output_filename)
+        if not output_filename:
+            import uuid
+            output_filename = f"output_{uuid.uuid4().hex[:8]}.wav"
         
-        try:
-            self.processing = True
+        output_path = os.path.join(self.output_dir, output_filename)
+        # The service synthesizes without a voice or seed; key it like any other entry point
+        cache_key = key_for("higgs_audio", self.config, text, temperature=self.temperature)
+        job = TTSJob(text, output_path, self.temperature, timeout or self.request_timeout,
+                     cache_key=cache_key, keep_output=keep_output)
+        
+        cached = self.cache.get(cache_key)
+        if cached:
+            if keep_output:
+                cached = self.cache.export(cached, output_path)
+            print(f"♻️  Cached TTS for: {text[:50]}...")
+            job.finish("done", {"success": True, "audio_file": cached, "cached": True, "job_id": job.id})
+            with self._cond:
+                self._remember(job)
+            return {"success": True, "job_id": job.id, "queue_position": 0}
+        
+        # While the workers load, jobs wait in the queue like any other
+        if not self.can_serve:
+            return {"success": False, "unavailable": True, "error": self.error or "Service not running"}
+        
+        with self._cond:
+            if len(self._queue) >= self.max_queue_depth:
+                self._stats["rejected"] += 1
+                return {
+                    "success": False,
+                    "rejected": True,
+                    "error": f"Queue full ({self.max_queue_depth} jobs waiting)"
+                }
             
-            if not output_filename:
-                import uuid
-                output_filename = f"output_{uuid.uuid4().hex[:8]}.wav"
+            self._queue.append(job)
+            self._remember(job)
+            self._cond.notify_all()
+        
+        return {"success": True, "job_id": job.id, "queue_position": len(self._queue)}
+    
+    def wait(self, job_id, timeout=None):
+        """Wait for a job's result; the job keeps its place if the wait times out"""
+        with self._cond:
+            job = self._jobs.get(job_id)
+        if not job:
+            return {"success": False, "error": f"Unknown job: {job_id}"}
+        
+        if not job.done.wait(timeout):
+            return {"success": False, "error": "Timed out waiting for job", "job_id": job_id, "state": job.state}
+        
+        return job.result
+    
+    def cancel(self, job_id):
+        """Cancel a job; a running job's result is discarded when it finishes"""
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if not job or job.done.is_set():
+                return False
             
-            output_path = os.path.join(self.output_dir, output_filename)
+            if job in self._queue:
+                self._queue.remove(job)
+            return self._finish(job, "cancelled", {"success": False, "error": "Job cancelled", "job_id": job_id},
+                                "cancelled")
+    
+    def _finish(self, job, state, result, stat=None):
+        """Finish a job exactly once (check and finish are atomic); False if it already finished"""
+        with self._cond:
+            if job.done.is_set():
+                return False
+            if stat:
+                self._stats[stat] += 1
+            job.finish(state, result)
+            return True
+    
+    def get_job(self, job_id):
+        """Get a job's current state"""
+        with self._cond:
+            job = self._jobs.get(job_id)
+            return job.to_dict() if job else None
+    
+    def generate_tts(self, text, output_filename=None, timeout=None):
+        """Generate TTS audio"""
+        timeout = timeout or self.request_timeout
+        submitted = self.submit(text, output_filename, timeout)
+        if not submitted['success']:
+            return submitted
+        
+        result = self.wait(submitted['job_id'], timeout)
+        if not result.get('success') and result.get('state') in ("queued", "running"):
+            self.cancel(submitted['job_id'])
+            result = {"success": False, "error": "Generation timed out", "job_id": submitted['job_id']}
+        return result
+    
+    def _remember(self, job):
+        """Track a job, keeping a bounded history of finished ones"""
+        self._jobs[job.id] = job
+        while len(self._jobs) > self.max_queue_depth + 100:
+            oldest_id, oldest = next(iter(self._jobs.items()))
+            if not oldest.done.is_set():
+                break
+            del self._jobs[oldest_id]
+    
+    def _pick_worker(self):
+        """Least-loaded idle worker: fewest requests in flight, then lowest utilization"""
+        idle = [worker for worker in self.workers if worker.is_ready and worker.in_flight == 0]
+        if not idle:
+            return None
+        return min(idle, key=lambda worker: (worker.in_flight, worker.utilization))
+    
+    def _next_job(self):
+        """Pop the next runnable job together with the worker that will run it"""
+        with self._cond:
+            while not self._stop:
+                if self._queue:
+                    worker = self._pick_worker()
+                    if worker:
+                        job = self._queue.popleft()
+                        job.state = "running"
+                        self._running.add(job)
+                        return job, worker
+                self._cond.wait(0.05)
+        return None, None
+    
+    def _dispatch_loop(self):
+        """Hand queued jobs to idle workers"""
+        while True:
+            job, worker = self._next_job()
+            if job is None:
+                return
             
-            print(f"🎵 Generating TTS for: {text[:50]}...")
+            job.started_at = time.time()
+            self._wait_times.append(job.started_at - job.submitted_at)
             
-            cmd = [
-                self.python_path,
-                os.path.join(self.model_path, self.script_path),
-                "--transcript", text,
-                "--out_path", output_path,
-                "--temperature", str(self.temperature)
-            ]
+            if job.deadline and job.started_at > job.deadline:
+                with self._cond:
+                    self._running.discard(job)
+                self._finish(job, "timed_out", {"success": False, "error": "Generation timed out", "job_id": job.id},
+                             "timed_out")
+                continue
             
-            # Run generation (should be much faster now)
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                cwd=self.model_path,
-                timeout=120  # 2 minutes should be enough for loaded model
-            )
+            # Claim the worker before the dispatcher looks for the next idle one
+            future = worker.submit(self._job_payload(job))
+            self._executor.submit(self._run_job, job, worker, future)
+    
+    def _job_payload(self, job):
+        return {
+            "cmd": "synthesize",
+            "text": job.text,
+            "out_path": os.path.abspath(job.output_path),
+            "temperature": job.temperature
+        }
+    
+    def _run_job(self, job, worker, future):
+        """Wait for one job on its worker and publish the result"""
+        print(f"🎵 Generating TTS on {worker.name} for: {job.text[:50]}...")
+        
+        try:
+            # Only inference happens here; the model is already resident
+            remaining = job.deadline - time.time() if job.deadline else None
+            try:
+                result = future.result(remaining)
+            except FutureTimeoutError:
+                result = {"success": False, "error": "Generation timed out"}
             
-            if result.returncode == 0 and os.path.exists(output_path):
-                print(f"✅ TTS generated: {output_path}")
-                return {"success": True, "audio_file": output_path}
+            if result['success'] and os.path.exists(job.output_path):
+                print(f"✅ TTS generated on {worker.name}: {job.output_path} ({result.get('elapsed', 0):.1f}s)")
+                audio_file = self.cache.put(job.cache_key, job.output_path, move=not job.keep_output)
+                if job.keep_output:
+                    audio_file = job.output_path
+                outcome = ("done", {"success": True, "audio_file": audio_file, "job_id": job.id})
             else:
-                error_msg = result.stderr if result.stderr else result.stdout
-                return {"success": False, "error": f"Generation failed: {error_msg}"}
-                
-        except subprocess.TimeoutExpired:
-            return {"success": False, "error": "Generation timed out"}
+                outcome = ("failed", {
+                    "success": False,
+                    "error": result.get('error', 'Audio file was not generated'),
+                    "job_id": job.id
+                })
         except Exception as e:
-            return {"success": False, "error": f"Generation error: {str(e)}"}
+            outcome = ("failed", {"success": False, "error": f"Generation error: {str(e)}", "job_id": job.id})
         finally:
-            self.processing = False
+            with self._cond:
+                self._running.discard(job)
+                self._cond.notify_all()
+        
+        # A job cancelled while running keeps its cancelled state; the result is dropped
+        self._finish(job, *outcome, "completed" if outcome[0] == "done" else "failed")
     
     def get_status(self):
         """Get service status"""
+        workers = [worker.status() for worker in self.workers]
+        with self._cond:
+            queued = list(self._queue)
+            running = [job.id for job in self._running]
+            stats = dict(self._stats)
+        
+        now = time.time()
         return {
             "ready": self.is_ready,
             "processing": self.processing,
             "model_path": self.model_path,
-            "output_dir": self.output_dir
+            "output_dir": self.output_dir,
+            "loaded": any(worker['loaded'] for worker in workers),
+            "warm": any(worker['warm'] for worker in workers),
+            "workers": workers,
+            "threads_per_worker": self.threads_per_worker,
+            "utilization": sum(worker['utilization'] for worker in workers) / len(workers),
+            "requests_per_minute": sum(worker['requests_per_minute'] for worker in workers),
+            "queue_depth": len(queued),
+            "max_queue_depth": self.max_queue_depth,
+            "oldest_wait_time": now - queued[0].submitted_at if queued else 0.0,
+            "avg_wait_time": sum(self._wait_times) / len(self._wait_times) if self._wait_times else 0.0,
+            "running_jobs": running,
+            "jobs": stats,
+            "cache": self.cache.get_stats()
         }
 
+class ServiceRequestHandler(BaseHTTPRequestHandler):
+    """Localhost HTTP front end for a running HiggsAudioService
+    
+    GET    /status          -> service status
+    POST   /synthesize      -> {"text": ..., "output_filename": ..., "timeout": ...} -> generate_tts result
+    POST   /jobs            -> same body; queue without waiting -> {"job_id": ...}
+    GET    /jobs/<id>       -> job state (?wait=<seconds> to block for the result)
+    DELETE /jobs/<id>       -> cancel a job
+    GET    /audio/<name>    -> bytes of a generated or cached file (WAV, FLAC or Opus)
+    
+    Requests rejected because the queue is full get HTTP 429; HTTP 503 means
+    no worker is loading or running, so the job could never run.
+    """
+    service = None
+    
+    def _send_json(self, payload, code=200):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def _send_result(self, result):
+        if result.get('unavailable'):
+            self._send_json(result, 503)
+        else:
+            self._send_json(result, 429 if result.get('rejected') else 200)
+    
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length', 0))
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length).decode('utf-8'))
+    
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == '/status':
+            self._send_json(self.service.get_status())
+        elif url.path.startswith('/jobs/'):
+            job_id = url.path[len('/jobs/'):]
+            wait = parse_qs(url.query).get('wait')
+            if wait:
+                try:
+                    seconds = float(wait[0])
+                    if seconds != seconds:
+                        raise ValueError("NaN")
+                except ValueError:
+                    self._send_json({"success": False, "error": f"Invalid wait: {wait[0]}"}, 400)
+                    return
+                self.service.wait(job_id, min(max(seconds, 0.0), MAX_WAIT_SECONDS))
+            job = self.service.get_job(job_id)
+            if job:
+                self._send_json(job)
+            else:
+                self._send_json({"success": False, "error": f"Unknown job: {job_id}"}, 404)
+        elif url.path.startswith('/audio/'):
+            # Only serve files from the output and cache directories
+            name = os.path.basename(url.path[len('/audio/'):])
+            audio_file = os.path.join(self.service.output_dir, name)
+            if not os.path.isfile(audio_file):
+                audio_file = os.path.join(self.service.cache.cache_dir, name)
+            if not os.path.isfile(audio_file):
+                self._send_json({"success": False, "error": "Audio file not found"}, 404)
+                return
+            with open(audio_file, 'rb') as f:
+                data = f.read()
+            self.send_response(200)
+            self.send_header('Content-Type', MIME_TYPES[format_for_path(audio_file)])
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        else:
+            self._send_json({"success": False, "error": f"Unknown endpoint: {self.path}"}, 404)
+    
+    def do_POST(self):
+        if self.path not in ('/synthesize', '/jobs'):
+            self._send_json({"success": False, "error": f"Unknown endpoint: {self.path}"}, 404)
+            return
+        
+        try:
+            data = self._read_json()
+        except ValueError:
+            self._send_json({"success": False, "error": "Malformed JSON body"}, 400)
+            return
+        
+        text = data.get('text', '')
+        if not text.strip():
+            self._send_json({"success": False, "error": "No text provided"}, 400)
+            return
+        
+        output_filename = data.get('output_filename')
+        if output_filename:
+            output_filename = os.path.basename(output_filename)
+        
+        if self.path == '/jobs':
+            self._send_result(self.service.submit(text, output_filename, data.get('timeout')))
+        else:
+            self._send_result(self.service.generate_tts(text, output_filename, data.get('timeout')))
+    
+    def do_DELETE(self):
+        if not self.path.startswith('/jobs/'):
+            self._send_json({"success": False, "error": f"Unknown endpoint: {self.path}"}, 404)
+            return
+        
+        job_id = self.path[len('/jobs/'):]
+        self._send_json({"success": self.service.cancel(job_id), "job_id": job_id})
+    
+    def log_message(self, format, *args):
+        # Keep the service console readable
+        pass
+
+
+def serve(service, host=SERVICE_HOST, port=SERVICE_PORT):
+    """Expose the service on localhost; returns the running server"""
+    handler = type('BoundServiceRequestHandler', (ServiceRequestHandler,), {'service': service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="HiggsServiceHTTP", daemon=True).start()
+    return server
+
 def main():
     """Main service entry point"""
     import argparse
@@ -139,6 +557,10 @@ def main():
     parser.add_argument('--text', help='Text to synthesize')
     parser.add_argument('--output', help='Output audio file path')
     parser.add_argument('--service', action='store_true', help='Run as persistent service')
+    parser.add_argument('--host', default=SERVICE_HOST, help='Address to listen on in service mode')
+    parser.add_argument('--port', type=int, default=SERVICE_PORT, help='Port to listen on in service mode')
+    parser.add_argument('--workers', type=int, default=1, help='Number of resident model workers')
+    parser.add_argument('--threads', type=int, help='CPU threads per worker (default: cores / workers)')
     
     args = parser.parse_args()
     
@@ -147,8 +569,10 @@ def main():
         print("🎯 Higgs Audio Persistent Service")
         print("=" * 40)
         
-        service = HiggsAudioService()
+        service = HiggsAudioService({'workers': args.workers, 'threads_per_worker': args.threads})
         service.start_service()
+        server = serve(service, args.host, args.port)
+        print(f"   Listening on: http://{args.host}:{args.port}")
         
         # Keep service running
         try:
@@ -158,22 +582,29 @@ def main():
                     print("   Service ready - waiting for requests...", end='\r')
         except KeyboardInterrupt:
             print("\n\n🛑 Service stopped by user")
+        finally:
+            server.shutdown()
+            service.stop_service()
     else:
         # Run single TTS request
         if not args.text or not args.output:
             print("Usage: python higgs_service.py --text 'Hello world' --output 'output.wav'")
             return
         
-        service = HiggsAudioService()
+        # One-shot: skip the warm-up synthesis, the real request warms the model
+        service = HiggsAudioService({'warmup': False})
         service.start_service()
         
         # Wait for service to be ready
         print("⏳ Waiting for service to be ready...")
-        while not service.is_ready:
-            time.sleep(1)
+        if not service.wait_until_ready():
+            print(f"❌ TTS failed: {service.error or 'Model not ready'}")
+            service.stop_service()
+            sys.exit(1)
         
         # Generate TTS
         result = service.generate_tts(args.text, os.path.basename(args.output))
+        service.stop_service()
         
         if result['success']:
             print(f"✅ TTS generated: {result['audio_file']}")
@@ -0,0 +1,562 @@
+#!/usr/bin/env python3
+"""
+Higgs Audio Worker
+Loads the Higgs Audio model once and answers synthesis requests over stdin/stdout
+
+The worker side of this module runs inside the Higgs Audio environment
+(``python_path`` with ``model_path`` as working directory) and must not import
+anything from ReadAloud. The ``HiggsWorkerProcess`` class is the parent side
+used by the service to talk to it.
+
+Protocol: one JSON object per line.
+    request:  {"id": "...", "cmd": "synthesize", "text": "...", "out_path": "...",
+               "temperature": 0.3, "seed": null, "ref_audio": null, "priority": 0}
+    response: {"id": "...", "success": true, "audio_file": "...", "elapsed": 1.2}
+    events:   {"event": "loading"} / {"event": "ready", ...} / {"event": "error", ...}
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import queue
+import hashlib
+import itertools
+import threading
+import subprocess
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+DEFAULT_MODEL = "bosonai/higgs-audio-v2-generation-3B-base"
+DEFAULT_AUDIO_TOKENIZER = "bosonai/higgs-audio-v2-tokenizer"
+DEFAULT_SYSTEM_PROMPT = (
+    "Generate audio following instruction.\n\n"
+    "<|scene_desc_start|>\nAudio is recorded from a quiet room.\n<|scene_desc_end|>"
+)
+WORKER_SCRIPT = os.path.abspath(__file__)
+
+# Prepared reference voices, shared by every working directory
+DEFAULT_VOICE_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'readaloud', 'voice_cache')
+
+# Queued requests run lowest priority first, in arrival order within a priority.
+# A request already generating is never interrupted
+FOREGROUND_PRIORITY = 0
+BACKGROUND_PRIORITY = 1
+
+_voice_key_memo = {}
+
+
+def voice_cache_key(path):
+    """Cache key for a reference voice clip: content hash plus modification time"""
+    stat = os.stat(path)
+    memo_key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    if memo_key not in _voice_key_memo:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        _voice_key_memo[memo_key] = f"{digest.hexdigest()[:32]}_{stat.st_mtime_ns}"
+    return _voice_key_memo[memo_key]
+
+
+def voice_cache_path(cache_dir, path):
+    """Where the prepared representation of a voice clip is stored"""
+    return os.path.join(cache_dir, voice_cache_key(path) + ".pt")
+
+
+# ---------------------------------------------------------------------------
+# Worker side (runs in the Higgs Audio interpreter)
+# ---------------------------------------------------------------------------
+
+class _ResidentModel:
+    """The Higgs serve engine, loaded once per worker process"""
+
+    def __init__(self, model, audio_tokenizer, device=None, threads=None, voice_cache_dir=None,
+                 system_prompt=DEFAULT_SYSTEM_PROMPT):
+        import torch
+        from boson_multimodal.serve.serve_engine import HiggsAudioServeEngine
+
+        if threads:
+            torch.set_num_threads(threads)
+        if device is None:
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+
+        self.device = device
+        self.system_prompt = system_prompt
+        self.engine = HiggsAudioServeEngine(model, audio_tokenizer, device=device)
+
+        self.voice_cache_dir = voice_cache_dir
+        self._voice_codes = {}
+        # Reference clip whose audio the engine is about to encode (one per request)
+        self._encoding_ref = None
+        if voice_cache_dir:
+            os.makedirs(voice_cache_dir, exist_ok=True)
+            self._cache_reference_encoding()
+
+    def _cache_reference_encoding(self):
+        """Encode each reference clip once and keep the audio codes on disk
+
+        HiggsAudioServeEngine loads the reference clip itself and calls
+        ``audio_tokenizer.encode(raw_audio, sampling_rate)``, so the raw audio
+        carries no path. The clip being encoded is the reference of the current
+        request (set in ``_encoding_ref``), and the codes are cached under that
+        file's content hash and modification time.
+        """
+        import torch
+
+        tokenizer = self.engine.audio_tokenizer
+        encode = tokenizer.encode
+
+        def cached_encode(audio, *args, **kwargs):
+            ref_audio, self._encoding_ref = self._encoding_ref, None
+            if ref_audio is None or isinstance(audio, str):
+                return encode(audio, *args, **kwargs)
+
+            cache_file = voice_cache_path(self.voice_cache_dir, ref_audio)
+            if cache_file not in self._voice_codes:
+                if os.path.exists(cache_file):
+                    self._voice_codes[cache_file] = torch.load(cache_file, map_location="cpu")
+                else:
+                    codes = encode(audio, *args, **kwargs)
+                    temp_file = f"{cache_file}.{os.getpid()}.tmp"
+                    torch.save(codes, temp_file)
+                    os.replace(temp_file, cache_file)
+                    self._voice_codes[cache_file] = codes
+            return self._voice_codes[cache_file]
+
+        tokenizer.encode = cached_encode
+
+    def prepare_voice(self, ref_audio):
+        """Encode a reference clip ahead of its first use (the way generation encodes it)"""
+        if not self.voice_cache_dir:
+            raise RuntimeError("Voice cache is disabled")
+        cache_file = voice_cache_path(self.voice_cache_dir, ref_audio)
+        if not os.path.exists(cache_file):
+            import librosa
+
+            tokenizer = self.engine.audio_tokenizer
+            raw_audio, _ = librosa.load(ref_audio, sr=tokenizer.sampling_rate)
+            self._encoding_ref = ref_audio
+            try:
+                tokenizer.encode(raw_audio, tokenizer.sampling_rate)
+            finally:
+                self._encoding_ref = None
+        return cache_file
+
+    def _build_messages(self, text, ref_audio=None):
+        from boson_multimodal.data_types import Message, AudioContent
+
+        messages = [Message(role="system", content=self.system_prompt)]
+
+        if ref_audio and os.path.exists(ref_audio):
+            # Voice cloning: the reference transcript lives next to the clip
+            ref_text = ""
+            transcript = os.path.splitext(ref_audio)[0] + ".txt"
+            if os.path.exists(transcript):
+                with open(transcript, 'r', encoding='utf-8') as f:
+                    ref_text = f.read().strip()
+            messages.append(Message(role="user", content=ref_text))
+            messages.append(Message(role="assistant", content=AudioContent(audio_url=ref_audio)))
+
+        messages.append(Message(role="user", content=text))
+        return messages
+
+    def synthesize(self, text, out_path, temperature=0.3, seed=None, ref_audio=None,
+                   max_new_tokens=2048):
+        import torch
+        import torchaudio
+        from boson_multimodal.data_types import ChatMLSample
+
+        if seed is not None:
+            torch.manual_seed(int(seed))
+
+        messages = self._build_messages(text, ref_audio)
+        if self.voice_cache_dir and ref_audio and os.path.exists(ref_audio):
+            # The one audio the engine encodes for this request is the reference clip
+            self._encoding_ref = ref_audio
+        try:
+            output = self.engine.generate(
+                chat_ml_sample=ChatMLSample(messages=messages),
+                max_new_tokens=max_new_tokens,
+                temperature=temperature,
+                top_p=0.95,
+                top_k=50,
+                stop_strings=["<|end_of_text|>", "<|eot_id|>"],
+            )
+        finally:
+            self._encoding_ref = None
+
+        os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+        torchaudio.save(out_path, torch.from_numpy(output.audio)[None, :], output.sampling_rate)
+        return output.sampling_rate
+
+
+_emit_lock = threading.Lock()
+
+
+def _emit(stream, message):
+    """Write one protocol line"""
+    with _emit_lock:
+        stream.write(json.dumps(message) + "\n")
+        stream.flush()
+
+
+def _read_requests(stream, protocol, requests):
+    """Queue requests by priority as they arrive, so later foreground ones can overtake"""
+    order = itertools.count()
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            request = json.loads(line)
+        except ValueError:
+            _emit(protocol, {"event": "error", "error": f"Malformed request: {line[:100]}"})
+            continue
+
+        priority = request.get('priority', FOREGROUND_PRIORITY)
+        if not isinstance(priority, int):
+            priority = FOREGROUND_PRIORITY
+        requests.put((priority, next(order), request))
+
+    # stdin closed: the parent is gone
+    requests.put((FOREGROUND_PRIORITY, next(order), {"cmd": "shutdown"}))
+
+
+def _handle_request(model, request):
+    """Run one request against the resident model"""
+    cmd = request.get('cmd', 'synthesize')
+
+    if cmd == 'ping':
+        return {"success": True}
+
+    if cmd == 'prepare_voice':
+        try:
+            return {"success": True, "prepared": model.prepare_voice(request['ref_audio'])}
+        except Exception as e:
+            return {"success": False, "error": f"Voice preparation failed: {str(e)}"}
+
+    if cmd != 'synthesize':
+        return {"success": False, "error": f"Unknown command: {cmd}"}
+
+    start = time.time()
+    try:
+        sample_rate = model.synthesize(
+            request['text'],
+            request['out_path'],
+            temperature=request.get('temperature', 0.3),
+            seed=request.get('seed'),
+            ref_audio=request.get('ref_audio'),
+        )
+        return {
+            "success": True,
+            "audio_file": request['out_path'],
+            "sample_rate": sample_rate,
+            "elapsed": time.time() - start,
+        }
+    except Exception as e:
+        return {"success": False, "error": f"Generation error: {str(e)}", "elapsed": time.time() - start}
+
+
+def worker_main(argv=None):
+    """Worker entry point"""
+    import argparse
+    import tempfile
+
+    parser = argparse.ArgumentParser(description='Higgs Audio resident worker')
+    parser.add_argument('--model', default=DEFAULT_MODEL, help='Higgs generation model')
+    parser.add_argument('--audio-tokenizer', default=DEFAULT_AUDIO_TOKENIZER, help='Higgs audio tokenizer')
+    parser.add_argument('--device', help='Torch device (default: cuda if available)')
+    parser.add_argument('--threads', type=int, help='CPU threads for this worker')
+    parser.add_argument('--voice-cache', help='Directory for prepared reference voices')
+    parser.add_argument('--warmup', action='store_true', help='Run one short synthesis after loading')
+    args = parser.parse_args(argv)
+
+    # Keep stdout for the protocol only; library chatter goes to stderr
+    protocol = sys.stdout
+    sys.stdout = sys.stderr
+
+    _emit(protocol, {"event": "loading", "pid": os.getpid()})
+
+    start = time.time()
+    try:
+        model = _ResidentModel(args.model, args.audio_tokenizer, device=args.device, threads=args.threads,
+                               voice_cache_dir=args.voice_cache)
+    except Exception as e:
+        _emit(protocol, {"event": "error", "error": f"Model loading failed: {str(e)}"})
+        return 1
+    load_time = time.time() - start
+
+    warm = False
+    if args.warmup:
+        warmup_path = os.path.join(tempfile.gettempdir(), f"higgs_warmup_{os.getpid()}.wav")
+        result = _handle_request(model, {"text": "Test", "out_path": warmup_path})
+        warm = result['success']
+        if os.path.exists(warmup_path):
+            os.remove(warmup_path)
+
+    _emit(protocol, {"event": "ready", "load_time": load_time, "warm": warm, "device": model.device})
+
+    requests = queue.PriorityQueue()
+    threading.Thread(target=_read_requests, args=(sys.stdin, protocol, requests), daemon=True).start()
+
+    while True:
+        _, _, request = requests.get()
+        if request.get('cmd') == 'shutdown':
+            break
+
+        response = _handle_request(model, request)
+        response['id'] = request.get('id')
+        _emit(protocol, response)
+
+    return 0
+
+
+# ---------------------------------------------------------------------------
+# Parent side
+# ---------------------------------------------------------------------------
+
+class HiggsWorkerProcess:
+    """Handle to one resident Higgs worker process"""
+
+    def __init__(self, python_path, model_path, warmup=True, device=None, threads=None,
+                 voice_cache_dir=None, extra_args=None, env=None, name="worker-0", model=None):
+        self.python_path = python_path
+        self.model_path = model_path
+        self.model = model
+        self.warmup = warmup
+        self.device = device
+        self.threads = threads
+        self.voice_cache_dir = os.path.abspath(voice_cache_dir) if voice_cache_dir else None
+        self.extra_args = list(extra_args or [])
+        self.env = env
+        self.name = name
+
+        self.process = None
+        self.state = "stopped"
+        self.error = None
+        self.load_time = None
+        self.warm = False
+        self.started_at = None
+        self.requests_served = 0
+        self.last_inference_time = None
+        self.ready_at = None
+        self.busy_time = 0.0
+        self.chars_served = 0
+
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._ready_event = threading.Event()
+        self._stderr_tail = deque(maxlen=50)
+
+    def start(self):
+        """Spawn the worker; returns immediately while the model loads"""
+        if self.is_alive():
+            return
+
+        cmd = [self.python_path, WORKER_SCRIPT, *self.extra_args]
+        if self.model:
+            cmd.extend(["--model", self.model])
+        if self.warmup:
+            cmd.append("--warmup")
+        if self.device:
+            cmd.extend(["--device", self.device])
+        if self.threads:
+            cmd.extend(["--threads", str(self.threads)])
+        if self.voice_cache_dir:
+            cmd.extend(["--voice-cache", self.voice_cache_dir])
+
+        env = dict(os.environ)
+        if self.threads:
+            # Keep BLAS pools from oversubscribing cores shared with other workers
+            env["OMP_NUM_THREADS"] = str(self.threads)
+            env["MKL_NUM_THREADS"] = str(self.threads)
+        env.update(self.env or {})
+        env["PYTHONUNBUFFERED"] = "1"
+
+        self._ready_event.clear()
+        self.state = "loading"
+        self.error = None
+        self.warm = False
+        self.started_at = time.time()
+
+        self.process = subprocess.Popen(
+            cmd,
+            cwd=self.model_path,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding='utf-8',
+            bufsize=1,
+            env=env,
+        )
+
+        threading.Thread(target=self._read_stdout, name=f"{self.name}-stdout", daemon=True).start()
+        threading.Thread(target=self._read_stderr, name=f"{self.name}-stderr", daemon=True).start()
+
+    def is_alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    @property
+    def is_ready(self):
+        return self.state == "ready" and self.is_alive()
+
+    def wait_ready(self, timeout=None):
+        """Block until the model is loaded (or loading failed)"""
+        self._ready_event.wait(timeout)
+        return self.is_ready
+
+    def submit(self, payload):
+        """Send a request; returns a Future resolved with the response dict"""
+        future = Future()
+
+        if not self.is_ready:
+            future.set_result({"success": False, "error": f"Worker not ready ({self.state})"})
+            return future
+
+        request_id = uuid.uuid4().hex
+        message = dict(payload, id=request_id)
+
+        with self._lock:
+            self._pending[request_id] = (future, len(payload.get('text', '')))
+
+        try:
+            with self._write_lock:
+                self.process.stdin.write(json.dumps(message) + "\n")
+                self.process.stdin.flush()
+        except (OSError, ValueError) as e:
+            with self._lock:
+                self._pending.pop(request_id, None)
+            future.set_result({"success": False, "error": f"Worker pipe error: {str(e)}"})
+
+        return future
+
+    def request(self, payload, timeout=None):
+        """Send a request and wait for its response"""
+        future = self.submit(payload)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            return {"success": False, "error": "Generation timed out"}
+
+    def stop(self, timeout=5):
+        """Ask the worker to exit, killing it if it does not"""
+        if not self.process:
+            return
+
+        self.state = "stopped"
+        if self.is_alive():
+            try:
+                with self._write_lock:
+                    self.process.stdin.write(json.dumps({"cmd": "shutdown"}) + "\n")
+                    self.process.stdin.flush()
+                self.process.wait(timeout)
+            except (OSError, ValueError, subprocess.TimeoutExpired):
+                self.process.kill()
+                self.process.wait()
+
+        self._fail_pending("Worker stopped")
+
+    @property
+    def in_flight(self):
+        """Requests sent to the worker and not answered yet"""
+        with self._lock:
+            return len(self._pending)
+
+    @property
+    def utilization(self):
+        """Fraction of time since the model loaded spent generating"""
+        if not self.ready_at:
+            return 0.0
+        return min(1.0, self.busy_time / max(time.time() - self.ready_at, 1e-6))
+
+    def status(self):
+        """Real load and warm state of the worker"""
+        in_flight = self.in_flight
+        uptime = time.time() - self.ready_at if self.ready_at else 0.0
+
+        return {
+            "name": self.name,
+            "state": self.state if self.is_alive() or self.state in ("stopped", "failed") else "exited",
+            "pid": self.process.pid if self.process else None,
+            "loaded": self.state == "ready",
+            "warm": self.warm,
+            "load_time": self.load_time,
+            "in_flight": in_flight,
+            "requests_served": self.requests_served,
+            "last_inference_time": self.last_inference_time,
+            "threads": self.threads,
+            "busy_time": self.busy_time,
+            "utilization": self.utilization,
+            "requests_per_minute": self.requests_served * 60.0 / uptime if uptime else 0.0,
+            "chars_per_second": self.chars_served / self.busy_time if self.busy_time else 0.0,
+            "error": self.error,
+        }
+
+    def _read_stdout(self):
+        for line in self.process.stdout:
+            try:
+                message = json.loads(line)
+            except ValueError:
+                self._stderr_tail.append(line.rstrip())
+                continue
+
+            event = message.get('event')
+            if event == 'ready':
+                self.load_time = message.get('load_time')
+                self.warm = message.get('warm', False)
+                self.ready_at = time.time()
+                self.state = "ready"
+                self._ready_event.set()
+            elif event == 'error' and self.state == "loading":
+                self.error = message.get('error')
+                self.state = "failed"
+                self._ready_event.set()
+            elif event is None:
+                self._resolve(message)
+
+        # Pipe closed: the worker is gone
+        if self.state not in ("stopped", "failed"):
+            tail = "\n".join(list(self._stderr_tail)[-5:])
+            self.error = self.error or f"Worker exited ({self.process.poll()}): {tail}"
+            self.state = "failed" if self.state == "loading" else "exited"
+        self._ready_event.set()
+        self._fail_pending(self.error or "Worker exited")
+
+    def _read_stderr(self):
+        for line in self.process.stderr:
+            self._stderr_tail.append(line.rstrip())
+
+    def _resolve(self, message):
+        with self._lock:
+            entry = self._pending.pop(message.pop('id', None), None)
+
+        if not entry:
+            return
+
+        future, chars = entry
+        if message.get('success'):
+            self.requests_served += 1
+            self.chars_served += chars
+            self.warm = True
+        self.last_inference_time = message.get('elapsed', self.last_inference_time)
+        self.busy_time += message.get('elapsed') or 0.0
+        if not future.done():
+            # Callers waiting through asyncio may have cancelled the future
+            future.set_result(message)
+
+    def _fail_pending(self, error):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+
+        for future, _ in pending.values():
+            if not future.done():
+                future.set_result({"success": False, "error": error})
+
+
+if __name__ == "__main__":
+    sys.exit(worker_main())
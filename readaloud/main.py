@@ -10,18 +10,30 @@ import sys
 import argparse
 import time
 import threading
+import itertools
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple, Iterable
 
-# Add the project root to Python path
+# Add the project root to Python path (and its parent, for the readaloud package)
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from tts_engine import TTSEngine, AudioPlayer
-from engines.higgs_audio import HiggsAudioEngine
-from engines.coqui_tts import CoquiTTSEngine
-from triggers import (
+from readaloud.tts_engine import TTSEngine, create_audio_player
+from readaloud.pipeline import SynthesisPipeline
+from readaloud.speculative import SpeculativeSynthesizer
+from readaloud.text_processing import TextProcessor, BLOCK_CHARS
+from readaloud.document_reader import DocumentReader, BookmarkStore, DEFAULT_BOOKMARK_FILE, LARGE_FILE_BYTES
+from readaloud.audio_cache import AudioCache, key_for
+from readaloud.probe_cache import ProbeCache
+from readaloud.calibration import EngineCalibration, DEFAULT_CALIBRATION_FILE, SHORT_TEXT_CHARS
+from readaloud.engines.higgs_audio import HiggsAudioEngine
+from readaloud.engines.coqui_tts import CoquiTTSEngine
+from readaloud.engines.hedged import HedgedEngine
+from readaloud.triggers import (
     ClipboardTrigger, 
+    ClipboardWatcher,
     FileMonitorTrigger, 
+    FileFilter,
     HotkeyTrigger, 
     TextInputTrigger
 )
@@ -34,20 +46,69 @@ class ReadAloud:
         """Initialize ReadAloud application."""
         self.config = config or {}
         self.tts_engine = None
-        self.audio_player = AudioPlayer()
+        self.audio_player = create_audio_player(self.config.get('playback'))
+        self.audio_player.set_effects_from_config(self.config)
+        self.audio_cache = AudioCache.from_config(self.config.get('cache'))
+        text_config = dict(self.config.get('text_processing') or {})
+        if 'pipeline_chunk_chars' in self.config:
+            # Older name of the segment size (from when only pipelined reading split text)
+            text_config['max_chars'] = self.config['pipeline_chunk_chars']
+        self.text_processor = TextProcessor.from_config(text_config)
+        documents = self.config.get('documents') or {}
+        self.bookmarks = BookmarkStore(documents.get('bookmarks') or DEFAULT_BOOKMARK_FILE)
         self.current_audio = None
+        self.current_pipeline = None
         self.running = False
         
+        # Foreground syntheses in progress (pre-synthesis waits while there are any)
+        self._foreground_syntheses = 0
+        self._foreground_lock = threading.Lock()
+        
+        # Engines 'auto' mode routes between, highest quality first
+        self.auto_engines = []
+        self.calibration = EngineCalibration(
+            (self.config.get('calibration') or {}).get('path') or DEFAULT_CALIBRATION_FILE
+        )
+        
         # Initialize TTS engine
         self._setup_tts_engine()
         
-        # Initialize triggers
+        # Initialize triggers (large files are read lazily as documents)
+        large_file_bytes = int(documents.get('large_file_kb', LARGE_FILE_BYTES // 1024) * 1024)
+        monitoring = self.config.get('monitoring') or {}
         self.triggers = {
-            'clipboard': ClipboardTrigger(self._handle_text),
-            'file_monitor': FileMonitorTrigger(self._handle_file_change),
-            'hotkeys': HotkeyTrigger(self._handle_text),
-            'text_input': TextInputTrigger(self._handle_text)
+            'clipboard': ClipboardTrigger(
+                self._handle_text,
+                check_interval=monitoring.get('clipboard_interval', 1.0),
+                min_interval=monitoring.get('clipboard_min_interval', 0.25),
+                backend=monitoring.get('clipboard_backend', 'auto')
+            ),
+            'file_monitor': FileMonitorTrigger(
+                self._handle_file_change,
+                document_callback=self.read_document,
+                large_file_bytes=large_file_bytes,
+                mode=monitoring.get('file_mode', 'diff'),
+                mmap_threshold=int(monitoring.get('mmap_threshold_kb', 1024) * 1024),
+                debounce=monitoring.get('debounce', 0.3),
+                file_filter=FileFilter.from_config(monitoring),
+                max_tracked_files=monitoring.get('max_tracked_files', 4096)
+            ),
+            'hotkeys': HotkeyTrigger(self._handle_text, stop_callback=self.stop_audio),
+            'text_input': TextInputTrigger(self._handle_text, document_callback=self.read_document,
+                                           large_file_bytes=large_file_bytes)
         }
+        
+        # Opt-in pre-synthesis of new clipboard content (started by start_speculation)
+        self.speculator = None
+        self.speculation_watcher = None
+        speculative = self.config.get('speculative') or {}
+        if speculative.get('enabled'):
+            self.speculator = SpeculativeSynthesizer.from_config(
+                speculative,
+                lambda text: self._plan_synthesis(text)[:2],
+                lambda text, engine: self._synthesize(text, engine, background=True),
+                is_idle=lambda: self.current_pipeline is None and not self._foreground_syntheses
+            )
     
     def _setup_tts_engine(self):
         """Setup the TTS engine based on configuration and availability."""
@@ -58,6 +119,9 @@ class ReadAloud:
                 self.tts_engine = HiggsAudioEngine(self.config.get('higgs_config', {}))
                 if self.tts_engine.is_available:
                     print("Using Higgs Audio TTS engine")
+                    if engine_name == 'auto':
+                        self._setup_auto_selection()
+                    self._setup_hedging()
                     return
             except Exception as e:
                 print(f"Higgs Audio not available: {e}")
@@ -67,6 +131,7 @@ class ReadAloud:
                 self.tts_engine = CoquiTTSEngine(self.config.get('coqui_config', {}))
                 if self.tts_engine.is_available:
                     print("Using Coqui TTS engine")
+                    self._setup_hedging()
                     return
             except Exception as e:
                 print(f"Coqui TTS not available: {e}")
@@ -75,31 +140,339 @@ class ReadAloud:
         print("No TTS engine available. Please install Higgs Audio or Coqui TTS.")
         sys.exit(1)
     
+    def _setup_auto_selection(self):
+        """Route requests between engines by text length when calibration results exist."""
+        if (self.config.get('hedging') or {}).get('enabled'):
+            return
+        if not self.calibration.get_for(self.tts_engine):
+            return
+        
+        coqui_config = self.config.get('coqui_config', {})
+        model_name = coqui_config.get('model_name', CoquiTTSEngine.DEFAULT_MODEL)
+        if not self.calibration.get(CoquiTTSEngine.engine_id, model_name):
+            return
+        
+        try:
+            coqui = CoquiTTSEngine(coqui_config)
+        except Exception as e:
+            print(f"Coqui TTS not available: {e}")
+            return
+        
+        if coqui.is_available:
+            self.auto_engines = [self.tts_engine, coqui]
+            print("Auto mode: choosing between Higgs Audio and Coqui TTS by text length")
+    
+    def _select_engine(self, text: str) -> TTSEngine:
+        """Engine to synthesize a text with."""
+        if not self.auto_engines:
+            return self.tts_engine
+        short_text_chars = (self.config.get('calibration') or {}).get('short_text_chars', SHORT_TEXT_CHARS)
+        return self.calibration.choose(text, self.auto_engines, short_text_chars)
+    
+    def calibrate(self):
+        """Measure every available engine and store the results for 'auto' mode."""
+        engines = [self.tts_engine.primary if isinstance(self.tts_engine, HedgedEngine) else self.tts_engine]
+        for engine_class, config_key in ((HiggsAudioEngine, 'higgs_config'), (CoquiTTSEngine, 'coqui_config')):
+            if any(isinstance(engine, engine_class) for engine in engines):
+                continue
+            try:
+                # No background preload: it would overlap the cold-start measurement
+                engine = engine_class({**self.config.get(config_key, {}), 'preload': False})
+                if engine.is_available:
+                    engines.append(engine)
+            except Exception as e:
+                print(f"{engine_class.__name__} not available: {e}")
+        
+        for engine in engines:
+            name = engine.get_engine_info().get('name', engine.engine_id)
+            print(f"Calibrating {name}...")
+            try:
+                result = self.calibration.calibrate(engine)
+            except Exception as e:
+                print(f"  Calibration failed: {e}")
+                continue
+            print(f"  cold latency: {result['cold_latency']:.2f}s")
+            print(f"  warm latency: {result['warm_latency']:.2f}s")
+            print(f"  real-time factor: {result['rtf']:.2f}")
+        
+        print(f"Calibration saved to {self.calibration.path}")
+    
+    def _setup_hedging(self):
+        """Wrap the selected engine with latency-budget fallbacks when hedging is enabled."""
+        hedging = self.config.get('hedging') or {}
+        if not hedging.get('enabled'):
+            return
+        
+        fallbacks = []
+        for engine_class, config_key in ((HiggsAudioEngine, 'higgs_config'), (CoquiTTSEngine, 'coqui_config')):
+            if isinstance(self.tts_engine, engine_class):
+                continue
+            try:
+                fallbacks.append(engine_class(self.config.get(config_key, {})))
+            except Exception as e:
+                print(f"Fallback engine {engine_class.__name__} not available: {e}")
+        
+        hedged = HedgedEngine(self.tts_engine, fallbacks, hedging)
+        if hedged.fallbacks:
+            self.tts_engine = hedged
+            print(f"Hedging after {hedged.budget}s with: {', '.join(e.engine_id for e in hedged.fallbacks)}")
+        else:
+            print("Hedging enabled but no fallback engine is available")
+    
+    def _synthesize(self, text: str, engine: Optional[TTSEngine] = None, background: bool = False) -> str:
+        """
+        Synthesize text with the configured voice settings, reusing cached audio.
+        
+        Args:
+            text: Text to synthesize
+            engine: Engine to use (None selects one for the text)
+            background: Pre-synthesis; queued behind foreground requests where the
+                engine supports it
+        """
+        if background:
+            return self._synthesize_cached(text, engine, background=True)
+        
+        with self._foreground_lock:
+            self._foreground_syntheses += 1
+        try:
+            if self.speculator:
+                # Already being pre-synthesized: wait for it to land in the cache
+                self.speculator.wait_for(text)
+            return self._synthesize_cached(text, engine)
+        finally:
+            with self._foreground_lock:
+                self._foreground_syntheses -= 1
+    
+    def _synthesize_cached(self, text: str, engine: Optional[TTSEngine] = None, **options) -> str:
+        """Look up or synthesize the audio for a text (options are passed to the engine)."""
+        voice = self.config.get('voice')
+        temperature = self.config.get('temperature', 0.3)
+        seed = self.config.get('seed')
+        
+        if isinstance(self.tts_engine, HedgedEngine):
+            return self._synthesize_hedged(text, voice, temperature, seed, **options)
+        
+        engine = engine or self._select_engine(text)
+        voice = self._voice_for(engine, voice)
+        key = key_for(
+            engine.engine_id,
+            engine.config,
+            text,
+            voice=voice,
+            temperature=temperature,
+            seed=seed
+        )
+        
+        return self.audio_cache.get_or_create(key, lambda output_path: engine.synthesize(
+            text,
+            output_path=output_path,
+            voice=voice,
+            temperature=temperature,
+            seed=seed,
+            **options
+        ))
+    
+    def _voice_for(self, engine: TTSEngine, voice: Optional[str]) -> Optional[str]:
+        """
+        Voice to request from an engine chosen in auto mode.
+        
+        The configured voice belongs to the configured engine (a reference clip
+        for Higgs), so an engine picked by text length uses its default voice.
+        """
+        return voice if engine is self.tts_engine else None
+    
+    def _synthesize_hedged(self, text: str, voice: Optional[str], temperature: float,
+                           seed: Optional[int], **options) -> str:
+        """Synthesize through the hedged engine, caching audio under the engine that produced it."""
+        hedged = self.tts_engine
+        keys = {
+            engine.engine_id: key_for(
+                engine.engine_id,
+                engine.config,
+                text,
+                voice=hedged.voice_for(engine, voice),
+                temperature=temperature,
+                seed=seed
+            )
+            for engine in hedged.engines
+        }
+        
+        # Any member's audio for this text will do, preferring the primary's
+        for key in keys.values():
+            cached = self.audio_cache.get(key)
+            if cached:
+                return cached
+        
+        output_path, winner = hedged.synthesize_hedged(
+            text,
+            voice=voice,
+            temperature=temperature,
+            seed=seed,
+            **options
+        )
+        return self.audio_cache.put(keys[winner.engine_id], output_path)
+    
+    def _prepare_text(self, text: str) -> list:
+        """Normalize text and split it into the segments that are synthesized (and cached)."""
+        return self.text_processor.process(text)
+    
+    def _plan_synthesis(self, text: str) -> Tuple[Iterable[str], Optional[TTSEngine], bool]:
+        """
+        Decide how a text is synthesized (shared by playback and pre-synthesis, so both
+        use the same cache keys).
+        
+        Returns:
+            (texts to synthesize in order, engine for all of them or None to select
+            per text, whether they are read pipelined); long texts are planned as
+            an iterator that is normalized while it is read
+        """
+        if len(text) > BLOCK_CHARS:
+            # Don't normalize a whole document before the first segment can be read
+            segments = self.text_processor.iter_process(text)
+            first = next(segments, None)
+            if first is None:
+                return [], None, False
+            return itertools.chain([first], segments), self._select_engine(text), True
+        
+        segments = self._prepare_text(text)
+        max_request_chars = (self.config.get('text_processing') or {}).get('max_request_chars', 1000)
+        if len(segments) > 1 and (self.config.get('pipeline', False)
+                                  or sum(len(segment) for segment in segments) > max_request_chars):
+            # Long texts are always read segment by segment instead of as one huge request.
+            # Pick the engine once for the whole text so every segment uses the same voice
+            return segments, self._select_engine(text), True
+        return ([' '.join(segments)] if segments else []), None, False
+    
     def _handle_text(self, text: str):
         """Handle text input from various triggers."""
         if not text or not text.strip():
             return
         
-        print(f"Processing text: {text[:100]}...")
+        if self.speculator:
+            # The text is wanted now; any pre-synthesis still queued is moot
+            self.speculator.cancel()
+        
+        items, engine, pipelined = self._plan_synthesis(text)
+        if not items:
+            return
+        
+        print(f"Processing text: {text.strip()[:100]}...")
+        
+        barge_in = (self.config.get('playback') or {}).get('barge_in', True)
+        if barge_in and self.current_pipeline:
+            # Don't queue more of the previous text; its audio stops when ours starts
+            self.current_pipeline.stop()
+        
+        if pipelined:
+            self._handle_text_pipelined(items, engine, preempt=barge_in)
+            return
         
         try:
             # Generate audio
-            output_path = self.tts_engine.synthesize(
-                text,
-                voice=self.config.get('voice'),
-                temperature=self.config.get('temperature', 0.3),
-                seed=self.config.get('seed')
-            )
+            output_path = self._synthesize(items[0])
             
             # Play audio
             self.current_audio = output_path
-            self.audio_player.play(output_path)
+            self.audio_player.play(output_path, preempt=barge_in)
             
             print(f"Audio generated and playing: {output_path}")
             
         except Exception as e:
             print(f"Error processing text: {e}")
     
+    def _handle_text_pipelined(self, chunks, engine: Optional[TTSEngine] = None,
+                               preempt: bool = False, on_chunk=None) -> list:
+        """
+        Play chunk N while chunk N+1 is being synthesized.
+        
+        Args:
+            chunks: List of chunks, or an iterator that is consumed lazily
+            engine: Engine for every chunk (None selects per chunk)
+            preempt: Stop other playback when the first chunk starts
+            on_chunk: Also called with (index, audio path) before each chunk plays
+        
+        Returns:
+            Audio files that were played
+        """
+        total = f"/{len(chunks)}" if isinstance(chunks, list) else ""
+        print(f"Pipelined synthesis: {len(chunks)} chunks" if total else "Pipelined synthesis: reading ahead")
+        
+        def on_play(index, output_path):
+            self.current_audio = output_path
+            print(f"Playing chunk {index + 1}{total}: {output_path}")
+            if on_chunk:
+                on_chunk(index, output_path)
+        
+        def play(output_path):
+            nonlocal preempt
+            if preempt:
+                # Barge in once, when the first chunk is ready; later chunks queue behind it
+                self.audio_player.stop()
+                preempt = False
+            return self.audio_player.enqueue(output_path)
+        
+        pipeline = SynthesisPipeline(
+            lambda chunk: self._synthesize(chunk, engine),
+            play,
+            lookahead=self.config.get('pipeline_lookahead', 2)
+        )
+        self.current_pipeline = pipeline
+        
+        try:
+            return pipeline.run(chunks, on_chunk=on_play)
+        except Exception as e:
+            print(f"Error processing text: {e}")
+            return []
+        finally:
+            if self.current_pipeline is pipeline:
+                self.current_pipeline = None
+    
+    def read_document(self, file_path: str, resume: Optional[bool] = None):
+        """
+        Read a long text file paragraph by paragraph, bookmarking the position.
+        
+        Only a bounded number of segments is read and synthesized ahead of
+        playback, so memory use does not grow with the document.
+        
+        Args:
+            file_path: Text file to read
+            resume: Continue from the saved bookmark (defaults to documents.resume)
+        """
+        if not os.path.exists(file_path):
+            print(f"File not found: {file_path}")
+            return
+        if resume is None:
+            resume = (self.config.get('documents') or {}).get('resume', False)
+        
+        reader = DocumentReader(file_path, self.text_processor)
+        bookmark = self.bookmarks.get(file_path) if resume else None
+        offset, skip = (bookmark['offset'], bookmark['segment']) if bookmark else (0, 0)
+        if bookmark:
+            print(f"Resuming {file_path} at byte {offset}")
+        
+        barge_in = (self.config.get('playback') or {}).get('barge_in', True)
+        if barge_in and self.current_pipeline:
+            self.current_pipeline.stop()
+        
+        # Position of each segment, recorded as the producer reads ahead
+        positions = {}
+        
+        def segments():
+            for index, (segment, paragraph_offset, segment_index) in enumerate(reader.iter_segments(offset, skip)):
+                positions[index] = (paragraph_offset, segment_index)
+                yield segment
+        
+        def on_chunk(index, output_path):
+            # Bookmark the segment that is starting, so a resume repeats it rather than skipping it
+            self.bookmarks.set(file_path, *positions.pop(index))
+        
+        played = self._handle_text_pipelined(segments(), self._select_engine(reader.preview()),
+                                             preempt=barge_in, on_chunk=on_chunk)
+        
+        if reader.exhausted and len(played) == reader.segments_read:
+            self.bookmarks.clear(file_path)
+            print(f"Finished reading: {file_path}")
+    
     def _handle_file_change(self, file_path: str, content: str):
         """Handle file change events."""
         print(f"File changed: {file_path}")
@@ -111,24 +484,55 @@ class ReadAloud:
         self.triggers['clipboard'].start_monitoring()
     
     def start_file_monitoring(self, file_path: str):
-        """Start monitoring a file for changes."""
+        """Start monitoring a file (or a directory's matching files) for changes."""
         print(f"Starting file monitoring for: {file_path}")
-        self.triggers['file_monitor'].add_file(file_path)
+        if os.path.isdir(file_path):
+            recursive = (self.config.get('monitoring') or {}).get('recursive', True)
+            self.triggers['file_monitor'].add_directory(file_path, recursive=recursive)
+        else:
+            self.triggers['file_monitor'].add_file(file_path)
         self.triggers['file_monitor'].start_monitoring()
     
     def start_hotkey_monitoring(self):
         """Start monitoring for global hotkeys."""
         print("Starting hotkey monitoring...")
+        self.start_speculation()
         self.triggers['hotkeys'].start_monitoring()
     
     def start_interactive_mode(self):
         """Start interactive text input mode."""
         print("Starting interactive mode...")
+        self.start_speculation()
         self.triggers['text_input'].interactive_input()
     
-    def read_file(self, file_path: str):
-        """Read a file immediately."""
-        self.triggers['text_input'].read_from_file(file_path)
+    def start_speculation(self):
+        """Pre-synthesize clipboard content as it changes (if 'speculative' is enabled)."""
+        if not self.speculator or self.speculation_watcher:
+            return
+        
+        self.speculation_watcher = ClipboardWatcher.from_config(self.config.get('monitoring'))
+        
+        def watch():
+            for content in self.speculation_watcher.changes():
+                self.speculator.submit(content)
+        
+        threading.Thread(target=watch, name="SpeculationClipboard", daemon=True).start()
+        print(f"Speculative synthesis enabled (clipboard {self.speculation_watcher.backend})")
+    
+    def stop_speculation(self):
+        """Stop pre-synthesizing clipboard content."""
+        if self.speculation_watcher:
+            self.speculation_watcher.stop()
+            self.speculation_watcher = None
+        if self.speculator:
+            self.speculator.cancel()
+    
+    def read_file(self, file_path: str, resume: bool = False):
+        """Read a file immediately (resuming from its bookmark if requested)."""
+        if resume:
+            self.read_document(file_path, resume=True)
+        else:
+            self.triggers['text_input'].read_from_file(file_path)
     
     def read_clipboard(self):
         """Read current clipboard content."""
@@ -136,6 +540,8 @@ class ReadAloud:
     
     def stop_audio(self):
         """Stop current audio playback."""
+        if self.current_pipeline:
+            self.current_pipeline.stop()
         if self.current_audio:
             self.audio_player.stop()
             self.current_audio = None
@@ -154,8 +560,14 @@ class ReadAloud:
     def get_available_voices(self):
         """Get list of available voices."""
         if self.tts_engine:
-            voices = self.tts_engine.get_available_voices()
             print("Available voices:")
+            if isinstance(self.tts_engine, HiggsAudioEngine):
+                for voice in self.tts_engine.get_available_voices(with_status=True):
+                    marker = " (prepared)" if voice['prepared'] else ""
+                    print(f"  {voice['path']}{marker}")
+                return
+            
+            voices = self.tts_engine.get_available_voices()
             for voice in voices:
                 print(f"  {voice}")
         else:
@@ -173,18 +585,28 @@ def main():
     parser.add_argument('--temperature', type=float, default=0.3, 
                        help='Temperature for text generation')
     parser.add_argument('--seed', type=int, help='Random seed for generation')
+    parser.add_argument('--volume', type=float, default=1.0,
+                       help='Playback volume (applied to cached audio, no re-synthesis)')
+    parser.add_argument('--speed', type=float, default=1.0,
+                       help='Playback speed, pitch preserved (applied to cached audio)')
+    parser.add_argument('--hedge-budget', type=float, metavar='SECONDS',
+                       help='Start a fallback engine if the primary has not finished within SECONDS')
+    parser.add_argument('--pipeline', action='store_true',
+                       help='Read every multi-sentence text sentence by sentence, starting playback after the first one')
     
     # Trigger options
     parser.add_argument('--clipboard', action='store_true', 
                        help='Monitor clipboard for changes')
-    parser.add_argument('--monitor', metavar='FILE', 
-                       help='Monitor a file for changes')
+    parser.add_argument('--monitor', metavar='PATH', 
+                       help='Monitor a file, or the matching files in a directory, for changes')
     parser.add_argument('--hotkeys', action='store_true', 
                        help='Enable global hotkeys')
     parser.add_argument('--interactive', action='store_true', 
                        help='Start interactive mode')
     parser.add_argument('--file', metavar='FILE', 
                        help='Read a specific file')
+    parser.add_argument('--resume', action='store_true',
+                       help='With --file, continue from where reading last stopped')
     
     # Configuration
     parser.add_argument('--config', metavar='FILE', 
@@ -193,6 +615,10 @@ def main():
                        help='Show TTS engine information')
     parser.add_argument('--voices', action='store_true', 
                        help='Show available voices')
+    parser.add_argument('--calibrate', action='store_true',
+                       help='Measure installed engines on this machine for auto engine selection')
+    parser.add_argument('--refresh-probes', action='store_true',
+                       help='Re-check engine dependencies instead of using cached results')
     
     args = parser.parse_args()
     
@@ -201,9 +627,19 @@ def main():
         'tts_engine': args.engine,
         'voice': args.voice,
         'temperature': args.temperature,
-        'seed': args.seed
+        'seed': args.seed,
+        'volume': args.volume,
+        'speed': args.speed,
+        'pipeline': args.pipeline
     }
     
+    if args.hedge_budget is not None:
+        config['hedging'] = {'enabled': True, 'budget': args.hedge_budget}
+    
+    if args.refresh_probes:
+        ProbeCache().clear()
+        print("Engine probe cache cleared")
+    
     # Create application
     app = ReadAloud(config)
     
@@ -216,9 +652,13 @@ def main():
         app.get_available_voices()
         return
     
+    if args.calibrate:
+        app.calibrate()
+        return
+    
     # Handle different modes
     if args.file:
-        app.read_file(args.file)
+        app.read_file(args.file, resume=args.resume)
     elif args.clipboard:
         app.start_clipboard_monitoring()
     elif args.monitor:
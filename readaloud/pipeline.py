@@ -0,0 +1,144 @@
+"""
+Pipelined Synthesis for ReadAloud.
+
+This module splits text into sentence-sized chunks and plays each chunk while
+the following ones are being synthesized, so audio starts after the first
+sentence instead of after the whole document.
+"""
+
+import queue
+import threading
+from typing import TYPE_CHECKING, Callable, Iterable, List, Optional
+
+if TYPE_CHECKING:
+    from .tts_engine import PlaybackHandle
+
+
+def split_into_chunks(text: str, max_chars: int = 300, min_chars: int = 40) -> List[str]:
+    """
+    Split text into chunks for pipelined synthesis.
+
+    See text_processing.segment_text: the first chunk is a single sentence
+    so playback can start early, later sentences are merged up to min_chars.
+
+    Args:
+        text: Text to split
+        max_chars: Upper bound for a chunk
+        min_chars: Sentences shorter than this are merged with the next one
+
+    Returns:
+        List of non-empty chunks in reading order
+    """
+    from .text_processing import segment_text
+    return segment_text(text, max_chars, min_chars)
+
+
+class SynthesisPipeline:
+    """Synthesize chunks ahead of playback on a background thread."""
+
+    def __init__(self, synthesize: Callable[[str], str], play: Callable[[str], "PlaybackHandle"],
+                 lookahead: int = 2):
+        """
+        Initialize the pipeline.
+
+        Args:
+            synthesize: Function turning a chunk of text into an audio file path
+            play: Function queueing an audio file behind the previous one without
+                waiting (an audio player's enqueue), returning its PlaybackHandle
+            lookahead: How many synthesized chunks may wait for playback
+        """
+        self.synthesize = synthesize
+        self.play = play
+        self.lookahead = max(1, lookahead)
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        """Stop after the chunk that is currently playing."""
+        self._stop_event.set()
+
+    @property
+    def stopped(self) -> bool:
+        return self._stop_event.is_set()
+
+    def _wait(self, handle) -> bool:
+        """Wait for a chunk to finish playing; False if the pipeline was stopped."""
+        while not handle.wait(0.1):
+            if self._stop_event.is_set():
+                return False
+        return not self._stop_event.is_set()
+
+    def _produce(self, chunks: Iterable[str], ready: "queue.Queue"):
+        """Synthesize chunks in order, handing each one to the player."""
+        try:
+            for chunk in chunks:
+                if self._stop_event.is_set():
+                    break
+                path = self.synthesize(chunk)
+                # Block while the player is lookahead chunks behind
+                while not self._stop_event.is_set():
+                    try:
+                        ready.put(path, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+        except Exception as e:
+            ready.put(e)
+        finally:
+            ready.put(None)
+
+    def run(self, chunks: Iterable[str], on_chunk: Optional[Callable[[int, str], None]] = None) -> List[str]:
+        """
+        Synthesize and play chunks, overlapping synthesis of chunk N+1 with playback of chunk N.
+
+        Chunk N+1 is queued on the player while chunk N plays, so a queueing
+        player goes from one to the next without a gap.
+
+        Args:
+            chunks: Text chunks in reading order; iterators are consumed lazily, at most
+                lookahead chunks ahead of playback
+            on_chunk: Called with (index, audio_path) as each chunk starts playing
+
+        Returns:
+            Audio files that were played
+        """
+        self._stop_event.clear()
+        ready = queue.Queue(maxsize=self.lookahead)
+        producer = threading.Thread(target=self._produce, args=(chunks, ready),
+                                    name="SynthesisPipeline", daemon=True)
+        producer.start()
+
+        played = []
+        playing = None
+        try:
+            while True:
+                item = ready.get()
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                if self._stop_event.is_set():
+                    continue
+
+                handle = self.play(item)
+                if playing is not None and not self._wait(playing):
+                    # Stopped during the previous chunk: this one must not follow it
+                    handle.stop()
+                    continue
+
+                if on_chunk:
+                    on_chunk(len(played), item)
+                played.append(item)
+                playing = handle
+
+            if playing is not None:
+                self._wait(playing)
+        finally:
+            # Unblock the producer if playback ended early
+            self._stop_event.set()
+            while producer.is_alive():
+                try:
+                    ready.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+
+        return played
@@ -0,0 +1,101 @@
+"""
+Engine Probe Cache for ReadAloud.
+
+Checking whether an engine's Python environment can import its dependencies
+means starting an interpreter and importing torch, which takes seconds. This
+module persists probe results so later starts can skip the subprocess.
+
+Results are keyed by the interpreter path, the interpreter's modification time
+and the model path; any change to those invalidates the cached result. Use
+ProbeCache.clear() (``main.py --refresh-probes``) after installing packages.
+"""
+
+import os
+import json
+import time
+import shutil
+from typing import Optional, Dict, Any
+
+
+DEFAULT_PROBE_CACHE = os.path.join(os.path.expanduser('~'), '.cache', 'readaloud', 'engine_probes.json')
+
+
+def interpreter_fingerprint(python_path: str) -> Dict[str, Any]:
+    """Resolve an interpreter command to its real path and modification time."""
+    resolved = shutil.which(python_path) or python_path
+    resolved = os.path.realpath(resolved)
+    try:
+        mtime = os.path.getmtime(resolved)
+    except OSError:
+        mtime = None
+    return {'python': resolved, 'python_mtime': mtime}
+
+
+class ProbeCache:
+    """Persistent store of engine availability probe results."""
+
+    def __init__(self, path: str = DEFAULT_PROBE_CACHE):
+        """
+        Initialize the probe cache.
+
+        Args:
+            path: JSON file holding probe results
+        """
+        self.path = path
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, entries: Dict[str, Any]):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, indent=2)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"Error saving probe cache to {self.path}: {e}")
+
+    def get(self, engine_id: str, key: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Look up a probe result.
+
+        Args:
+            engine_id: Engine the probe belongs to
+            key: Interpreter fingerprint and model path the result depends on
+
+        Returns:
+            The stored result, or None if missing or stale
+        """
+        entry = self._load().get(engine_id)
+        if not entry or entry.get('key') != key:
+            return None
+        return entry
+
+    def set(self, engine_id: str, key: Dict[str, Any], available: bool, message: str = ""):
+        """Store a probe result."""
+        entries = self._load()
+        entries[engine_id] = {
+            'key': key,
+            'available': available,
+            'message': message,
+            'checked_at': time.time()
+        }
+        self._save(entries)
+
+    def clear(self, engine_id: Optional[str] = None):
+        """Forget one engine's result, or all of them."""
+        if engine_id is None:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+            return
+
+        entries = self._load()
+        if entries.pop(engine_id, None) is not None:
+            self._save(entries)
@@ -0,0 +1,174 @@
+"""
+Speculative Pre-Synthesis for ReadAloud.
+
+This module synthesizes text the user is likely to ask for next (new
+clipboard content) on a background thread, so its audio is already cached
+when the read-clipboard hotkey or StreamDeck button is pressed. Each new
+submission cancels the previous one between segments.
+
+Foreground requests go first: the speculation thread waits while is_idle()
+is False, and its requests are marked as background, which the Higgs worker
+queues behind foreground ones. A segment that is already being generated
+is not interrupted, so a read can still wait for up to one speculative
+segment (with Coqui, which has no request queue, it shares the model lock).
+"""
+
+import itertools
+import threading
+from typing import Callable, Iterable, Optional, Tuple, Any, Dict
+
+
+# Clipboard changes come in bursts; wait this long before starting
+DEFAULT_DELAY = 0.3
+
+# Only the first items are pre-synthesized; the pipeline reads ahead from there
+DEFAULT_MAX_SEGMENTS = 3
+
+# Longer texts are not speculated on (copying a whole document is not a request to read it)
+DEFAULT_MAX_CHARS = 5000
+
+# How often a paused worker checks whether foreground synthesis has finished
+IDLE_CHECK_SECONDS = 0.1
+
+
+class SpeculativeSynthesizer:
+    """Pre-synthesize the most recently submitted text into the audio cache."""
+
+    def __init__(self, plan: Callable[[str], Tuple[Iterable[str], Any]],
+                 synthesize: Callable[[str, Any], str],
+                 is_idle: Optional[Callable[[], bool]] = None,
+                 delay: float = DEFAULT_DELAY, max_segments: int = DEFAULT_MAX_SEGMENTS,
+                 max_chars: int = DEFAULT_MAX_CHARS):
+        """
+        Initialize the speculative synthesizer.
+
+        Args:
+            plan: Turns a text into (items to synthesize, engine), exactly as playback
+                would, so the cached audio is found under the same keys
+            synthesize: Synthesizes one item with the engine into the cache, at
+                background priority
+            is_idle: Returns False while foreground synthesis or reading runs; no new
+                item is started then
+            delay: Seconds a submission must stay current before work starts
+            max_segments: Items pre-synthesized per text
+            max_chars: Texts longer than this are ignored
+        """
+        self.plan = plan
+        self.synthesize = synthesize
+        self.is_idle = is_idle or (lambda: True)
+        self.delay = delay
+        self.max_segments = max(1, max_segments)
+        self.max_chars = max_chars
+
+        self._condition = threading.Condition()
+        self._generation = 0
+        self._pending = None
+        self._in_flight = None
+        self._in_flight_done = None
+        self._stopped = False
+        self._thread = None
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]], plan: Callable[[str], Tuple[Iterable[str], Any]],
+                    synthesize: Callable[[str, Any], str],
+                    is_idle: Optional[Callable[[], bool]] = None) -> "SpeculativeSynthesizer":
+        """Create a synthesizer from the 'speculative' config section."""
+        config = config or {}
+        return cls(
+            plan,
+            synthesize,
+            is_idle,
+            delay=config.get('delay', DEFAULT_DELAY),
+            max_segments=config.get('max_segments', DEFAULT_MAX_SEGMENTS),
+            max_chars=config.get('max_chars', DEFAULT_MAX_CHARS)
+        )
+
+    def submit(self, text: str):
+        """Start pre-synthesizing a text, cancelling work on the previous one."""
+        with self._condition:
+            self._generation += 1
+            if text and text.strip() and len(text) <= self.max_chars:
+                self._pending = (text, self._generation)
+            else:
+                self._pending = None
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="SpeculativeSynthesis",
+                                                daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def cancel(self):
+        """Drop pending work (an item already being synthesized still finishes)."""
+        with self._condition:
+            self._generation += 1
+            self._pending = None
+            self._condition.notify_all()
+
+    def stop(self):
+        """Cancel all work and end the worker thread."""
+        with self._condition:
+            self._stopped = True
+        self.cancel()
+
+    def wait_for(self, item: str, timeout: Optional[float] = None) -> bool:
+        """
+        Wait if an item is being pre-synthesized right now, so it is not synthesized twice.
+
+        Returns:
+            True if the item was in flight and finished (its audio is now cached)
+        """
+        if threading.current_thread() is self._thread:
+            return False
+        with self._condition:
+            if self._in_flight != item:
+                return False
+            done = self._in_flight_done
+        return done.wait(timeout)
+
+    def _current(self, generation: int) -> bool:
+        return generation == self._generation and not self._stopped
+
+    def _wait_current(self, generation: int, seconds: float) -> bool:
+        """Sleep unless superseded; returns whether the submission is still current."""
+        with self._condition:
+            if self._current(generation) and seconds > 0:
+                self._condition.wait_for(lambda: not self._current(generation), seconds)
+            return self._current(generation)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending is not None or self._stopped)
+                if self._stopped:
+                    return
+                text, generation = self._pending
+                self._pending = None
+
+            if not self._wait_current(generation, self.delay):
+                continue
+            try:
+                items, engine = self.plan(text)
+            except Exception as e:
+                print(f"Speculative synthesis skipped: {e}")
+                continue
+
+            for item in itertools.islice(items, self.max_segments):
+                # Foreground requests go first; wait until they are done
+                while self._wait_current(generation, 0) and not self.is_idle():
+                    self._wait_current(generation, IDLE_CHECK_SECONDS)
+
+                with self._condition:
+                    if not self._current(generation):
+                        break
+                    self._in_flight = item
+                    self._in_flight_done = threading.Event()
+                    done = self._in_flight_done
+                try:
+                    self.synthesize(item, engine)
+                except Exception as e:
+                    print(f"Speculative synthesis failed: {e}")
+                    break
+                finally:
+                    with self._condition:
+                        self._in_flight = None
+                    done.set()
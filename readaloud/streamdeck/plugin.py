@@ -53,10 +53,14 @@ class StreamDeckPlugin:
                 'voice': self.config.get('voice', 'default'),
                 'temperature': self.config.get('temperature', 0.3),
                 'seed': self.config.get('seed'),
-                'background_mode': True
+                'background_mode': True,
+                'speculative': self.config.get('speculative', {}),
+                'monitoring': self.config.get('monitoring', {})
             }
             
             self.app = ReadAloud(config)
+            # The read-clipboard button then plays pre-synthesized audio at once
+            self.app.start_speculation()
             print("ReadAloud initialized for StreamDeck integration")
             
         except Exception as e:
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Check synthesis cache keys and LRU eviction
+
+Every entry point must build the same key for the same request, and the
+cache must drop the least recently used entries once it outgrows its limit.
+"""
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from readaloud.audio_cache import AudioCache, DEFAULT_MODELS, key_for, make_cache_key
+
+
+def test_keys():
+    """Keys ignore whitespace and default voices but change with every output setting"""
+    key = make_cache_key("Hello  world.\n", "higgs_audio", "model", temperature=0.3)
+    assert key == make_cache_key(" Hello world. ", "higgs_audio", "model", temperature=0.30000001)
+    assert key == make_cache_key("Hello world.", "higgs_audio", "model", voice="default", temperature=0.3)
+
+    variants = [
+        make_cache_key("Hello world!", "higgs_audio", "model", temperature=0.3),
+        make_cache_key("Hello world.", "coqui", "model", temperature=0.3),
+        make_cache_key("Hello world.", "higgs_audio", "other", temperature=0.3),
+        make_cache_key("Hello world.", "higgs_audio", "model", voice="belinda", temperature=0.3),
+        make_cache_key("Hello world.", "higgs_audio", "model", temperature=0.7),
+        make_cache_key("Hello world.", "higgs_audio", "model", temperature=0.3, seed=1),
+    ]
+    assert len({key, *variants}) == len(variants) + 1
+    print("✓ Keys are stable across formatting and differ per setting")
+
+
+def test_key_for():
+    """key_for names the same model whether or not the config spells out the default"""
+    default = key_for('higgs_audio', {}, "Text.", temperature=0.3)
+    explicit = key_for('higgs_audio', {'model_name': DEFAULT_MODELS['higgs_audio'],
+                                       'model_path': '/opt/higgs'}, "Text.", temperature=0.3)
+    assert default == explicit
+    assert default != key_for('higgs_audio', {'model_name': 'another/model'}, "Text.", temperature=0.3)
+    print("✓ Install paths do not change keys; model names do")
+
+
+def _entry(work_dir, name, size=1024):
+    path = os.path.join(work_dir, name)
+    with open(path, 'wb') as f:
+        f.write(b'\0' * size)
+    return path
+
+
+def test_lru_eviction():
+    """Beyond the size limit the least recently used entry is evicted, not the oldest written"""
+    with tempfile.TemporaryDirectory() as work_dir:
+        cache = AudioCache(os.path.join(work_dir, 'cache'), max_size_mb=2.5 / 1024)
+
+        first = cache.put('first', _entry(work_dir, 'a.wav'))
+        second = cache.put('second', _entry(work_dir, 'b.wav'))
+        past = time.time() - 60
+        os.utime(first, (past, past))
+        os.utime(second, (past + 1, past + 1))
+
+        assert cache.get('first') == first
+        cache.put('third', _entry(work_dir, 'c.wav'))
+
+        assert cache.get('second') is None, "the least recently used entry survived"
+        assert cache.get('first') and cache.get('third')
+        assert cache.get_stats()['entries'] == 2
+    print("✓ A lookup keeps an entry; the least recently used one is evicted")
+
+
+def test_disabled():
+    """A disabled cache never stores or returns entries"""
+    with tempfile.TemporaryDirectory() as work_dir:
+        cache = AudioCache(os.path.join(work_dir, 'disabled'), enabled=False)
+        path = _entry(work_dir, 'd.wav')
+        assert cache.put('key', path) == path and os.path.exists(path)
+        assert cache.get('key') is None
+    print("✓ A disabled cache leaves files where they are")
+
+
+def main():
+    tests = [test_keys, test_key_for, test_lru_eviction, test_disabled]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"✗ {test.__doc__}: {e}")
+            failed += 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Check playback-time volume, speed and loudness processing
+
+Pins the output length of the time stretch, that it keeps the pitch, and
+the levels produced by the gain and loudness stages.
+"""
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from readaloud.audio_dsp import apply_gain, loudness_db, normalize_loudness, process, time_stretch
+
+SAMPLE_RATE = 24000
+
+
+def sine(frequency=440.0, seconds=1.0, amplitude=0.5):
+    t = np.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    return (amplitude * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+
+
+def dominant_frequency(samples):
+    spectrum = np.abs(np.fft.rfft(samples * np.hanning(len(samples))))
+    return np.argmax(spectrum) * SAMPLE_RATE / len(samples)
+
+
+def test_speed_length():
+    """Speeding up or slowing down scales the length and keeps the pitch"""
+    tone = sine()
+    for speed in (0.5, 0.75, 1.5, 2.0):
+        stretched = time_stretch(tone, speed)
+        assert len(stretched) == round(len(tone) / speed), f"speed {speed}: {len(stretched)} frames"
+        assert stretched.dtype == np.float32
+        assert abs(dominant_frequency(stretched) - 440.0) < 5.0, f"speed {speed} changed the pitch"
+
+    stereo = np.stack([tone, tone * 0.5], axis=1)
+    assert time_stretch(stereo, 2.0).shape == (len(tone) // 2, 2)
+    assert time_stretch(tone, 1.0) is tone
+    print("✓ Output length is len / speed and the pitch is unchanged")
+
+
+def test_gain():
+    """Volume scales linearly and clips to full scale"""
+    tone = sine(amplitude=0.5)
+    assert np.allclose(apply_gain(tone, 0.5), tone * 0.5)
+    loud = apply_gain(tone, 4.0)
+    assert np.max(np.abs(loud)) <= 1.0 and np.isclose(np.max(loud), 1.0)
+    print("✓ Volume scales the signal and clips at full scale")
+
+
+def test_normalize():
+    """Normalization reaches the target level without clipping, and leaves silence alone"""
+    quiet = sine(amplitude=0.02)
+    level = loudness_db(normalize_loudness(quiet, SAMPLE_RATE, target_db=-20.0), SAMPLE_RATE)
+    assert abs(level - -20.0) < 0.5, f"normalized to {level:.1f} dB"
+
+    # The boost is capped, so near-silent input is not amplified into noise
+    faint = sine(amplitude=0.006)
+    level = loudness_db(normalize_loudness(faint, SAMPLE_RATE, target_db=-20.0), SAMPLE_RATE)
+    assert abs(level - (loudness_db(faint, SAMPLE_RATE) + 20.0)) < 0.5, f"boosted to {level:.1f} dB"
+
+    loud = sine(amplitude=0.9)
+    limited = normalize_loudness(loud, SAMPLE_RATE, target_db=0.0)
+    assert np.max(np.abs(limited)) <= 0.99 + 1e-6, "normalization clipped"
+
+    silence = np.zeros(SAMPLE_RATE, dtype=np.float32)
+    assert np.array_equal(normalize_loudness(silence, SAMPLE_RATE), silence)
+    print("✓ Loudness reaches the target; boost and peaks are limited")
+
+
+def test_process_chain():
+    """The full chain applies speed and volume together"""
+    tone = sine(amplitude=0.5)
+    out = process(tone, SAMPLE_RATE, volume=0.5, speed=2.0)
+    assert len(out) == len(tone) // 2
+    # Stretching keeps the level, so the volume alone sets it
+    assert abs(loudness_db(out, SAMPLE_RATE) - (loudness_db(tone, SAMPLE_RATE) - 6.02)) < 0.5
+    print("✓ Speed and volume combine as expected")
+
+
+def main():
+    tests = [test_speed_length, test_gain, test_normalize, test_process_chain]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"✗ {test.__doc__}: {e}")
+            failed += 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
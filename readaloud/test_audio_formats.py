@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Check FLAC and Opus storage of synthesized audio
+
+FLAC must give back the exact 16-bit samples and Opus a close copy at a
+supported rate; the cache must store, find and export compressed entries.
+Needs soundfile (the compressed formats are unavailable without it).
+"""
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from readaloud.audio_cache import AudioCache
+from readaloud.audio_utils import compressed_formats_available, encode_audio, iter_blocks, read_wav, transcode, write_wav
+
+
+def speech_like(sample_rate, seconds=1.0):
+    """A few harmonics with a slow envelope, closer to speech than a pure tone"""
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 3 * t)
+    samples = sum(np.sin(2 * np.pi * f * t) / (i + 1) for i, f in enumerate((180, 360, 720, 1440)))
+    return (0.3 * envelope * samples).astype(np.float32)
+
+
+def test_flac_lossless():
+    """FLAC returns the same 16-bit samples at the same rate"""
+    with tempfile.TemporaryDirectory() as work_dir:
+        wav_path = os.path.join(work_dir, 'speech.wav')
+        flac_path = os.path.join(work_dir, 'speech.flac')
+        write_wav(wav_path, speech_like(22050), 22050)
+        transcode(wav_path, flac_path, quality=1.0)
+        original, _ = read_wav(wav_path)
+        decoded, sample_rate = read_wav(flac_path)
+
+        assert sample_rate == 22050
+        assert np.array_equal(decoded, original), "FLAC changed the samples"
+        assert os.path.getsize(flac_path) < os.path.getsize(wav_path), "FLAC is not smaller than WAV"
+    print("✓ FLAC round-trips losslessly and is smaller than WAV")
+
+
+def test_opus_round_trip():
+    """Opus resamples to a supported rate and keeps the signal close"""
+    samples = speech_like(22050)
+    with tempfile.TemporaryDirectory() as work_dir:
+        path = os.path.join(work_dir, 'speech.opus')
+        encode_audio(path, samples, 22050, 'opus')
+        decoded, sample_rate = read_wav(path)
+        opus_size = os.path.getsize(path)
+
+    assert sample_rate == 24000, f"stored at {sample_rate} Hz"
+    expected = int(len(samples) * 24000 / 22050)
+    assert abs(len(decoded) - expected) < 0.05 * expected, f"{len(decoded)} frames, expected {expected}"
+    assert opus_size < len(samples) * 2 / 4, "Opus is not much smaller than WAV"
+
+    # Compare levels rather than samples: Opus adds a short delay
+    reference = np.sqrt(np.mean(samples ** 2))
+    level = np.sqrt(np.mean(decoded ** 2))
+    assert abs(20 * np.log10(level / reference)) < 1.0, "Opus changed the level"
+    print("✓ Opus stores 22.05 kHz audio at 24 kHz with the same length and level")
+
+
+def test_cache_formats():
+    """A FLAC cache stores FLAC, finds WAV entries from before and exports WAV"""
+    samples = speech_like(24000, 0.5)
+    with tempfile.TemporaryDirectory() as work_dir:
+        cache_dir = os.path.join(work_dir, 'cache')
+
+        wav_cache = AudioCache(cache_dir)
+        old = os.path.join(work_dir, 'old.wav')
+        write_wav(old, samples, 24000)
+        wav_cache.put('old', old)
+
+        cache = AudioCache(cache_dir, audio_format='flac')
+        new = os.path.join(work_dir, 'new.wav')
+        write_wav(new, samples, 24000)
+        original, _ = read_wav(new)
+        entry = cache.put('new', new)
+        assert entry.endswith('.flac') and not os.path.exists(new)
+        assert cache.get('old').endswith('.wav'), "entries from before the format change were lost"
+
+        exported = cache.export(entry, os.path.join(work_dir, 'out.wav'))
+        decoded, sample_rate = read_wav(exported)
+        assert sample_rate == 24000 and np.array_equal(decoded, original)
+
+        blocks = [block for block, _ in iter_blocks(entry, blocksize=1000)]
+        assert len(blocks) > 1 and np.array_equal(np.concatenate(blocks), original)
+    print("✓ The cache stores FLAC, keeps older WAV entries and decodes block by block")
+
+
+def main():
+    if not compressed_formats_available():
+        print("soundfile is not installed; FLAC and Opus storage cannot be tested")
+        return 0
+
+    tests = [test_flac_lossless, test_opus_round_trip, test_cache_formats]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"✗ {test.__doc__}: {e}")
+            failed += 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
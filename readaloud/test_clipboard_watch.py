@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Check that clipboard changes are read on notification, not by busy polling
+
+The clipboard is replaced by an in-memory one that counts reads; the
+notification backends are driven by hand. watchdog, pyperclip and keyboard
+are stubbed when they are not installed.
+"""
+import os
+import sys
+import time
+import queue
+import types
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _module(name, **attributes):
+    module = types.ModuleType(name)
+    module.__dict__.update(attributes)
+    sys.modules[name] = module
+    return module
+
+
+def install_stubs():
+    """Stand-ins for the optional trigger dependencies"""
+    try:
+        import watchdog.observers
+        import watchdog.events
+    except ImportError:
+        _module('watchdog')
+        _module('watchdog.observers', Observer=object)
+        _module('watchdog.events', FileSystemEventHandler=object)
+
+    try:
+        import pyperclip
+    except ImportError:
+        _module('pyperclip', paste=lambda: '', copy=lambda text: None)
+
+    try:
+        import keyboard
+    except ImportError:
+        _module('keyboard')
+
+
+class Clipboard:
+    """In-memory clipboard that counts reads"""
+
+    def __init__(self, content=""):
+        self.content = content
+        self.reads = 0
+
+    def paste(self):
+        self.reads += 1
+        return self.content
+
+    def copy(self, text):
+        self.content = text
+
+
+def watch(backend, clipboard, **kwargs):
+    """Start a watcher on the fake clipboard; returns it and a queue of the texts it yields"""
+    from readaloud.triggers import clipboard_watch
+
+    clipboard_watch.pyperclip = clipboard
+    watcher = clipboard_watch.ClipboardWatcher(backend, **kwargs)
+    changes = queue.Queue()
+
+    def run():
+        for content in watcher.changes():
+            changes.put((time.monotonic(), content))
+
+    threading.Thread(target=run, daemon=True).start()
+    time.sleep(0.1)
+    return watcher, changes
+
+
+def test_notification():
+    """A notified change is read at once, and nothing is read while idle"""
+    from readaloud.triggers.clipboard_watch import ClipboardWatcher
+
+    clipboard = Clipboard("already there")
+    original = ClipboardWatcher._start_sequence
+    ClipboardWatcher._start_sequence = lambda self: None
+    try:
+        watcher, changes = watch('sequence', clipboard)
+    finally:
+        ClipboardWatcher._start_sequence = original
+
+    try:
+        reads = clipboard.reads
+        time.sleep(0.5)
+        assert clipboard.reads == reads, "the clipboard was polled while idle"
+
+        clipboard.copy("Read me now.")
+        notified = time.monotonic()
+        watcher._notify()
+        changed_at, content = changes.get(timeout=1)
+        assert content == "Read me now."
+        assert changed_at - notified < 0.1, f"took {changed_at - notified:.3f}s"
+
+        # Owner changes without new text (or with blank text) are not spoken
+        watcher._notify()
+        clipboard.copy("   ")
+        watcher._notify()
+        time.sleep(0.2)
+        assert changes.empty(), "unchanged or blank content was yielded"
+    finally:
+        watcher.stop()
+    print("✓ Notified changes are read at once; an idle clipboard is not read")
+
+
+def test_poll_backoff():
+    """Polling backs off while nothing changes and speeds up after a change"""
+    clipboard = Clipboard()
+    watcher, changes = watch('poll', clipboard, min_interval=0.02, max_interval=0.2)
+    try:
+        time.sleep(1.0)
+        idle_reads = clipboard.reads
+        assert idle_reads < 20, f"{idle_reads} reads in a second at a 0.02s minimum interval"
+
+        clipboard.copy("Polled text.")
+        _, content = changes.get(timeout=1)
+        assert content == "Polled text."
+    finally:
+        watcher.stop()
+    print(f"✓ Idle polling backs off ({idle_reads} reads in a second) and still sees changes")
+
+
+def test_fall_back():
+    """A backend that cannot start falls back to polling"""
+    from readaloud.triggers.clipboard_watch import ClipboardWatcher
+
+    def unavailable(self):
+        raise OSError("wl-paste not found")
+
+    clipboard = Clipboard()
+    original = ClipboardWatcher._start_wayland
+    ClipboardWatcher._start_wayland = unavailable
+    try:
+        watcher, changes = watch('wayland', clipboard, min_interval=0.02, max_interval=0.05)
+    finally:
+        ClipboardWatcher._start_wayland = original
+
+    try:
+        assert watcher.backend == 'poll' and not watcher.event_driven
+        clipboard.copy("Still heard.")
+        _, content = changes.get(timeout=1)
+        assert content == "Still heard."
+    finally:
+        watcher.stop()
+    print("✓ Without notifications the watcher polls instead")
+
+
+def main():
+    install_stubs()
+    tests = [test_notification, test_poll_backoff, test_fall_back]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except (AssertionError, queue.Empty) as e:
+            print(f"✗ {test.__doc__}: {e!r}")
+            failed += 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
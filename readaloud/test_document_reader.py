@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Check lazy document reading and bookmark resume
+
+Reading from a saved bookmark must continue with exactly the segments that
+were not heard yet, including in the middle of a paragraph.
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from readaloud.document_reader import MAX_PARAGRAPH_BYTES, BookmarkStore, DocumentReader
+from readaloud.text_processing import TextProcessor
+
+
+def write_document(path):
+    paragraphs = []
+    for number in range(1, 41):
+        paragraphs.append(f"Chapter {number} begins here. Señor Müller reads the café menu aloud. "
+                          f"The third sentence of chapter {number} closes it.")
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        f.write("\n\n".join(paragraphs) + "\n")
+
+
+def reader_for(path):
+    return DocumentReader(path, TextProcessor(max_chars=60, min_chars=0))
+
+
+def test_resume_mid_paragraph():
+    """Resuming from a bookmark continues with the segment that was playing"""
+    with tempfile.TemporaryDirectory() as work_dir:
+        document = os.path.join(work_dir, 'book.txt')
+        write_document(document)
+        everything = [segment for segment, _, _ in reader_for(document).iter_segments()]
+
+        # Stop partway through a paragraph and bookmark the segment that was playing
+        store = BookmarkStore(os.path.join(work_dir, 'bookmarks.json'))
+        reader = reader_for(document)
+        for heard, (segment, offset, index) in enumerate(reader.iter_segments()):
+            if heard == 20:
+                store.set(document, offset, index)
+                break
+        assert index > 0, "the bookmark should fall inside a paragraph"
+        assert not reader.exhausted
+
+        bookmark = BookmarkStore(store.path).get(document)
+        resumed = reader_for(document)
+        rest = [segment for segment, _, _ in resumed.iter_segments(bookmark['offset'], bookmark['segment'])]
+        assert rest == everything[20:], "resume skipped or repeated segments"
+        assert resumed.exhausted and resumed.segments_read == len(rest)
+
+        store.clear(document)
+        assert BookmarkStore(store.path).get(document) is None
+    print("✓ Resume continues from the bookmarked segment and clears at the end")
+
+
+def test_changed_file():
+    """A bookmark past the end of a truncated file is ignored"""
+    with tempfile.TemporaryDirectory() as work_dir:
+        document = os.path.join(work_dir, 'book.txt')
+        write_document(document)
+        store = BookmarkStore(os.path.join(work_dir, 'bookmarks.json'))
+        store.set(document, os.path.getsize(document) - 10, 1)
+
+        with open(document, 'w', encoding='utf-8') as f:
+            f.write("A much shorter file.\n")
+        assert store.get(document) is None
+    print("✓ A bookmark beyond the end of the file is discarded")
+
+
+def test_long_line():
+    """A line longer than the paragraph limit is cut without breaking characters"""
+    with tempfile.TemporaryDirectory() as work_dir:
+        document = os.path.join(work_dir, 'line.txt')
+        text = "ü" * (MAX_PARAGRAPH_BYTES + 1001)
+        with open(document, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+        paragraphs = list(reader_for(document).iter_paragraphs())
+        assert len(paragraphs) > 1
+        assert ''.join(paragraph for _, paragraph in paragraphs) == text, "a character was split"
+        offsets = [offset for offset, _ in paragraphs]
+        assert offsets[0] == 0 and all(offset % 2 == 0 for offset in offsets)
+    print("✓ Over-long lines are cut at character boundaries")
+
+
+def main():
+    tests = [test_resume_mid_paragraph, test_changed_file, test_long_line]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"✗ {test.__doc__}: {e}")
+            failed += 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Check what the file monitor reads when a watched file changes
+
+Calls the change handler directly, so no file system observer runs;
+watchdog, pyperclip and keyboard are stubbed when they are not installed.
+"""
+import os
+import sys
+import time
+import types
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _module(name, **attributes):
+    module = types.ModuleType(name)
+    module.__dict__.update(attributes)
+    sys.modules[name] = module
+    return module
+
+
+def install_stubs():
+    """Stand-ins for the optional trigger dependencies"""
+    try:
+        import watchdog.observers
+        import watchdog.events
+    except ImportError:
+        class FileSystemEventHandler:
+            pass
+
+        class Observer:
+            def schedule(self, handler, path, recursive=False):
+                return (path, recursive)
+
+            def unschedule(self, watch):
+                pass
+
+        _module('watchdog')
+        _module('watchdog.observers', Observer=Observer)
+        _module('watchdog.events', FileSystemEventHandler=FileSystemEventHandler)
+
+    try:
+        import pyperclip
+    except ImportError:
+        _module('pyperclip', paste=lambda: '', copy=lambda text: None)
+
+    try:
+        import keyboard
+    except ImportError:
+        _module('keyboard')
+
+
+def append(path, data):
+    with open(path, 'ab') as f:
+        f.write(data)
+
+
+def handler_for(path, mode):
+    from readaloud.triggers.file_monitor_trigger import FileChangeHandler
+
+    handler = FileChangeHandler(lambda file_path, content: None, mode=mode)
+    handler.track(path)
+    return handler
+
+
+def test_tail_split_character():
+    """Tail mode reads appended text; a character split across writes is read whole"""
+    with tempfile.TemporaryDirectory() as work_dir:
+        path = os.path.join(work_dir, 'log.txt')
+        with open(path, 'wb') as f:
+            f.write("Already heard.\n".encode('utf-8'))
+        handler = handler_for(path, 'tail')
+
+        accented = "Café crème.\n".encode('utf-8')
+        split = accented.index("é".encode('utf-8')) + 1
+        append(path, accented[:split])
+        start, end, text = handler.read_changes(path)
+        assert text == "Caf" and start == len("Already heard.\n"), repr(text)
+
+        append(path, accented[split:])
+        _, _, text = handler.read_changes(path)
+        assert text == "é crème.\n", repr(text)
+
+        _, _, text = handler.read_changes(path)
+        assert text == "", "text was read twice"
+    print("✓ Tail mode reads appended text and never splits a character")
+
+
+def test_tail_rewrite():
+    """Tail mode reads a rewritten file from the start"""
+    with tempfile.TemporaryDirectory() as work_dir:
+        path = os.path.join(work_dir, 'notes.txt')
+        with open(path, 'wb') as f:
+            f.write(b"First version of the notes.\n")
+        handler = handler_for(path, 'tail')
+
+        with open(path, 'wb') as f:
+            f.write(b"Second version of the notes, longer.\n")
+        start, _, text = handler.read_changes(path)
+        assert start == 0 and text == "Second version of the notes, longer.\n", repr(text)
+    print("✓ A rewritten file is read again from the top")
+
+
+def test_diff():
+    """Diff mode reads only the changed or added lines"""
+    with tempfile.TemporaryDirectory() as work_dir:
+        path = os.path.join(work_dir, 'draft.md')
+        lines = [f"Line {number} of the draft.\n" for number in range(1, 6)]
+        with open(path, 'w', encoding='utf-8', newline='\n') as f:
+            f.writelines(lines)
+        handler = handler_for(path, 'diff')
+
+        lines[2] = "Line three, now résumé.\n"
+        with open(path, 'w', encoding='utf-8', newline='\n') as f:
+            f.writelines(lines)
+        _, _, text = handler.read_changes(path)
+        assert text == "Line three, now résumé.\n", repr(text)
+
+        append(path, "A closing line.\n".encode('utf-8'))
+        _, _, text = handler.read_changes(path)
+        assert text == "A closing line.\n", repr(text)
+
+        _, _, text = handler.read_changes(path)
+        assert text == "", "unchanged file produced text"
+    print("✓ Diff mode reads edited and appended lines only")
+
+
+def event(path, dest_path=None):
+    return types.SimpleNamespace(is_directory=False, src_path=path, dest_path=dest_path)
+
+
+def test_debounce():
+    """A burst of events for a file leads to one read of its final content"""
+    from readaloud.triggers.file_monitor_trigger import FileChangeHandler
+
+    reads = []
+    handler = FileChangeHandler(lambda file_path, content: reads.append((file_path, content)),
+                                mode='full', debounce=0.2)
+    with tempfile.TemporaryDirectory() as work_dir:
+        path = os.path.join(work_dir, 'note.txt')
+        other = os.path.join(work_dir, 'other.txt')
+        handler.add_file(path)
+        handler.add_file(other)
+        try:
+            for number in range(5):
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(f"Draft {number}.")
+                handler.on_modified(event(path))
+                time.sleep(0.02)
+            with open(other, 'w', encoding='utf-8') as f:
+                f.write("Other file.")
+            handler.on_created(event(other))
+            handler.on_modified(event(other))
+
+            time.sleep(0.6)
+            assert sorted(reads) == [(path, "Draft 4."), (other, "Other file.")], reads
+
+            # Editors that save by renaming a temporary file over the target
+            temp = os.path.join(work_dir, '.note.txt.swp')
+            with open(temp, 'w', encoding='utf-8') as f:
+                f.write("Saved by rename.")
+            os.replace(temp, path)
+            handler.on_moved(event(temp, path))
+            handler.on_modified(event(path))
+            time.sleep(0.6)
+            assert reads[2:] == [(path, "Saved by rename.")], reads[2:]
+
+            # An event without a change does not read the file again
+            handler.on_modified(event(path))
+            time.sleep(0.4)
+            assert len(reads) == 3, reads
+        finally:
+            handler.stop()
+    print("✓ Bursts and rename-over-write saves are read once, after the file settles")
+
+
+def test_filters():
+    """Globs, extensions, excludes and sizes decide which files in watched directories are read"""
+    from readaloud.triggers.file_monitor_trigger import FileChangeHandler, FileFilter
+
+    file_filter = FileFilter.from_config({'include': ['notes/*.rst'], 'extensions': ['md', '.txt'],
+                                          'exclude': ['*/build/*', '*.tmp.txt'], 'max_size_kb': 1})
+    root = os.path.abspath('watched')
+    handler = FileChangeHandler(lambda file_path, content: None, file_filter=file_filter)
+    handler.add_directory(root, recursive=True)
+    handler.add_directory(os.path.abspath('flat'), recursive=False)
+    handler.add_file(os.path.abspath('elsewhere/script.py'))
+
+    def path(*parts):
+        return os.path.join(*parts)
+
+    expected = {
+        path(root, 'a.md'): True,
+        path(root, 'deep', 'er', 'b.txt'): True,
+        path(root, 'notes', 'c.rst'): True,
+        path(root, 'c.rst'): False,
+        path(root, 'build', 'd.md'): False,
+        path(root, 'e.tmp.txt'): False,
+        path(root, 'f.py'): False,
+        path(os.path.abspath('flat'), 'g.md'): True,
+        path(os.path.abspath('flat'), 'sub', 'h.md'): False,
+        path(os.path.abspath('elsewhere'), 'script.py'): True,
+        path(os.path.abspath('elsewhere'), 'i.md'): False,
+    }
+    for file_path, wanted in expected.items():
+        assert handler.matches(file_path) == wanted, f"{file_path} should {'' if wanted else 'not '}match"
+
+    assert file_filter.size_ok(1024) and not file_filter.size_ok(1025)
+    print("✓ Include globs, extensions, excludes and size limits are applied")
+
+
+def test_watches():
+    """Files in one directory share a watch; a recursive watch replaces those below it"""
+    from readaloud.triggers.file_monitor_trigger import FileMonitorTrigger
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        sub = os.path.join(work_dir, 'sub')
+        os.makedirs(sub)
+        paths = [os.path.join(directory, f"{name}.txt") for directory in (work_dir, sub) for name in "abc"]
+        for file_path in paths:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write("Text.")
+
+        trigger = FileMonitorTrigger(lambda file_path, content: None, max_tracked_files=4)
+        for file_path in paths:
+            trigger.add_file(file_path)
+        assert len(trigger.watches) == 2, trigger.watches
+        assert len(trigger.handler.file_states) <= 4, "per-file state grew past its bound"
+
+        trigger.add_directory(work_dir, recursive=True)
+        assert list(trigger.watches) == [os.path.normcase(os.path.abspath(work_dir))], trigger.watches
+        trigger.add_directory(sub, recursive=True)
+        assert len(trigger.watches) == 1, "a covered directory got its own watch"
+        trigger.handler.stop()
+    print("✓ Watches are deduplicated and tracked state stays bounded")
+
+
+def main():
+    install_stubs()
+    tests = [test_tail_split_character, test_tail_rewrite, test_diff, test_debounce, test_filters, test_watches]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"✗ {test.__doc__}: {e}")
+            failed += 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Check that playback handles stop their own playback only
+
+The system player is replaced by a Python process that sleeps, so the test
+needs no audio device; the file argument is ignored.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from readaloud.tts_engine import AudioPlayer
+
+SLEEPING_PLAYER = [sys.executable, '-c', 'import time; time.sleep(30)']
+
+
+def make_player():
+    player = AudioPlayer()
+    player.player_cmd = list(SLEEPING_PLAYER)
+    return player
+
+
+def test_stop_one():
+    """Stopping a handle ends that playback promptly and leaves the others running"""
+    player = make_player()
+    first = player.play('first.wav', block=False)
+    second = player.play('second.wav', block=False)
+    assert not first.done and not second.done and player.is_playing
+
+    start = time.time()
+    first.stop()
+    assert first.wait(2) and time.time() - start < 1.0, "stop did not end playback promptly"
+    assert first.stopped and not second.done and player.is_playing
+
+    player.stop()
+    assert second.wait(2) and second.stopped and not player.is_playing
+    print("✓ A handle stops its own playback; stop() ends the rest")
+
+
+def test_barge_in():
+    """preempt=True stops what is playing before the new audio starts"""
+    player = make_player()
+    earlier = player.play('earlier.wav', block=False)
+    later = player.play('later.wav', block=False, preempt=True)
+    assert earlier.done and earlier.stopped, "barge-in left the earlier playback running"
+    assert not later.done
+    player.stop()
+    print("✓ Barge-in interrupts the current playback")
+
+
+def test_finished():
+    """A playback that ends by itself is finished but not stopped"""
+    player = make_player()
+    player.player_cmd = [sys.executable, '-c', 'pass']
+    handle = player.play('short.wav')
+    assert handle.done and not handle.stopped and not player.is_playing
+    handle.stop()
+    assert not handle.stopped, "stopping a finished playback marked it stopped"
+    print("✓ Blocking play returns once playback has finished")
+
+
+def main():
+    tests = [test_stop_one, test_barge_in, test_finished]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"✗ {test.__doc__}: {e}")
+            failed += 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
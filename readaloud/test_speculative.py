@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Check speculative pre-synthesis of clipboard text
+
+Uses a fake synthesizer that records what it was asked for, so no engine
+is needed.
+"""
+import os
+import sys
+import time
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from readaloud.speculative import SpeculativeSynthesizer
+
+
+class Recorder:
+    """Synthesize by sleeping and remembering the item"""
+
+    def __init__(self, seconds=0.0):
+        self.seconds = seconds
+        self.started = []
+        self.finished = []
+        self.first_started = threading.Event()
+
+    def plan(self, text):
+        return iter(text.split('|')), 'engine'
+
+    def synthesize(self, item, engine):
+        assert engine == 'engine'
+        self.started.append(item)
+        self.first_started.set()
+        time.sleep(self.seconds)
+        self.finished.append(item)
+        return item
+
+
+def make(recorder, **kwargs):
+    kwargs.setdefault('delay', 0.05)
+    return SpeculativeSynthesizer(recorder.plan, recorder.synthesize, **kwargs)
+
+
+def test_burst():
+    """Only the last of a burst of submissions is synthesized"""
+    recorder = Recorder()
+    speculator = make(recorder)
+    try:
+        for text in ("first", "second", "third"):
+            speculator.submit(text)
+        time.sleep(0.3)
+        assert recorder.started == ["third"], recorder.started
+    finally:
+        speculator.stop()
+    print("✓ A burst of clipboard changes starts one speculation")
+
+
+def test_cancel_between_segments():
+    """Cancelling lets the segment in flight finish and drops the rest"""
+    recorder = Recorder(seconds=0.2)
+    speculator = make(recorder)
+    try:
+        speculator.submit("one|two|three")
+        assert recorder.first_started.wait(1)
+        assert speculator.wait_for("two") is False, "an item that is not in flight was waited for"
+        speculator.cancel()
+        # A read of the segment in flight waits for it instead of synthesizing it again
+        assert speculator.wait_for("one", timeout=1), "the segment in flight was not waited for"
+        time.sleep(0.4)
+        assert recorder.started == ["one"] and recorder.finished == ["one"], recorder.started
+    finally:
+        speculator.stop()
+    print("✓ Cancel stops the speculation after the current segment")
+
+
+def test_superseded():
+    """A new submission replaces the one being synthesized"""
+    recorder = Recorder(seconds=0.1)
+    speculator = make(recorder)
+    try:
+        speculator.submit("old one|old two|old three")
+        assert recorder.first_started.wait(1)
+        speculator.submit("new one|new two")
+        time.sleep(0.6)
+        assert recorder.started == ["old one", "new one", "new two"], recorder.started
+    finally:
+        speculator.stop()
+    print("✓ New clipboard content supersedes the previous speculation")
+
+
+def test_limits_and_idle():
+    """Only max_segments items of short texts are synthesized, and only while idle"""
+    recorder = Recorder()
+    idle = threading.Event()
+    speculator = make(recorder, max_segments=2, max_chars=40, is_idle=idle.is_set)
+    try:
+        speculator.submit("x" * 41)
+        time.sleep(0.2)
+        assert recorder.started == [], "a text over max_chars was synthesized"
+
+        speculator.submit("a|b|c|d")
+        time.sleep(0.3)
+        assert recorder.started == [], "synthesis started during foreground work"
+        idle.set()
+        time.sleep(0.3)
+        assert recorder.started == ["a", "b"], recorder.started
+    finally:
+        speculator.stop()
+    print("✓ Long texts are skipped, segments are capped and foreground work goes first")
+
+
+def main():
+    tests = [test_burst, test_cancel_between_segments, test_superseded, test_limits_and_idle]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"✗ {test.__doc__}: {e}")
+            failed += 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
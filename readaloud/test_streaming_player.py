@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Check that the streaming audio player plays queued audio back to back
+
+Drives the stream callback directly, so no output device is needed;
+sounddevice is stubbed when it is not installed.
+"""
+import os
+import sys
+import types
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BLOCK = 512
+
+
+def install_stubs():
+    """Stand-in for sounddevice"""
+    try:
+        import sounddevice
+    except ImportError:
+        sys.modules['sounddevice'] = types.ModuleType('sounddevice')
+
+
+def make_player():
+    from readaloud.tts_engine import StreamingAudioPlayer
+
+    player = StreamingAudioPlayer(sample_rate=24000, blocksize=BLOCK)
+    # Keep the player from opening a real output stream
+    player._stream = types.SimpleNamespace(close=lambda: None)
+    return player
+
+
+def pull(player, blocks):
+    """Run the stream callback and return what it wrote"""
+    output = []
+    for _ in range(blocks):
+        outdata = np.full((BLOCK, player.channels), np.nan, dtype=np.float32)
+        player._callback(outdata, BLOCK, None, None)
+        output.append(outdata[:, 0])
+    return np.concatenate(output)
+
+
+def tone(value, length, sample_rate=24000):
+    return np.full(length, value, dtype=np.float32), sample_rate
+
+
+def test_back_to_back():
+    """Consecutive items follow each other without silence in between"""
+    player = make_player()
+    first = player.enqueue(tone(0.5, 1000))
+    second = player.enqueue(tone(0.25, 700))
+
+    output = pull(player, 4)
+    expected = np.concatenate([np.full(1000, 0.5), np.full(700, 0.25)])
+    assert np.allclose(output[:1700], expected), "gap or overlap between items"
+    assert np.all(output[1700:] == 0), "the stream is not silent once the queue is empty"
+    assert first.done and second.done
+    print("✓ Queued items play back to back, then the stream falls silent")
+
+
+def test_resampled():
+    """Audio at another rate is converted to the stream rate"""
+    player = make_player()
+    player.enqueue(tone(0.5, 2205, sample_rate=22050))
+    output = pull(player, 6)
+    played = int(np.count_nonzero(output))
+    assert abs(played - 2400) <= 2, f"expected about 2400 samples, got {played}"
+    print("✓ 22.05 kHz audio plays for the same duration on a 24 kHz stream")
+
+
+def test_stop_one_item():
+    """Stopping a queued item drops it alone"""
+    player = make_player()
+    player.enqueue(tone(0.5, 600))
+    dropped = player.enqueue(tone(0.9, 600))
+    player.enqueue(tone(0.25, 600))
+    dropped.stop()
+
+    output = pull(player, 3)
+    assert dropped.done and dropped.stopped
+    assert not np.any(np.isclose(output, 0.9)), "a stopped item was played"
+    assert np.allclose(output[:1200], np.concatenate([np.full(600, 0.5), np.full(600, 0.25)]))
+    print("✓ A stopped item is skipped; the items around it still play")
+
+
+def test_pause_and_stop():
+    """Pause keeps the position; stop drops everything"""
+    player = make_player()
+    handle = player.enqueue(tone(0.5, 2000))
+    pull(player, 1)
+    player.pause()
+    assert np.all(pull(player, 2) == 0) and not player.is_playing
+    player.resume()
+    assert np.count_nonzero(pull(player, 4)) == 2000 - BLOCK, "paused audio lost or repeated samples"
+
+    queued = [player.enqueue(tone(0.5, 2000)) for _ in range(3)]
+    player.stop()
+    assert all(item.stopped for item in queued) and not player.is_playing
+    assert np.all(pull(player, 1) == 0)
+    assert handle.done
+    print("✓ Pause resumes where it left off; stop clears the queue")
+
+
+def main():
+    install_stubs()
+    tests = [test_back_to_back, test_resampled, test_stop_one_item, test_pause_and_stop]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"✗ {test.__doc__}: {e}")
+            failed += 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
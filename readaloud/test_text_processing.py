@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Check text normalization and segmentation
+
+Pins what the engines are given for numbers, abbreviations, phone numbers,
+URLs and markup, and that long texts segment the same block by block.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from readaloud.text_processing import TextProcessor, iter_blocks, segment_text
+
+
+def process(text):
+    return TextProcessor(min_chars=0).process(text)
+
+
+def test_numbers():
+    """Currency, ordinals, percentages, years, codes and signs are spelled out"""
+    assert process("It costs $12.50 today.") == ["It costs twelve dollars and fifty cents today."]
+    assert process("The 3rd of 1,234 items, 45% done.") == [
+        "The third of one thousand two hundred thirty-four items, forty-five percent done."]
+    assert process("In 1984 and 2007.") == ["In nineteen eighty-four and two thousand seven."]
+    assert process("Code 007 and -5 degrees.") == ["Code zero zero seven and minus five degrees."]
+    assert process("Pages 5-10 and v3.10.2 and 3.14.") == ["Pages five-ten and v3.10.2 and three point one four."]
+    print("✓ Numbers are expanded; versions are left alone")
+
+
+def test_abbreviations():
+    """Titles, Latin abbreviations and months are expanded without ending the sentence"""
+    assert process("Dr. Smith met Mr. Jones, e.g. at noon etc. Then left.") == [
+        "Doctor Smith met Mister Jones, for example at noon et cetera.", "Then left."]
+    assert process("On Jan. 5th we met. Sept. 3 too.") == ["On January fifth we met.", "September three too."]
+    unexpanded = TextProcessor(expand_abbreviations=False, min_chars=0).process("We met on Jan. 5th at noon. It rained.")
+    assert unexpanded == ["We met on Jan. fifth at noon.", "It rained."], unexpanded
+    print("✓ Abbreviations and months are expanded; 'Jan.' does not end a sentence")
+
+
+def test_digit_groups():
+    """Phone-style digit groups are read digit by digit"""
+    assert process("Call 555-1234 or 1-800-555-1234.") == [
+        "Call five five five, one two three four or one, eight zero zero, five five five, one two three four."]
+    print("✓ Phone numbers are read digit by digit")
+
+
+def test_urls_and_markup():
+    """URLs, Markdown and HTML markup are removed, keeping the readable text"""
+    assert process("See https://example.com/a?b=1. Or www.test.org!") == ["See.", "Or!"]
+    text = ("# Title\n\nSome **bold** and [a link](http://x.y) with `code`.\n\n"
+            "```\nskip me\n```\n\n<p>Para <b>two</b></p><script>bad()</script>")
+    assert process(text) == ["Title", "Some bold and a link with code.", "Para two"]
+    print("✓ URLs, code blocks, scripts and markup are stripped")
+
+
+def test_segmentation():
+    """The first segment is one sentence; later short sentences are merged"""
+    segments = segment_text("One. Two is here. Three is a longer sentence here. Four.", max_chars=40, min_chars=20)
+    assert segments == ["One.", "Two is here.", "Three is a longer sentence here. Four."], segments
+    long_sentence = "word " * 200
+    assert all(len(segment) <= 40 for segment in segment_text(long_sentence, max_chars=40))
+    print("✓ Segments respect max_chars and merge short sentences")
+
+
+def test_blocks():
+    """Block-by-block processing reads the same text and never cuts through a code block"""
+    paragraph = "Intro with Dr. Who on Jan. 5th.\n\n```\nfenced\n\nstill fenced\n```\n\nTail paragraph.\n\n"
+    text = paragraph * 500
+    blocks = list(iter_blocks(text, block_chars=1024))
+    assert len(blocks) > 1 and all(block.count('```') % 2 == 0 for block in blocks)
+
+    processor = TextProcessor()
+    assert ' '.join(processor.iter_process(text)) == ' '.join(processor.process(text))
+    print("✓ Long texts are processed block by block with the same result")
+
+
+def main():
+    tests = [test_numbers, test_abbreviations, test_digit_groups, test_urls_and_markup,
+             test_segmentation, test_blocks]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"✗ {test.__doc__}: {e}")
+            failed += 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
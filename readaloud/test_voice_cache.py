@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Check that the Higgs worker encodes a reference voice only once
+
+Runs without the Higgs Audio environment: boson_multimodal is replaced by a
+stand-in that prepares prompts the way HiggsAudioServeEngine does (it loads
+the reference clip itself and calls audio_tokenizer.encode(raw_audio, sr)).
+torch, torchaudio and librosa are stubbed as well when they are not installed.
+"""
+import os
+import sys
+import types
+import pickle
+import shutil
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+SAMPLING_RATE = 24000
+encode_calls = []
+
+
+def _module(name, **attributes):
+    module = types.ModuleType(name)
+    module.__dict__.update(attributes)
+    sys.modules[name] = module
+    return module
+
+
+def install_stubs():
+    """Stand-ins for the Higgs Audio environment"""
+    def load_audio(path, sr=None, **kwargs):
+        with open(path, 'rb') as f:
+            return list(f.read()), sr
+
+    try:
+        import librosa
+    except ImportError:
+        _module('librosa', load=load_audio)
+
+    try:
+        import torch
+    except ImportError:
+        def save(obj, path):
+            with open(path, 'wb') as f:
+                pickle.dump(obj, f)
+
+        def load(path, map_location=None):
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+
+        _module('torch', save=save, load=load, manual_seed=lambda seed: None,
+                from_numpy=lambda array: array,
+                set_num_threads=lambda threads: None,
+                cuda=types.SimpleNamespace(is_available=lambda: False))
+
+    try:
+        import torchaudio
+    except ImportError:
+        _module('torchaudio', save=lambda path, audio, sampling_rate: None)
+
+    class Tokenizer:
+        sampling_rate = SAMPLING_RATE
+
+        def encode(self, audio, sr=None):
+            encode_calls.append(sr)
+            return [len(audio), sr]
+
+    class Output:
+        audio = np.zeros(10, dtype=np.float32)
+        sampling_rate = SAMPLING_RATE
+
+    class ServeEngine:
+        def __init__(self, model, audio_tokenizer, device=None):
+            self.audio_tokenizer = Tokenizer()
+
+        def generate(self, chat_ml_sample, **kwargs):
+            # Prompt preparation as in HiggsAudioServeEngine: load, then encode raw audio
+            import librosa
+            for message in chat_ml_sample.messages:
+                audio_url = getattr(message.content, 'audio_url', None)
+                if audio_url:
+                    raw_audio, _ = librosa.load(audio_url, sr=self.audio_tokenizer.sampling_rate)
+                    self.audio_tokenizer.encode(raw_audio, self.audio_tokenizer.sampling_rate)
+            return Output()
+
+    class Message:
+        def __init__(self, role, content):
+            self.role = role
+            self.content = content
+
+    class AudioContent:
+        def __init__(self, audio_url=None, raw_audio=None):
+            self.audio_url = audio_url
+            self.raw_audio = raw_audio
+
+    class ChatMLSample:
+        def __init__(self, messages):
+            self.messages = messages
+
+    _module('boson_multimodal')
+    _module('boson_multimodal.serve')
+    _module('boson_multimodal.serve.serve_engine', HiggsAudioServeEngine=ServeEngine)
+    _module('boson_multimodal.data_types', Message=Message, AudioContent=AudioContent,
+            ChatMLSample=ChatMLSample)
+
+
+def test_reference_encoded_once(work_dir):
+    """Two syntheses with the same voice encode the clip once; a fresh worker reads it from disk"""
+    from higgs_worker import _ResidentModel
+
+    voice = os.path.join(work_dir, 'voice.wav')
+    with open(voice, 'wb') as f:
+        f.write(b'reference clip')
+    cache_dir = os.path.join(work_dir, 'voice_cache')
+    out_path = os.path.join(work_dir, 'out.wav')
+
+    worker = _ResidentModel('model', 'tokenizer', voice_cache_dir=cache_dir)
+    worker.synthesize("First sentence.", out_path, ref_audio=voice)
+    worker.synthesize("Second sentence.", out_path, ref_audio=voice)
+    assert len(encode_calls) == 1, f"expected 1 encode, got {len(encode_calls)}"
+    print("✓ Second synthesis with the same voice reused the cached encoding")
+
+    fresh = _ResidentModel('model', 'tokenizer', voice_cache_dir=cache_dir)
+    fresh.synthesize("Third sentence.", out_path, ref_audio=voice)
+    assert len(encode_calls) == 1, f"expected 1 encode, got {len(encode_calls)}"
+    print("✓ A new worker loaded the encoding from the voice cache")
+
+    fresh.prepare_voice(voice)
+    assert len(encode_calls) == 1, "prepare_voice re-encoded a cached voice"
+    print("✓ prepare_voice uses the same cache entry as generation")
+
+    other = os.path.join(work_dir, 'other.wav')
+    with open(other, 'wb') as f:
+        f.write(b'another clip')
+    fresh.prepare_voice(other)
+    fresh.synthesize("Fourth sentence.", out_path, ref_audio=other)
+    assert len(encode_calls) == 2, f"expected 2 encodes, got {len(encode_calls)}"
+    print("✓ A prepared voice is not encoded again by generation")
+
+
+def main():
+    install_stubs()
+    work_dir = tempfile.mkdtemp()
+    try:
+        test_reference_encoded_once(work_dir)
+    except AssertionError as e:
+        print(f"✗ {e}")
+        return 1
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,531 @@
+"""
+Text Normalization and Segmentation for ReadAloud.
+
+This module turns raw clipboard or file text into clean, engine-sized
+segments: markup and URLs are stripped, numbers and common abbreviations are
+spelled out, whitespace is normalized, and the result is split at sentence
+boundaries. Well-formed segments synthesize faster on every engine and repeat
+across documents, which makes the audio cache effective.
+
+Every pass is a single compiled regular expression (or str method) over the
+text. Long texts are processed block by block as segments are requested
+(TextProcessor.iter_process), so reading starts once the first block is
+ready instead of after the whole document.
+"""
+
+import re
+import html
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Iterator
+
+
+DEFAULT_MAX_CHARS = 300
+DEFAULT_MIN_CHARS = 40
+
+# Long texts are normalized in blocks of about this size, cut at paragraph breaks
+BLOCK_CHARS = 16 * 1024
+
+# Typographic characters mapped to what engines handle best
+_CHARACTERS = (
+    ('\r', ''),
+    ('\t', ' '),
+    ('\f', ' '),
+    ('\v', ' '),
+    ('\u00a0', ' '),
+    ('\u00ad', ''),
+    ('\u200b', ''),
+    ('\ufeff', ''),
+    ('\u2018', "'"),
+    ('\u2019', "'"),
+    ('\u201c', '"'),
+    ('\u201d', '"'),
+    ('\u2013', '-'),
+    ('\u2014', ' - '),
+    ('\u2026', '...')
+)
+
+# Markup
+_HTML_DROP = re.compile(r'<(script|style)\b.*?</\1\s*>', re.S | re.I)
+_HTML_BLOCK = re.compile(r'<(?:br|/?p|/?div|/?li|/?tr|/?h[1-6]|/?blockquote)\b[^>]*>', re.I)
+_HTML_TAG = re.compile(r'</?[a-zA-Z][^>]*>|<!--.*?-->', re.S)
+_CODE_FENCE = re.compile(r'^\s*(```|~~~).*?^\s*\1[^\n]*$', re.M | re.S)
+_MD_IMAGE = re.compile(r'!\[([^\]]*)\]\([^)]*\)')
+_MD_LINK = re.compile(r'\[([^\]]+)\]\([^)]*\)')
+_MD_BLOCK_START = re.compile(r'^[ ]*(?:#{1,6}|>+|[-*+]|\d{1,3}[.)])[ ]+', re.M)
+_MD_RULE = re.compile(r'^[ ]*([-*_])(?:[ ]*\1){2,}[ ]*$', re.M)
+_MD_EMPHASIS = re.compile(r'(\*{1,3}|_{2,3}|~~)(?=\S)(.+?)(?<=\S)\1')
+_MD_CODE = re.compile(r'`([^`\n]*)`')
+
+# URLs, without trailing sentence punctuation
+_URL = re.compile(r'(?=[hw])\b(?:https?://|www\.)[^\s<>"]*[^\s<>".,;:!?\')\]]')
+
+# Abbreviations; the ones in _SENTENCE_FINAL keep their period at the end of a sentence
+ABBREVIATIONS = {
+    'Mr.': 'Mister',
+    'Mrs.': 'Missus',
+    'Ms.': 'Miz',
+    'Dr.': 'Doctor',
+    'Prof.': 'Professor',
+    'St.': 'Saint',
+    'Jr.': 'Junior',
+    'Sr.': 'Senior',
+    'vs.': 'versus',
+    'etc.': 'et cetera',
+    'e.g.': 'for example',
+    'i.e.': 'that is',
+    'approx.': 'approximately',
+    'Fig.': 'Figure',
+    'No.': 'Number',
+    'Inc.': 'Incorporated',
+    'Ltd.': 'Limited',
+    'Corp.': 'Corporation',
+    'Jan.': 'January',
+    'Feb.': 'February',
+    'Mar.': 'March',
+    'Apr.': 'April',
+    'Jun.': 'June',
+    'Jul.': 'July',
+    'Aug.': 'August',
+    'Sep.': 'September',
+    'Sept.': 'September',
+    'Oct.': 'October',
+    'Nov.': 'November',
+    'Dec.': 'December'
+}
+_SENTENCE_FINAL = {'etc.', 'Jr.', 'Sr.', 'Inc.', 'Ltd.', 'Corp.'}
+_ABBREVIATION = re.compile(
+    '|'.join(re.escape(key) for key in sorted(ABBREVIATIONS, key=len, reverse=True))
+)
+
+# Numbers, skipping times and versions (digits inside words are skipped by _expand_number);
+# the leading lookahead lets the regex engine skip quickly to candidate characters
+_NUMBER = re.compile(
+    r'(?=[-$\u00a3\u20ac\d])(-?)([$\u00a3\u20ac]?)(\d{1,3}(?:,\d{3})+|\d+)(?:\.(\d+))?(st|nd|rd|th|%)?(?!\w|[.,:]\d)'
+)
+
+_NUMBER_GLUE = '_.:,-'
+
+# Phone numbers and similar codes: digit groups joined by hyphens or dots ("555-1234")
+_DIGIT_GROUPS = re.compile(r'(?=\d)(?<![\w.,-])\d+([-.])\d+(?:\1\d+)*(?![\w-]|[.,]\d)')
+_DIGIT_GROUPS_MIN_DIGITS = 7
+
+_CURRENCY = {'$': ('dollar', 'cent'), '\u00a3': ('pound', 'penny'), '\u20ac': ('euro', 'cent')}
+
+_ONES = ['zero', 'one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine',
+         'ten', 'eleven', 'twelve', 'thirteen', 'fourteen', 'fifteen', 'sixteen',
+         'seventeen', 'eighteen', 'nineteen']
+_TENS = ['', '', 'twenty', 'thirty', 'forty', 'fifty', 'sixty', 'seventy', 'eighty', 'ninety']
+_SCALES = [(10 ** 12, 'trillion'), (10 ** 9, 'billion'), (10 ** 6, 'million'), (1000, 'thousand')]
+_ORDINALS = {'one': 'first', 'two': 'second', 'three': 'third', 'five': 'fifth',
+             'eight': 'eighth', 'nine': 'ninth', 'twelve': 'twelfth'}
+
+# Whitespace
+_SPACES = re.compile(r' {2,}')
+_PARAGRAPH_BREAK = re.compile(r'\n[ ]*\n[\n ]*')
+_SPACE_BEFORE_PUNCTUATION = re.compile(r' +([,.;:!?])')
+_EMPTY_BRACKETS = re.compile(r' ?(?:\(\s*\)|\[\s*\])')
+
+# Sentence ends followed by whitespace (not after an initial or a title), or paragraph
+# breaks; the group keeps the closing punctuation, and is empty for paragraph breaks
+_NOT_AFTER = ''.join(rf'(?<!\b{re.escape(key)})' for key in ABBREVIATIONS
+                     if key not in _SENTENCE_FINAL and key != 'No.')
+_SENTENCE_BREAK = re.compile(
+    r'(?=[.!?\n])([.!?](?<!\b[A-Z]\.)' + _NOT_AFTER + r'["\')\]]*(?=\s)|(?=\n\s*\n))\s+'
+)
+_CLAUSE_BREAK = re.compile(r'(?<=[,;:])\s+')
+_BLOCK_BREAK = re.compile(r'\n[ \t\r]*\n')
+
+
+def replace_characters(text: str) -> str:
+    """Map typographic quotes, dashes and invisible characters to plain ones."""
+    # str.replace per present character is much faster than str.translate on large texts
+    for character, replacement in _CHARACTERS:
+        if character in text:
+            text = text.replace(character, replacement)
+    return text
+
+
+def _below_thousand(n: int) -> str:
+    words = []
+    if n >= 100:
+        words.append(f"{_ONES[n // 100]} hundred")
+        n %= 100
+    if n >= 20:
+        words.append(_TENS[n // 10] + (f"-{_ONES[n % 10]}" if n % 10 else ''))
+    elif n or not words:
+        words.append(_ONES[n])
+    return ' '.join(words)
+
+
+def number_to_words(n: int) -> str:
+    """Spell out a non-negative integer ("1234" -> "one thousand two hundred thirty-four")."""
+    if n < 1000:
+        return _below_thousand(n)
+    if n >= 10 ** 15:
+        return ' '.join(_ONES[int(digit)] for digit in str(n))
+
+    words = []
+    for scale, name in _SCALES:
+        if n >= scale:
+            words.append(f"{_below_thousand(n // scale)} {name}")
+            n %= scale
+    if n:
+        words.append(_below_thousand(n))
+    return ' '.join(words)
+
+
+def ordinal_words(n: int) -> str:
+    """Spell out an ordinal ("21" -> "twenty-first")."""
+    words = number_to_words(n)
+    head, separator, last = max(words.rpartition(' '), words.rpartition('-'), key=lambda part: len(part[0]))
+    if last in _ORDINALS:
+        last = _ORDINALS[last]
+    elif last.endswith('y'):
+        last = last[:-1] + 'ieth'
+    else:
+        last += 'th'
+    return f"{head}{separator}{last}"
+
+
+def year_words(n: int) -> str:
+    """Read a year the way it is spoken ("1984" -> "nineteen eighty-four")."""
+    if n % 1000 < 10 or not 1100 <= n <= 2099:
+        return number_to_words(n)
+    century, rest = divmod(n, 100)
+    if rest == 0:
+        return f"{number_to_words(century)} hundred"
+    if rest < 10:
+        return f"{number_to_words(century)} oh {_ONES[rest]}"
+    return f"{number_to_words(century)} {number_to_words(rest)}"
+
+
+@lru_cache(maxsize=4096)
+def _spell_number(prefix: str, currency: str, integer: str, fraction: Optional[str],
+                  suffix: Optional[str]) -> str:
+    digits = integer.replace(',', '')
+    if len(digits) > 1 and digits.startswith('0'):
+        # Codes and identifiers: read digit by digit
+        return prefix + ' '.join(_ONES[int(digit)] for digit in digits)
+    value = int(digits)
+
+    if currency:
+        unit, subunit = _CURRENCY[currency]
+        words = f"{number_to_words(value)} {unit}{'' if value == 1 else 's'}"
+        if fraction and len(fraction) == 2 and int(fraction):
+            cents = int(fraction)
+            subunits = 'pence' if subunit == 'penny' and cents != 1 else f"{subunit}{'' if cents == 1 else 's'}"
+            words += f" and {number_to_words(cents)} {subunits}"
+        return prefix + words
+
+    if fraction:
+        words = f"{number_to_words(value)} point {' '.join(_ONES[int(digit)] for digit in fraction)}"
+    elif suffix in ('st', 'nd', 'rd', 'th'):
+        return prefix + ordinal_words(value)
+    elif len(integer) == 4 and suffix is None and not prefix:
+        words = year_words(value)
+    else:
+        words = number_to_words(value)
+    words = prefix + words
+    return f"{words} percent" if suffix == '%' else words
+
+
+def _expand_number(match) -> str:
+    sign, currency, integer, fraction, suffix = match.groups()
+    previous = match.string[match.start() - 1] if match.start() else ' '
+    if previous.isalnum() and sign:
+        # A hyphen, not a sign ("5-10", "COVID-19")
+        prefix = '-'
+    elif previous.isalnum() or previous in _NUMBER_GLUE:
+        # Part of a word, version or time ("mp3", "3.10.2", "10:30")
+        return match.group(0)
+    else:
+        prefix = 'minus ' if sign else ''
+    return _spell_number(prefix, currency, integer, fraction, suffix)
+
+
+def _read_digit_groups(match) -> str:
+    text, separator = match.group(0), match.group(1)
+    groups = text.split(separator)
+    if (sum(len(group) for group in groups) < _DIGIT_GROUPS_MIN_DIGITS
+            or (separator == '.' and len(groups) < 3)
+            or (len(groups) == 2 and len(groups[0]) == len(groups[1]) == 4)):
+        # Ranges ("5-10", "1990-1995"), decimals and versions are handled as numbers
+        return text
+    return ', '.join(' '.join(_ONES[int(digit)] for digit in group) for group in groups)
+
+
+def expand_numbers(text: str) -> str:
+    """Spell out integers, decimals, ordinals, percentages, currency amounts and years."""
+    if '-' in text or '.' in text:
+        text = _DIGIT_GROUPS.sub(_read_digit_groups, text)
+    return _NUMBER.sub(_expand_number, text)
+
+
+def _expand_abbreviation(match) -> str:
+    abbreviation = match.group(0)
+    start = match.start()
+    if start and (match.string[start - 1].isalnum() or match.string[start - 1] in '._'):
+        return abbreviation
+    following = match.string[match.end():match.end() + 8].lstrip(' ')[:1]
+    if abbreviation == 'No.' and not following.isdigit():
+        # "No. 5" is a number; "No. I won't" is a sentence
+        return abbreviation
+    words = ABBREVIATIONS[abbreviation]
+    if abbreviation in _SENTENCE_FINAL and (not following or following == '\n' or following.isupper()):
+        return f"{words}."
+    return words
+
+
+def expand_abbreviations(text: str) -> str:
+    """Expand common abbreviations (titles, "e.g.", "etc.")."""
+    return _ABBREVIATION.sub(_expand_abbreviation, text)
+
+
+def strip_markup(text: str) -> str:
+    """
+    Remove HTML and Markdown markup, keeping the readable text.
+
+    Code blocks, scripts and styles are dropped; links and images are
+    replaced by their text; headings, list items and block elements become
+    separate paragraphs so they are read as separate sentences.
+    """
+    if '<' in text:
+        text = _HTML_DROP.sub('', text)
+        text = _HTML_BLOCK.sub('\n\n', text)
+        text = _HTML_TAG.sub('', text)
+    if '&' in text:
+        text = html.unescape(text)
+
+    # Each pass only runs when its marker characters are present
+    if '```' in text or '~~~' in text:
+        text = _CODE_FENCE.sub('\n\n', text)
+    if '](' in text:
+        text = _MD_IMAGE.sub(r'\1', text)
+        text = _MD_LINK.sub(r'\1', text)
+    text = _MD_RULE.sub('\n', text)
+    text = _MD_BLOCK_START.sub('\n\n', text)
+    if '*' in text or '__' in text or '~~' in text:
+        text = _MD_EMPHASIS.sub(r'\2', text)
+    if '`' in text:
+        text = _MD_CODE.sub(r'\1', text)
+    return text
+
+
+def strip_urls(text: str, replacement: str = '') -> str:
+    """Remove (or replace) web addresses."""
+    if '://' not in text and 'www.' not in text:
+        return text
+    text = _URL.sub(replacement, text)
+    return text if replacement else _EMPTY_BRACKETS.sub('', text)
+
+
+def normalize_whitespace(text: str) -> str:
+    """
+    Collapse whitespace, keeping paragraph breaks.
+
+    Single line breaks (hard-wrapped text) become spaces; blank lines become
+    a single paragraph break.
+    """
+    text = _PARAGRAPH_BREAK.sub('\0', text).replace('\n', ' ').replace('\0', '\n\n')
+    if '  ' in text:
+        text = _SPACES.sub(' ', text)
+    text = text.replace(' \n', '\n')
+    text = _SPACE_BEFORE_PUNCTUATION.sub(r'\1', text)
+    return text.strip()
+
+
+def normalize_text(text: str, strip_markup_: bool = True, strip_urls_: bool = True,
+                   expand_numbers_: bool = True, expand_abbreviations_: bool = True) -> str:
+    """
+    Normalize raw text for synthesis.
+
+    Args:
+        text: Raw clipboard or file text
+        strip_markup_: Remove HTML and Markdown markup
+        strip_urls_: Remove web addresses
+        expand_numbers_: Spell out numbers
+        expand_abbreviations_: Expand common abbreviations
+
+    Returns:
+        Clean text with paragraphs separated by blank lines
+    """
+    if strip_markup_:
+        text = strip_markup(text)
+    text = replace_characters(text)
+    if strip_urls_:
+        text = strip_urls(text)
+    if expand_abbreviations_:
+        text = expand_abbreviations(text)
+    if expand_numbers_:
+        text = expand_numbers(text)
+    return normalize_whitespace(text)
+
+
+def _split_long(sentence: str, max_chars: int) -> List[str]:
+    """Split a sentence that exceeds max_chars at clause breaks, then spaces."""
+    parts = []
+    current = ""
+    for piece in _CLAUSE_BREAK.split(sentence):
+        while len(piece) > max_chars:
+            cut = piece.rfind(' ', 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            parts.append(piece[:cut].strip())
+            piece = piece[cut:].strip()
+
+        if current and len(current) + len(piece) + 1 > max_chars:
+            parts.append(current)
+            current = piece
+        else:
+            current = f"{current} {piece}".strip()
+
+    if current:
+        parts.append(current)
+    return parts
+
+
+def split_sentences(text: str, max_chars: int = DEFAULT_MAX_CHARS) -> List[str]:
+    """
+    Split text into sentences no longer than max_chars.
+
+    Sentences over the limit are split at clause breaks, then at spaces.
+    """
+    # split() alternates sentence text and its closing punctuation
+    parts = _SENTENCE_BREAK.split(text)
+    parts.append('')
+    sentences = []
+    for sentence in map(str.__add__, parts[0::2], parts[1::2]):
+        if '\n' in sentence or '  ' in sentence:
+            sentence = ' '.join(sentence.split())
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        if len(sentence) > max_chars:
+            sentences.extend(_split_long(sentence, max_chars))
+        else:
+            sentences.append(sentence)
+    return sentences
+
+
+def segment_text(text: str, max_chars: int = DEFAULT_MAX_CHARS,
+                 min_chars: int = DEFAULT_MIN_CHARS) -> List[str]:
+    """
+    Split text into engine-sized segments at sentence boundaries.
+
+    The first segment is kept to a single sentence so playback can start as
+    early as possible; later sentences are merged up to min_chars to avoid
+    paying per-request overhead on very short fragments.
+
+    Args:
+        text: Text to split
+        max_chars: Upper bound for a segment
+        min_chars: Sentences shorter than this are merged with the next one
+
+    Returns:
+        List of non-empty segments in reading order
+    """
+    segments = []
+    current = ""
+    for sentence in split_sentences(text, max_chars):
+        if not segments and not current:
+            # First segment: one sentence only
+            segments.append(sentence)
+            continue
+
+        candidate = f"{current} {sentence}".strip()
+        if len(candidate) > max_chars:
+            segments.append(current)
+            current = sentence
+        elif len(candidate) >= min_chars:
+            segments.append(candidate)
+            current = ""
+        else:
+            current = candidate
+
+    if current:
+        segments.append(current)
+    return segments
+
+
+def iter_blocks(text: str, block_chars: int = BLOCK_CHARS) -> Iterator[str]:
+    """
+    Split raw text into blocks of at least block_chars at paragraph breaks.
+
+    A block never ends inside a code fence, an HTML comment or a script or
+    style element, so each block can be normalized on its own.
+    """
+    start = scanned = 0
+    fences = open_elements = 0
+    for match in _BLOCK_BREAK.finditer(text):
+        piece = text[scanned:match.start()]
+        scanned = match.start()
+        fences += piece.count('```') + piece.count('~~~')
+        if '<' in piece or '-->' in piece:
+            lower = piece.lower()
+            open_elements += (lower.count('<!--') + lower.count('<script') + lower.count('<style')
+                              - lower.count('-->') - lower.count('</script') - lower.count('</style'))
+        if match.start() - start >= block_chars and fences % 2 == 0 and open_elements <= 0:
+            yield text[start:match.start()]
+            start = match.end()
+    yield text[start:]
+
+
+class TextProcessor:
+    """Configured normalization and segmentation stage in front of the engines."""
+
+    def __init__(self, normalize: bool = True, strip_markup: bool = True, strip_urls: bool = True,
+                 expand_numbers: bool = True, expand_abbreviations: bool = True,
+                 max_chars: int = DEFAULT_MAX_CHARS, min_chars: int = DEFAULT_MIN_CHARS):
+        """
+        Initialize the text processor.
+
+        Args:
+            normalize: Apply any normalization (False only segments)
+            strip_markup: Remove HTML and Markdown markup
+            strip_urls: Remove web addresses
+            expand_numbers: Spell out numbers
+            expand_abbreviations: Expand common abbreviations
+            max_chars: Upper bound for a segment
+            min_chars: Sentences shorter than this are merged with the next one
+        """
+        self.normalize_enabled = normalize
+        self.options = {
+            'strip_markup_': strip_markup,
+            'strip_urls_': strip_urls,
+            'expand_numbers_': expand_numbers,
+            'expand_abbreviations_': expand_abbreviations
+        }
+        self.max_chars = max_chars
+        self.min_chars = min_chars
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> "TextProcessor":
+        """Create a processor from the 'text_processing' config section."""
+        config = config or {}
+        return cls(
+            normalize=config.get('normalize', True),
+            strip_markup=config.get('strip_markup', True),
+            strip_urls=config.get('strip_urls', True),
+            expand_numbers=config.get('expand_numbers', True),
+            expand_abbreviations=config.get('expand_abbreviations', True),
+            max_chars=config.get('max_chars', DEFAULT_MAX_CHARS),
+            min_chars=config.get('min_chars', DEFAULT_MIN_CHARS)
+        )
+
+    def normalize(self, text: str) -> str:
+        """Normalize text with the configured passes."""
+        if not self.normalize_enabled:
+            return normalize_whitespace(replace_characters(text))
+        return normalize_text(text, **self.options)
+
+    def segment(self, text: str) -> List[str]:
+        """Split already normalized text into segments."""
+        return segment_text(text, self.max_chars, self.min_chars)
+
+    def process(self, text: str) -> List[str]:
+        """Normalize and segment text, returning the segments to synthesize."""
+        return self.segment(self.normalize(text))
+
+    def iter_process(self, text: str) -> Iterator[str]:
+        """Like process(), but one block at a time as the segments are consumed."""
+        for block in iter_blocks(text):
+            yield from self.process(block)
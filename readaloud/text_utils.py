@@ -0,0 +1,23 @@
+"""
+Text Helpers for ReadAloud.
+
+Small byte-level text utilities shared by modules that read files
+incrementally (the document reader and the file monitor).
+"""
+
+
+def utf8_boundary(data: bytes) -> int:
+    """
+    Length of the longest prefix of data that does not end inside a UTF-8 character.
+
+    Text read in byte ranges can end halfway through a multibyte character;
+    cutting at this length keeps the character whole for the next read.
+    """
+    if not data:
+        return 0
+    start = len(data) - 1
+    while start > 0 and data[start] & 0xC0 == 0x80:
+        start -= 1
+    lead = data[start]
+    length = 1 if lead < 0xC0 else 2 if lead < 0xE0 else 3 if lead < 0xF0 else 4
+    return len(data) if len(data) - start >= length else start
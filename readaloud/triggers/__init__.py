@@ -5,13 +5,16 @@ This package contains various ways to trigger text-to-speech synthesis.
 """
 
 from .clipboard_trigger import ClipboardTrigger
-from .file_monitor_trigger import FileMonitorTrigger
+from .clipboard_watch import ClipboardWatcher
+from .file_monitor_trigger import FileMonitorTrigger, FileFilter
 from .hotkey_trigger import HotkeyTrigger
 from .text_input_trigger import TextInputTrigger
 
 __all__ = [
     'ClipboardTrigger',
+    'ClipboardWatcher',
     'FileMonitorTrigger', 
+    'FileFilter',
     'HotkeyTrigger',
     'TextInputTrigger'
 ]
@@ -6,23 +6,28 @@ This module provides functionality to read text from the clipboard.
 
 import pyperclip
 from typing import Callable, Optional
-import time
+
+from .clipboard_watch import ClipboardWatcher, MIN_POLL_INTERVAL
 
 
 class ClipboardTrigger:
     """Trigger TTS when clipboard content changes."""
     
     def __init__(self, callback: Callable[[str], None], 
-                 check_interval: float = 1.0):
+                 check_interval: float = 1.0, min_interval: float = MIN_POLL_INTERVAL,
+                 backend: str = 'auto'):
         """
         Initialize clipboard trigger.
         
         Args:
             callback: Function to call with clipboard text
-            check_interval: How often to check clipboard (seconds)
+            check_interval: Longest interval between clipboard checks when polling (seconds)
+            min_interval: Polling interval right after a change (seconds)
+            backend: Change notification backend ('auto', 'wayland', 'xfixes', 'sequence' or 'poll')
         """
         self.callback = callback
         self.check_interval = check_interval
+        self.watcher = ClipboardWatcher(backend, min_interval, check_interval)
         self.last_content = pyperclip.paste()
         self.running = False
     
@@ -32,23 +37,23 @@ class ClipboardTrigger:
         print("Clipboard monitoring started. Press Ctrl+C to stop.")
         
         try:
-            while self.running:
-                current_content = pyperclip.paste()
-                
-                if current_content != self.last_content and current_content.strip():
-                    print(f"Clipboard content changed: {current_content[:50]}...")
-                    self.callback(current_content)
-                    self.last_content = current_content
-                
-                time.sleep(self.check_interval)
+            # Blocks until the clipboard owner reports a change (or the next adaptive poll)
+            for current_content in self.watcher.changes(self.last_content):
+                print(f"Clipboard content changed: {current_content[:50]}...")
+                self.callback(current_content)
+                self.last_content = current_content
+                if not self.running:
+                    break
                 
         except KeyboardInterrupt:
             print("\nClipboard monitoring stopped.")
             self.running = False
+            self.watcher.stop()
     
     def stop_monitoring(self):
         """Stop monitoring clipboard."""
         self.running = False
+        self.watcher.stop()
     
     def read_current(self):
         """Read current clipboard content immediately."""
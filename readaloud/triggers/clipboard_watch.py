@@ -0,0 +1,240 @@
+"""
+Clipboard Change Notification for ReadAloud.
+
+This module waits for clipboard changes instead of polling the clipboard
+contents on a fixed interval. Depending on the platform it is told about
+changes by the selection owner:
+
+- Wayland: a ``wl-paste --watch`` child process prints a line per change
+- X11: XFixes selection-owner events (needs python-xlib)
+- Windows: the clipboard sequence number (a cheap counter, no content read)
+
+Where none of these is available the clipboard is polled with an adaptive
+interval: short right after a change, backing off while nothing happens.
+"""
+
+import os
+import sys
+import shutil
+import threading
+import subprocess
+from typing import Optional, Dict, Any, Iterator
+
+import pyperclip
+
+
+BACKENDS = ('auto', 'wayland', 'xfixes', 'sequence', 'poll')
+
+# Adaptive polling interval bounds (seconds)
+MIN_POLL_INTERVAL = 0.25
+MAX_POLL_INTERVAL = 1.0
+
+# Each unchanged poll lengthens the interval by this factor
+POLL_BACKOFF = 1.5
+
+# How often the Windows clipboard sequence number is read
+SEQUENCE_INTERVAL = 0.1
+
+# Event-driven waits time out this often so Ctrl+C and stop() stay responsive
+EVENT_WAIT_SECONDS = 1.0
+
+
+def _default_backend() -> str:
+    """Best change-notification mechanism on this system."""
+    if sys.platform == 'win32':
+        return 'sequence'
+    if os.environ.get('WAYLAND_DISPLAY') and shutil.which('wl-paste'):
+        return 'wayland'
+    if os.environ.get('DISPLAY'):
+        try:
+            import Xlib
+            return 'xfixes'
+        except ImportError:
+            pass
+    return 'poll'
+
+
+class ClipboardWatcher:
+    """Yield clipboard text each time it changes."""
+    
+    def __init__(self, backend: str = 'auto', min_interval: float = MIN_POLL_INTERVAL,
+                 max_interval: float = MAX_POLL_INTERVAL):
+        """
+        Initialize clipboard watcher.
+        
+        Args:
+            backend: 'auto', 'wayland', 'xfixes', 'sequence' (Windows) or 'poll'
+            min_interval: Polling interval right after a change (poll backend)
+            max_interval: Longest polling interval while the clipboard is unchanged
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown clipboard backend: {backend}")
+        self.backend = _default_backend() if backend == 'auto' else backend
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        
+        self._changed = threading.Event()
+        self._stopped = threading.Event()
+        self._started = False
+        self._process = None
+        self._display = None
+    
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> "ClipboardWatcher":
+        """Create a watcher from the 'monitoring' config section."""
+        config = config or {}
+        return cls(
+            backend=config.get('clipboard_backend', 'auto'),
+            min_interval=config.get('clipboard_min_interval', MIN_POLL_INTERVAL),
+            max_interval=config.get('clipboard_interval', MAX_POLL_INTERVAL)
+        )
+    
+    @property
+    def event_driven(self) -> bool:
+        return self.backend != 'poll'
+    
+    def _notify(self):
+        self._changed.set()
+    
+    def _fall_back(self, reason: str):
+        """Switch to polling when the notification backend is unavailable or exits."""
+        if self.backend != 'poll' and not self._stopped.is_set():
+            print(f"Clipboard {self.backend} notifications unavailable ({reason}); polling instead")
+            self.backend = 'poll'
+            self._notify()
+    
+    def start(self):
+        """Start the notification backend (falls back to polling if it cannot start)."""
+        if self._started:
+            return
+        self._started = True
+        self._stopped.clear()
+        
+        starters = {
+            'wayland': self._start_wayland,
+            'xfixes': self._start_xfixes,
+            'sequence': self._start_sequence
+        }
+        starter = starters.get(self.backend)
+        if starter is None:
+            return
+        try:
+            starter()
+        except Exception as e:
+            self._fall_back(str(e))
+    
+    def _run_thread(self, target):
+        thread = threading.Thread(target=target, name=f"ClipboardWatch-{self.backend}", daemon=True)
+        thread.start()
+    
+    def _start_wayland(self):
+        # 'echo' ignores the pasted content; each line printed is one change
+        self._process = subprocess.Popen(
+            ['wl-paste', '--watch', 'echo'],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, stdin=subprocess.DEVNULL
+        )
+        
+        def read_events():
+            for _ in self._process.stdout:
+                self._notify()
+            self._fall_back("wl-paste exited")
+        
+        self._run_thread(read_events)
+    
+    def _start_xfixes(self):
+        from Xlib import display as xdisplay
+        from Xlib.ext import xfixes
+        
+        display = xdisplay.Display()
+        if not display.has_extension('XFIXES'):
+            display.close()
+            raise OSError("X server has no XFIXES extension")
+        display.xfixes_query_version()
+        root = display.screen().root
+        display.xfixes_select_selection_input(root, display.get_atom('CLIPBOARD'),
+                                              xfixes.XFixesSetSelectionOwnerNotifyMask)
+        self._display = display
+        
+        def read_events():
+            try:
+                while not self._stopped.is_set():
+                    event = display.next_event()
+                    if (event.type, event.sub_code) == display.extension_event.SetSelectionOwnerNotify:
+                        self._notify()
+            except Exception as e:
+                self._fall_back(str(e))
+        
+        self._run_thread(read_events)
+    
+    def _start_sequence(self):
+        import ctypes
+        
+        sequence_number = ctypes.windll.user32.GetClipboardSequenceNumber
+        last = sequence_number()
+        
+        def read_events():
+            nonlocal last
+            while not self._stopped.wait(SEQUENCE_INTERVAL):
+                current = sequence_number()
+                if current != last:
+                    last = current
+                    self._notify()
+        
+        self._run_thread(read_events)
+    
+    def stop(self):
+        """Stop watching; a running changes() loop returns."""
+        self._stopped.set()
+        self._changed.set()
+        self._started = False
+        if self._process is not None:
+            self._process.terminate()
+            self._process = None
+        if self._display is not None:
+            try:
+                self._display.close()
+            except Exception:
+                pass
+            self._display = None
+    
+    @staticmethod
+    def paste() -> Optional[str]:
+        """Current clipboard text (None if the clipboard cannot be read)."""
+        try:
+            return pyperclip.paste()
+        except Exception as e:
+            print(f"Error reading clipboard: {e}")
+            return None
+    
+    def changes(self, last_content: Optional[str] = None) -> Iterator[str]:
+        """
+        Yield the clipboard text whenever it changes to something non-empty.
+        
+        Args:
+            last_content: Content already seen (defaults to the current clipboard)
+        
+        Yields:
+            New clipboard text
+        """
+        self.start()
+        if last_content is None:
+            last_content = self.paste()
+        interval = self.min_interval
+        
+        while not self._stopped.is_set():
+            if self.event_driven:
+                if not self._changed.wait(EVENT_WAIT_SECONDS):
+                    continue
+            else:
+                self._changed.wait(interval)
+            self._changed.clear()
+            if self._stopped.is_set():
+                break
+            
+            content = self.paste()
+            if content is not None and content != last_content and content.strip():
+                last_content = content
+                interval = self.min_interval
+                yield content
+            else:
+                interval = min(interval * POLL_BACKOFF, self.max_interval)
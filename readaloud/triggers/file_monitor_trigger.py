@@ -5,80 +5,499 @@ This module provides functionality to monitor files for changes and trigger TTS.
 """
 
 import os
+import re
+import mmap
 import time
+import zlib
+import fnmatch
+import threading
+import hashlib
+from array import array
+from collections import OrderedDict
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
-from typing import Callable, Optional, List
+from typing import Callable, Optional, List, Tuple, Dict, Any, Iterable
+
+from ..text_utils import utf8_boundary
+
+
+# Tail mode checks that the last block before the previous end of file is unchanged
+HASH_BLOCK_SIZE = 4096
+
+# Files at least this large are read through mmap
+MMAP_THRESHOLD = 1024 * 1024
+
+# Events for a path are coalesced until it has been quiet this long
+DEBOUNCE_SECONDS = 0.3
+
+# Files in watched directories are read if they match one of these (unless filtered otherwise)
+WATCHED_EXTENSIONS = ('.txt', '.md', '.py', '.js', '.html')
+
+# Per-file state (modification signature, line hashes) is kept for this many files at most
+MAX_TRACKED_FILES = 4096
+
+# 'full' reads the whole file, 'tail' only appended bytes, 'diff' the changed lines
+READ_MODES = ('full', 'tail', 'diff')
+
+
+def _block_hash(data) -> bytes:
+    return hashlib.blake2b(data, digest_size=8).digest()
+
+
+def _path_key(path: str) -> str:
+    """Normalized absolute path used to match files and directories."""
+    return os.path.normcase(os.path.abspath(path))
+
+
+def _scan_lines(data, size: int) -> Tuple[array, array]:
+    """CRC32 of every line and the byte offset where each line starts."""
+    hashes = array('I')
+    offsets = array('Q')
+    position = 0
+    while position < size:
+        end = data.find(b'\n', position)
+        end = size if end < 0 else end + 1
+        hashes.append(zlib.crc32(data[position:end]))
+        offsets.append(position)
+        position = end
+    return hashes, offsets
+
+
+class FileState:
+    """What is known about a monitored file's content since it was last read."""
+    
+    def __init__(self, size: int, tail_hash: bytes, line_hashes: Optional[array] = None):
+        """
+        Initialize file state.
+        
+        Args:
+            size: File size in bytes
+            tail_hash: Hash of the last block (detects rewrites in tail mode)
+            line_hashes: CRC32 of every line (diff mode), 4 bytes per line
+        """
+        self.size = size
+        self.tail_hash = tail_hash
+        self.line_hashes = line_hashes
+
+
+class BoundedDict(OrderedDict):
+    """Dict that drops its least recently used entries beyond a maximum size."""
+    
+    def __init__(self, max_size: int = MAX_TRACKED_FILES):
+        super().__init__()
+        self.max_size = max_size
+    
+    def get(self, key, default=None):
+        if key not in self:
+            return default
+        self.move_to_end(key)
+        return self[key]
+    
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.max_size:
+            self.popitem(last=False)
+
+
+class FileFilter:
+    """Which files in watched directories are read, by name and size."""
+    
+    def __init__(self, include: Optional[Iterable[str]] = None,
+                 extensions: Optional[Iterable[str]] = WATCHED_EXTENSIONS,
+                 exclude: Optional[Iterable[str]] = None,
+                 min_size: int = 0, max_size: Optional[int] = None):
+        """
+        Initialize file filter.
+        
+        Patterns are globs matched against the end of the path, so '*.rst'
+        matches by file name and 'notes/*.md' by its last directories too.
+        
+        Args:
+            include: Glob patterns of files to read
+            extensions: File extensions to read (in addition to include)
+            exclude: Glob patterns of files to skip even if included
+            min_size: Files smaller than this (in bytes) are skipped
+            max_size: Files larger than this (in bytes) are skipped
+        """
+        patterns = list(include or ())
+        patterns += [f"*.{extension.lstrip('.')}" for extension in extensions or ()]
+        # All patterns are compiled into one regex, so matching an event costs one search
+        self._include = self._compile(patterns)
+        self._exclude = self._compile(exclude or ())
+        self.min_size = min_size
+        self.max_size = max_size
+    
+    @staticmethod
+    def _compile(patterns: Iterable[str]):
+        patterns = [os.path.normcase(pattern).replace(os.sep, '/') for pattern in patterns]
+        if not patterns:
+            return None
+        return re.compile(r'(?:.*/)?(?:%s)' % '|'.join(fnmatch.translate(pattern) for pattern in patterns))
+    
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> "FileFilter":
+        """Create a filter from the 'monitoring' config section."""
+        config = config or {}
+        max_size_kb = config.get('max_size_kb')
+        return cls(
+            include=config.get('include'),
+            extensions=config.get('extensions', WATCHED_EXTENSIONS),
+            exclude=config.get('exclude'),
+            min_size=int(config.get('min_size_kb', 0) * 1024),
+            max_size=int(max_size_kb * 1024) if max_size_kb else None
+        )
+    
+    def matches(self, path_key: str) -> bool:
+        """Whether a normalized path passes the name filters."""
+        path = path_key.replace(os.sep, '/')
+        if self._include is None or not self._include.match(path):
+            return False
+        return self._exclude is None or not self._exclude.match(path)
+    
+    def size_ok(self, size: int) -> bool:
+        """Whether a file size passes the size filters."""
+        return size >= self.min_size and (self.max_size is None or size <= self.max_size)
 
 
 class FileChangeHandler(FileSystemEventHandler):
     """Handle file system events for monitored files."""
     
-    def __init__(self, callback: Callable[[str, str], None]):
+    def __init__(self, callback: Callable[[str, str], None], mode: str = 'diff',
+                 mmap_threshold: int = MMAP_THRESHOLD,
+                 document_callback: Optional[Callable[[str], None]] = None,
+                 large_file_bytes: int = 64 * 1024, debounce: float = DEBOUNCE_SECONDS,
+                 file_filter: Optional[FileFilter] = None, max_tracked_files: int = MAX_TRACKED_FILES):
         """
         Initialize file change handler.
         
         Args:
             callback: Function to call with file path and content
+            mode: 'full' (whole file), 'tail' (appended text) or 'diff' (appended or changed text)
+            mmap_threshold: Files at least this large are read through mmap
+            document_callback: Function to call with the path of a file whose new or
+                changed text is large (a large file read for the first time or rewritten)
+            large_file_bytes: Changes larger than this go to document_callback
+            debounce: Seconds a file must be quiet before it is read
+            file_filter: Which files in watched directories are read
+            max_tracked_files: Files whose state is remembered; older ones are read in
+                full on their next change
         """
+        if mode not in READ_MODES:
+            raise ValueError(f"Unknown file read mode: {mode}")
         self.callback = callback
-        self.last_modified = {}
+        self.mode = mode
+        self.mmap_threshold = mmap_threshold
+        self.document_callback = document_callback
+        self.large_file_bytes = large_file_bytes
+        self.debounce = debounce
+        self.filter = file_filter or FileFilter()
+        self.last_modified = BoundedDict(max_tracked_files)
+        self.file_states = BoundedDict(max_tracked_files)
+        
+        # Explicitly added files (always read) and watched directories (filtered),
+        # as normalized paths; directories map to whether they are recursive
+        self.files = set()
+        self.directories = {}
+        
+        # Paths waiting for their debounce window to pass, with the time it ends
+        self._pending = {}
+        self._condition = threading.Condition()
+        self._scheduler = None
+        self._stopped = False
+    
+    def add_file(self, file_path: str):
+        """Read changes to a file regardless of the filter."""
+        self.files.add(_path_key(file_path))
+    
+    def add_directory(self, directory_path: str, recursive: bool = True):
+        """Read changes to files in a directory that pass the filter."""
+        key = _path_key(directory_path)
+        self.directories[key] = recursive or self.directories.get(key, False)
+    
+    def _in_directory(self, key: str) -> bool:
+        """Whether a path lies in a watched directory (a lookup per ancestor, no scanning)."""
+        parent = os.path.dirname(key)
+        if parent in self.directories:
+            return True
+        while True:
+            key, parent = parent, os.path.dirname(parent)
+            if parent == key:
+                return False
+            if self.directories.get(parent):
+                return True
+    
+    def matches(self, file_path: str) -> bool:
+        """Whether events for a path should lead to a read."""
+        key = _path_key(file_path)
+        if key in self.files:
+            return True
+        return self.filter.matches(key) and self._in_directory(key)
+    
+    def _wants(self, event, path: str) -> bool:
+        return not event.is_directory and self.matches(path)
     
     def on_modified(self, event):
         """Handle file modification events."""
-        if not event.is_directory and event.src_path.endswith(('.txt', '.md', '.py', '.js', '.html')):
+        if self._wants(event, event.src_path):
+            self._schedule(event.src_path)
+    
+    def on_created(self, event):
+        """Handle file creation events (including delete-and-recreate saves)."""
+        if self._wants(event, event.src_path):
+            self._schedule(event.src_path)
+    
+    def on_moved(self, event):
+        """Handle renames; editors often save by renaming a temporary file over the target."""
+        if self._wants(event, event.dest_path):
+            self._schedule(event.dest_path)
+    
+    def _schedule(self, file_path: str):
+        """(Re)start the debounce window for a path; a burst of events leads to one read."""
+        with self._condition:
+            self._pending[file_path] = time.monotonic() + self.debounce
+            if self._scheduler is None:
+                self._scheduler = threading.Thread(target=self._run_scheduler,
+                                                   name="FileChangeDebounce", daemon=True)
+                self._scheduler.start()
+            self._condition.notify()
+    
+    def _next_due(self) -> Optional[str]:
+        """Wait until a pending path has been quiet for the debounce window (None when stopped)."""
+        with self._condition:
+            while not self._stopped:
+                if not self._pending:
+                    self._condition.wait()
+                    continue
+                file_path, deadline = min(self._pending.items(), key=lambda item: item[1])
+                delay = deadline - time.monotonic()
+                if delay <= 0:
+                    del self._pending[file_path]
+                    return file_path
+                self._condition.wait(delay)
+            return None
+    
+    def _run_scheduler(self):
+        """Process settled paths one at a time, so one file is never read twice concurrently."""
+        while True:
+            file_path = self._next_due()
+            if file_path is None:
+                return
+            self._process(file_path)
+    
+    def stop(self):
+        """Stop the debounce scheduler, dropping pending events."""
+        with self._condition:
+            self._stopped = True
+            self._pending.clear()
+            self._condition.notify_all()
+    
+    def _process(self, file_path: str):
+        """Read a settled file's new content and trigger callback."""
+        try:
             # Check if file was actually modified (not just accessed)
             try:
-                current_mtime = os.path.getmtime(event.src_path)
-                last_mtime = self.last_modified.get(event.src_path, 0)
+                stat = os.stat(file_path)
+            except FileNotFoundError:
+                return
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if self.last_modified.get(file_path) == signature:
+                return
+            if _path_key(file_path) not in self.files and not self.filter.size_ok(stat.st_size):
+                return
+            self.last_modified[file_path] = signature
+            
+            # Read the new or changed content and trigger callback
+            start, end, content = self.read_changes(file_path)
+            
+            # The document reader reads from the top, so small edits near it stay with callback
+            if self.document_callback and end - start > self.large_file_bytes:
+                print(f"File changed: {file_path}")
+                self.document_callback(file_path)
+            elif content.strip():
+                print(f"File changed: {file_path}")
+                self.callback(file_path, content)
                 
-                if current_mtime > last_mtime:
-                    self.last_modified[event.src_path] = current_mtime
-                    
-                    # Read file content and trigger callback
-                    try:
-                        with open(event.src_path, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                        
-                        if content.strip():
-                            print(f"File changed: {event.src_path}")
-                            self.callback(event.src_path, content)
-                    except Exception as e:
-                        print(f"Error reading file {event.src_path}: {e}")
-                        
-            except Exception as e:
-                print(f"Error handling file change for {event.src_path}: {e}")
+        except Exception as e:
+            print(f"Error handling file change for {file_path}: {e}")
+    
+    def _open_data(self, f, size: int):
+        """Whole-file buffer: an mmap for large files, bytes otherwise."""
+        if size >= self.mmap_threshold:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return f.read()
+    
+    def _tail_state(self, f, size: int) -> FileState:
+        f.seek(max(0, size - HASH_BLOCK_SIZE))
+        return FileState(size, _block_hash(f.read(size - f.tell())))
+    
+    def track(self, file_path: str):
+        """Record a file's current content as already read."""
+        if self.mode == 'full':
+            return
+        with open(file_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            state = self._tail_state(f, size)
+            if self.mode == 'diff':
+                f.seek(0)
+                data = self._open_data(f, size) if size else b''
+                try:
+                    state.line_hashes, _ = _scan_lines(data, size)
+                finally:
+                    if isinstance(data, mmap.mmap):
+                        data.close()
+            self.file_states[file_path] = state
+            self.last_modified[file_path] = (os.fstat(f.fileno()).st_mtime_ns, size)
+    
+    @staticmethod
+    def _changed_lines(old: array, new: array) -> Tuple[int, int]:
+        """First changed line and the end of the changed lines in the new content."""
+        prefix = 0
+        limit = min(len(old), len(new))
+        while prefix < limit and old[prefix] == new[prefix]:
+            prefix += 1
+        
+        suffix = 0
+        limit -= prefix
+        while suffix < limit and old[-1 - suffix] == new[-1 - suffix]:
+            suffix += 1
+        return prefix, len(new) - suffix
+    
+    def read_changes(self, file_path: str) -> Tuple[int, str]:
+        """
+        Read the part of a file that was not read before.
+        
+        In 'tail' mode that is everything after the previous end of file (or
+        the whole file if it was truncated or rewritten); in 'diff' mode it is
+        the lines from the first to the last changed line; in 'full' mode it
+        is the whole file.
+        
+        Returns:
+            (byte offset where the text starts, byte offset where it ends, text)
+        """
+        with open(file_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if self.mode == 'full' or not size:
+                self.file_states.pop(file_path, None)
+                data = f.read()
+                return 0, len(data), data.decode('utf-8', errors='replace')
+            
+            state = self.file_states.get(file_path)
+            if self.mode == 'tail':
+                start = 0
+                if state is not None and state.size <= size:
+                    f.seek(max(0, state.size - HASH_BLOCK_SIZE))
+                    if _block_hash(f.read(state.size - f.tell())) == state.tail_hash:
+                        start = state.size
+                f.seek(start)
+                data = f.read(size - start)
+                # A character still being written is read with the next change
+                end = start + utf8_boundary(data)
+                self.file_states[file_path] = self._tail_state(f, end)
+                return start, end, data[:end - start].decode('utf-8', errors='replace')
+            
+            new_state = self._tail_state(f, size)
+            f.seek(0)
+            data = self._open_data(f, size)
+            try:
+                new_state.line_hashes, offsets = _scan_lines(data, size)
+                self.file_states[file_path] = new_state
+                if state is None or state.line_hashes is None:
+                    return 0, size, bytes(data[:size]).decode('utf-8', errors='replace')
+                
+                first, last = self._changed_lines(state.line_hashes, new_state.line_hashes)
+                if first >= last:
+                    return size, size, ''
+                start = offsets[first]
+                end = offsets[last] if last < len(offsets) else size
+                return start, end, bytes(data[start:end]).decode('utf-8', errors='replace')
+            finally:
+                if isinstance(data, mmap.mmap):
+                    data.close()
 
 
 class FileMonitorTrigger:
     """Monitor files for changes and trigger TTS."""
     
-    def __init__(self, callback: Callable[[str, str], None]):
+    def __init__(self, callback: Callable[[str, str], None],
+                 document_callback: Optional[Callable[[str], None]] = None,
+                 large_file_bytes: int = 64 * 1024, mode: str = 'diff',
+                 mmap_threshold: int = MMAP_THRESHOLD, debounce: float = DEBOUNCE_SECONDS,
+                 file_filter: Optional[FileFilter] = None, max_tracked_files: int = MAX_TRACKED_FILES):
         """
         Initialize file monitor trigger.
         
         Args:
             callback: Function to call with file path and content
+            document_callback: Function to call with the path of a large file, which
+                is then read lazily instead of being loaded in one piece
+            large_file_bytes: Files (or changes) larger than this go to document_callback
+            mode: What is read on change: 'full', 'tail' (appended text) or 'diff' (changed lines)
+            mmap_threshold: Files at least this large are read through mmap
+            debounce: Seconds a file must be quiet before it is read (events are coalesced)
+            file_filter: Which files in watched directories are read
+            max_tracked_files: Upper bound on files whose read state is remembered
         """
         self.callback = callback
+        self.document_callback = document_callback
+        self.large_file_bytes = large_file_bytes
         self.observer = Observer()
-        self.handler = FileChangeHandler(callback)
+        self.handler = FileChangeHandler(callback, mode, mmap_threshold, document_callback,
+                                         large_file_bytes, debounce, file_filter, max_tracked_files)
         self.monitored_paths = []
+        
+        # One observer watch per directory: normalized path -> (watch, recursive)
+        self.watches = {}
+    
+    def _covered(self, key: str) -> bool:
+        """Whether a recursive watch on an ancestor already covers a directory."""
+        parent = os.path.dirname(key)
+        while parent != key:
+            watch = self.watches.get(parent)
+            if watch and watch[1]:
+                return True
+            key, parent = parent, os.path.dirname(parent)
+        return False
+    
+    def _watch(self, directory: str, recursive: bool):
+        """Schedule a watch on a directory unless an existing one already covers it."""
+        key = _path_key(directory)
+        current = self.watches.get(key)
+        if (current and (current[1] or not recursive)) or self._covered(key):
+            return
+        
+        if current:
+            # Upgrade a non-recursive watch in place
+            self.observer.unschedule(current[0])
+        if recursive:
+            # Watches on subdirectories are now redundant
+            prefix = os.path.join(key, '')
+            for other in [other for other in self.watches if other.startswith(prefix)]:
+                self.observer.unschedule(self.watches.pop(other)[0])
+        
+        watch = self.observer.schedule(self.handler, os.path.abspath(directory), recursive=recursive)
+        self.watches[key] = (watch, recursive)
     
     def add_file(self, file_path: str):
         """Add a file to monitor."""
         if os.path.exists(file_path):
+            # Event paths are absolute, so state is keyed by the absolute path
+            file_path = os.path.abspath(file_path)
             self.monitored_paths.append(file_path)
-            directory = os.path.dirname(file_path)
-            self.observer.schedule(self.handler, directory, recursive=False)
+            self.handler.add_file(file_path)
+            # Existing content counts as read; only later changes are spoken
+            self.handler.track(file_path)
+            self._watch(os.path.dirname(file_path), recursive=False)
             print(f"Monitoring file: {file_path}")
         else:
             print(f"File not found: {file_path}")
     
     def add_directory(self, directory_path: str, recursive: bool = True):
-        """Add a directory to monitor."""
-        if os.path.exists(directory_path):
-            self.observer.schedule(self.handler, directory_path, recursive=recursive)
+        """Add a directory to monitor (files are matched against the filter when they change)."""
+        if os.path.isdir(directory_path):
+            self.monitored_paths.append(os.path.abspath(directory_path))
+            self.handler.add_directory(directory_path, recursive)
+            self._watch(directory_path, recursive)
             print(f"Monitoring directory: {directory_path}")
         else:
             print(f"Directory not found: {directory_path}")
@@ -99,6 +518,7 @@ class FileMonitorTrigger:
     
     def stop_monitoring(self):
         """Stop monitoring files and directories."""
+        self.handler.stop()
         self.observer.stop()
         self.observer.join()
         print("File monitoring stopped.")
@@ -107,6 +527,10 @@ class FileMonitorTrigger:
         """Read a file immediately and trigger callback."""
         if os.path.exists(file_path):
             try:
+                if self.document_callback and os.path.getsize(file_path) > self.large_file_bytes:
+                    self.document_callback(file_path)
+                    return None
+                
                 with open(file_path, 'r', encoding='utf-8') as f:
                     content = f.read()
                 
@@ -7,20 +7,24 @@ This module provides functionality to trigger TTS using global hotkeys.
 import keyboard
 import pyperclip
 import time
+import threading
 from typing import Callable, Optional
 
 
 class HotkeyTrigger:
     """Trigger TTS using global hotkeys."""
     
-    def __init__(self, callback: Callable[[str], None]):
+    def __init__(self, callback: Callable[[str], None],
+                 stop_callback: Optional[Callable[[], None]] = None):
         """
         Initialize hotkey trigger.
         
         Args:
             callback: Function to call with selected text
+            stop_callback: Function to call when the stop hotkey is pressed
         """
         self.callback = callback
+        self.stop_callback = stop_callback
         self.running = False
         
         # Default hotkeys
@@ -74,7 +78,7 @@ class HotkeyTrigger:
             
             if text and text.strip():
                 print(f"Reading selected text: {text[:50]}...")
-                self.callback(text)
+                self._dispatch(text)
             else:
                 print("No text selected")
                 
@@ -88,18 +92,22 @@ class HotkeyTrigger:
             
             if text and text.strip():
                 print(f"Reading clipboard: {text[:50]}...")
-                self.callback(text)
+                self._dispatch(text)
             else:
                 print("Clipboard is empty")
                 
         except Exception as e:
             print(f"Error reading clipboard: {e}")
     
+    def _dispatch(self, text: str):
+        """Run the callback off the hotkey thread so stop and new reads stay responsive."""
+        threading.Thread(target=self.callback, args=(text,), daemon=True).start()
+    
     def _stop_audio(self):
         """Stop current audio playback."""
-        # This will be handled by the main application
         print("Stop audio requested")
-        # You can implement audio stopping logic here
+        if self.stop_callback:
+            self.stop_callback()
     
     def start_monitoring(self):
         """Start monitoring for hotkeys."""
@@ -4,20 +4,28 @@ Text Input Trigger for ReadAloud.
 This module provides functionality to trigger TTS from direct text input.
 """
 
+import os
 from typing import Callable, Optional
 
 
 class TextInputTrigger:
     """Trigger TTS from direct text input."""
     
-    def __init__(self, callback: Callable[[str], None]):
+    def __init__(self, callback: Callable[[str], None],
+                 document_callback: Optional[Callable[[str], None]] = None,
+                 large_file_bytes: int = 64 * 1024):
         """
         Initialize text input trigger.
         
         Args:
             callback: Function to call with input text
+            document_callback: Function to call with the path of a large file, which
+                is then read lazily instead of being loaded in one piece
+            large_file_bytes: Files larger than this go to document_callback
         """
         self.callback = callback
+        self.document_callback = document_callback
+        self.large_file_bytes = large_file_bytes
     
     def read_text(self, text: str):
         """Read text directly."""
@@ -51,6 +59,11 @@ class TextInputTrigger:
     def read_from_file(self, file_path: str):
         """Read text from a file."""
         try:
+            if self.document_callback and os.path.getsize(file_path) > self.large_file_bytes:
+                print(f"Reading document: {file_path}")
+                self.document_callback(file_path)
+                return
+            
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
             
@@ -5,9 +5,14 @@ This module defines the base class that all TTS engines must implement.
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple, Iterator, AsyncIterator, Union, Callable
+from collections import deque
 import os
+import shutil
+import asyncio
+import functools
 import tempfile
+import threading
 import subprocess
 import platform
 
@@ -15,6 +20,9 @@ import platform
 class TTSEngine(ABC):
     """Abstract base class for TTS engines."""
     
+    # Stable identifier used in cache keys and configuration
+    engine_id = "tts"
+    
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         self.config = config or {}
         self.is_available = self._check_availability()
@@ -41,6 +49,99 @@ class TTSEngine(ABC):
         """
         pass
     
+    def synthesize_pcm(self, text: str, voice: Optional[str] = None, **kwargs) -> Tuple[Any, int]:
+        """
+        Synthesize text to an in-memory buffer.
+        
+        Engines that can produce audio without a file override this; the
+        default goes through synthesize() and a temporary file.
+        
+        Returns:
+            (samples, sample_rate) with samples as a float32 NumPy array
+        """
+        from .audio_utils import read_wav
+        
+        fd, temp_path = tempfile.mkstemp(suffix='.wav')
+        os.close(fd)
+        try:
+            output_path = self.synthesize(text, output_path=temp_path, voice=voice, **kwargs)
+            return read_wav(output_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+    
+    def synthesize_stream(self, text: str, voice: Optional[str] = None, **kwargs) -> Iterator[Tuple[Any, int]]:
+        """
+        Synthesize text as a stream of audio chunks.
+        
+        Chunks are yielded as soon as they are produced so playback or an HTTP
+        response can start while the rest is still being generated. The
+        default implementation synthesizes one sentence-sized chunk at a time.
+        
+        Args:
+            text: Text to synthesize
+            voice: Voice to use (optional)
+            **kwargs: Engine-specific parameters
+            
+        Yields:
+            (samples, sample_rate) tuples in reading order
+        """
+        from .pipeline import split_into_chunks
+        
+        for chunk in split_into_chunks(text):
+            yield self.synthesize_pcm(chunk, voice=voice, **kwargs)
+    
+    async def synthesize_async(self, text: str, output_path: Optional[str] = None,
+                               voice: Optional[str] = None, **kwargs) -> str:
+        """
+        Asynchronous counterpart of synthesize().
+        
+        The default runs synthesize() in the event loop's executor; engines
+        backed by a subprocess or worker override this with non-blocking I/O.
+        
+        Returns:
+            Path to the generated audio file
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            None, functools.partial(self.synthesize, text, output_path, voice, **kwargs)
+        )
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # The executor thread cannot be interrupted; drop its output when it finishes
+            if output_path:
+                future.add_done_callback(lambda _: os.path.exists(output_path) and os.remove(output_path))
+            raise
+    
+    async def synthesize_stream_async(self, text: str, voice: Optional[str] = None,
+                                      **kwargs) -> AsyncIterator[Tuple[Any, int]]:
+        """
+        Asynchronous counterpart of synthesize_stream().
+        
+        The default advances synthesize_stream() in the event loop's executor.
+        
+        Yields:
+            (samples, sample_rate) tuples in reading order
+        """
+        loop = asyncio.get_running_loop()
+        iterator = self.synthesize_stream(text, voice=voice, **kwargs)
+        done = object()
+        step = None
+        try:
+            while True:
+                step = loop.run_in_executor(None, next, iterator, done)
+                chunk = await step
+                if chunk is done:
+                    break
+                yield chunk
+        finally:
+            if step is not None and not step.done():
+                # Cancelled mid-chunk: close the generator once the executor releases it
+                step.add_done_callback(lambda _: iterator.close())
+            else:
+                iterator.close()
+    
     @abstractmethod
     def get_available_voices(self) -> list:
         """Get list of available voices."""
@@ -50,41 +151,570 @@ class TTSEngine(ABC):
     def get_engine_info(self) -> Dict[str, str]:
         """Get information about the TTS engine."""
         pass
+    
+    def get_model_id(self) -> str:
+        """Identify the model in use (part of the synthesis cache key)."""
+        return ""
+
+
+class PlaybackHandle:
+    """Handle to one playback started by an audio player."""
+    
+    def __init__(self, on_stop: Optional[Callable[["PlaybackHandle"], None]] = None):
+        """
+        Initialize the handle.
+        
+        Args:
+            on_stop: Called by stop() to interrupt this playback only
+        """
+        self._on_stop = on_stop
+        self._done = threading.Event()
+        self.stopped = False
+    
+    def _finish(self):
+        self._done.set()
+    
+    @property
+    def done(self) -> bool:
+        """True once playback has finished or been stopped."""
+        return self._done.is_set()
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for playback to end; returns False on timeout."""
+        return self._done.wait(timeout)
+    
+    def stop(self):
+        """Interrupt this playback."""
+        if self._done.is_set():
+            return
+        self.stopped = True
+        if self._on_stop:
+            self._on_stop(self)
+        self._done.set()
 
 
-class AudioPlayer:
+def _wav_duration(audio_file: str) -> float:
+    """Duration of a WAV file in seconds."""
+    import wave
+    with wave.open(audio_file, 'rb') as wav:
+        return wav.getnframes() / float(wav.getframerate())
+
+
+class PlaybackEffects:
+    """Volume, speed and loudness settings applied to audio as it is played."""
+    
+    def __init__(self):
+        self.effects = {'volume': 1.0, 'speed': 1.0, 'normalize': False, 'target_db': -20.0}
+    
+    def set_effects(self, volume: float = 1.0, speed: float = 1.0, normalize: bool = False,
+                    target_db: float = -20.0):
+        """
+        Change playback effects; they apply from the next item played.
+        
+        Args:
+            volume: Linear gain
+            speed: Speed factor (pitch is preserved)
+            normalize: Normalize loudness to target_db
+            target_db: Loudness target in dBFS
+        """
+        self.effects = {'volume': volume, 'speed': speed, 'normalize': normalize, 'target_db': target_db}
+    
+    def set_effects_from_config(self, config: Dict[str, Any]):
+        """Apply the top-level 'volume' and 'speed' settings and the 'playback' section."""
+        playback = config.get('playback') or {}
+        self.set_effects(
+            volume=float(config.get('volume', 1.0)),
+            speed=float(config.get('speed', 1.0)),
+            normalize=playback.get('normalize', False),
+            target_db=playback.get('target_db', -20.0)
+        )
+    
+    @property
+    def effects_active(self) -> bool:
+        return (self.effects['volume'] != 1.0 or self.effects['speed'] != 1.0
+                or bool(self.effects['normalize']))
+    
+    def _apply_effects(self, samples, sample_rate: int):
+        """Run a buffer through the effect chain."""
+        if not self.effects_active:
+            return samples
+        from .audio_dsp import process
+        return process(samples, sample_rate, **self.effects)
+
+
+class AudioPlayer(PlaybackEffects):
     """Cross-platform audio player for TTS output."""
     
+    # Time a player process gets to exit on terminate before it is killed
+    STOP_GRACE = 0.05
+    
     def __init__(self):
+        super().__init__()
         self.system = platform.system().lower()
+        self._handles = set()
+        self._lock = threading.Lock()
+        # Files waiting behind the current one (see enqueue)
+        self._queue = deque()
+        self._queue_thread = None
         self._setup_player()
     
     def _setup_player(self):
         """Setup audio player based on operating system."""
         if self.system == "windows":
-            self.player_cmd = ["start", "/min", "wmplayer"]
+            # winsound plays WAV asynchronously and can be purged
+            self.player_cmd = None
         elif self.system == "darwin":  # macOS
             self.player_cmd = ["afplay"]
-        else:  # Linux
-            self.player_cmd = ["aplay"]
+        elif shutil.which("aplay") or not shutil.which("mpv"):  # Linux
+            self.player_cmd = ["aplay", "-q"]
+        else:
+            self.player_cmd = ["mpv", "--really-quiet", "--no-video"]
     
-    def play(self, audio_file: str):
-        """Play an audio file."""
+    def play(self, audio_file: str, block: bool = True, preempt: bool = False) -> PlaybackHandle:
+        """
+        Play an audio file.
+        
+        Args:
+            audio_file: WAV file to play
+            block: Wait until playback finishes (or is stopped)
+            preempt: Stop this player's current playback first (barge-in)
+            
+        Returns:
+            Handle that can stop this playback only
+        """
+        if preempt:
+            self.stop()
+        
+        from .audio_utils import format_for_path
+        
+        temp_file = None
         try:
-            if self.system == "windows":
-                subprocess.run(["start", audio_file], shell=True, check=True)
-            elif self.system == "darwin":
-                subprocess.run([*self.player_cmd, audio_file], check=True)
+            # System players only take WAV reliably; compressed cache entries are decoded first
+            if self.effects_active or format_for_path(audio_file) != 'wav':
+                temp_file = self._render(audio_file)
+            handle = self._start(temp_file or audio_file, temp_file)
+        except (OSError, RuntimeError, ValueError) as e:
+            print(f"Error playing audio: {e}")
+            if temp_file and os.path.exists(temp_file):
+                os.remove(temp_file)
+            handle = PlaybackHandle()
+            handle._finish()
+            return handle
+        
+        if block:
+            handle.wait()
+        return handle
+    
+    def enqueue(self, audio_file: str) -> PlaybackHandle:
+        """
+        Play an audio file after the files already enqueued, without waiting.
+        
+        The file is decoded now, and its player is started from the previous
+        file's completion, so consecutive files only pause for the process start.
+        
+        Args:
+            audio_file: Audio file to play
+            
+        Returns:
+            Handle that can stop (or unqueue) this file only
+        """
+        from .audio_utils import format_for_path
+        
+        temp_file = None
+        if self.effects_active or format_for_path(audio_file) != 'wav':
+            temp_file = self._render(audio_file)
+        
+        def stop_playback(queued):
+            if queued.playback:
+                queued.playback.stop()
+        
+        handle = PlaybackHandle(stop_playback)
+        handle.playback = None
+        with self._lock:
+            self._queue.append((handle, temp_file or audio_file, temp_file))
+            if self._queue_thread is None:
+                self._queue_thread = threading.Thread(target=self._play_queue, name="AudioQueue", daemon=True)
+                self._queue_thread.start()
+        return handle
+    
+    def _play_queue(self):
+        """Play enqueued files one after another."""
+        while True:
+            with self._lock:
+                if not self._queue:
+                    self._queue_thread = None
+                    return
+                handle, audio_file, temp_file = self._queue.popleft()
+            
+            if not handle.stopped:
+                try:
+                    handle.playback = self._start(audio_file, temp_file)
+                    temp_file = None  # removed by the player when playback ends
+                    if handle.stopped:
+                        # Stopped while the player was starting
+                        handle.playback.stop()
+                    handle.playback.wait()
+                except (OSError, RuntimeError, ValueError) as e:
+                    print(f"Error playing audio: {e}")
+            
+            if temp_file and os.path.exists(temp_file):
+                os.remove(temp_file)
+            handle._finish()
+    
+    def _render(self, audio_file: str) -> str:
+        """Write a decoded, processed WAV copy for the system player (removed after playback)."""
+        from .audio_utils import read_wav, write_wav
+        
+        samples, sample_rate = read_wav(audio_file)
+        fd, temp_file = tempfile.mkstemp(suffix='.wav')
+        os.close(fd)
+        write_wav(temp_file, self._apply_effects(samples, sample_rate), sample_rate)
+        return temp_file
+    
+    def _start(self, audio_file: str, temp_file: Optional[str] = None) -> PlaybackHandle:
+        """Start playback in the background."""
+        if self.player_cmd is None:
+            import winsound
+            
+            timer = None
+            
+            def purge(handle):
+                if timer:
+                    timer.cancel()
+                # A None sound stops whatever winsound is playing
+                winsound.PlaySound(None, 0)
+                # The cancelled timer no longer does this
+                self._finished(handle)
+            
+            handle = self._track(PlaybackHandle(purge), temp_file)
+            winsound.PlaySound(audio_file, winsound.SND_FILENAME | winsound.SND_ASYNC | winsound.SND_NODEFAULT)
+            # winsound does not report completion; finish after the file's duration
+            timer = threading.Timer(_wav_duration(audio_file), self._finished, args=(handle,))
+            timer.daemon = True
+            timer.start()
+            return handle
+        
+        process = subprocess.Popen(
+            [*self.player_cmd, audio_file],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE
+        )
+        
+        def terminate(_handle):
+            process.terminate()
+            try:
+                process.wait(self.STOP_GRACE)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        
+        handle = self._track(PlaybackHandle(terminate), temp_file)
+        
+        def watch():
+            stderr = process.communicate()[1]
+            if process.returncode and not handle.stopped:
+                print(f"Error playing audio: {stderr.decode(errors='replace').strip() or process.returncode}")
+            self._finished(handle)
+        
+        threading.Thread(target=watch, name="AudioPlayer", daemon=True).start()
+        return handle
+    
+    def _track(self, handle: PlaybackHandle, temp_file: Optional[str] = None) -> PlaybackHandle:
+        handle.temp_file = temp_file
+        with self._lock:
+            self._handles.add(handle)
+        return handle
+    
+    def _finished(self, handle: PlaybackHandle):
+        handle._finish()
+        with self._lock:
+            self._handles.discard(handle)
+        if handle.temp_file and os.path.exists(handle.temp_file):
+            os.remove(handle.temp_file)
+    
+    @property
+    def is_playing(self) -> bool:
+        with self._lock:
+            return bool(self._handles) or bool(self._queue)
+    
+    def stop(self):
+        """Stop every playback started by this player (other processes are left alone)."""
+        with self._lock:
+            handles = list(self._handles) + [queued[0] for queued in self._queue]
+            self._handles.clear()
+        
+        # Queued files are skipped once their handles are stopped
+        for handle in handles:
+            handle.stop()
+
+
+class _QueuedAudio:
+    """Audio waiting in or playing from a StreamingAudioPlayer."""
+    
+    def __init__(self, handle: PlaybackHandle):
+        self.handle = handle
+        self.blocks = deque()
+        # False while a decoder thread is still appending blocks
+        self.complete = False
+
+
+class StreamingAudioPlayer(PlaybackEffects):
+    """
+    In-process audio player that keeps one output stream open.
+    
+    Audio is queued as files or (samples, sample_rate) buffers and played
+    back-to-back from the stream callback, so there is no per-utterance
+    process spawn or device open and consecutive items play without gaps.
+    Requires the optional sounddevice package.
+    """
+    
+    def __init__(self, sample_rate: Optional[int] = None, channels: int = 1, blocksize: int = 512,
+                 device: Optional[Union[int, str]] = None):
+        """
+        Initialize the player.
+        
+        Args:
+            sample_rate: Stream rate; defaults to the rate of the first item played
+            channels: Output channels
+            blocksize: Frames per callback (bounds stop/pause latency)
+            device: Output device (sounddevice default if None)
+        """
+        try:
+            import sounddevice
+        except ImportError:
+            raise RuntimeError("sounddevice is not installed. Install with: pip install sounddevice")
+        
+        super().__init__()
+        self._sd = sounddevice
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.blocksize = blocksize
+        self.device = device
+        self._stream = None
+        self._queue = deque()
+        self._current = None
+        self._position = 0
+        self._paused = False
+        self._lock = threading.Lock()
+    
+    def _convert(self, samples, sample_rate: int, resampler=None) -> Any:
+        """
+        Convert a buffer to the stream's rate and channel layout.
+        
+        Args:
+            samples: Audio buffer
+            sample_rate: Its sample rate
+            resampler: StreamResampler of the file when samples is one of its blocks
+        """
+        import numpy as np
+        from .audio_utils import resample
+        
+        if self.sample_rate is None:
+            self.sample_rate = int(sample_rate)
+        
+        if samples.ndim > 1:
+            samples = samples.mean(axis=1)
+        # TTS engines differ in output rate (22.05k vs 24k)
+        if resampler is not None:
+            samples = resampler.process(samples)
+        else:
+            samples = resample(samples, sample_rate, self.sample_rate)
+        return np.repeat(samples[:, None], self.channels, axis=1)
+    
+    def _load(self, source) -> Any:
+        """Read a whole file or buffer, apply effects and convert it to the stream's format."""
+        from .audio_utils import read_wav, to_float32
+        
+        if isinstance(source, (str, os.PathLike)):
+            samples, sample_rate = read_wav(source)
+        else:
+            samples, sample_rate = source
+            samples = to_float32(samples)
+        
+        return self._convert(self._apply_effects(samples, sample_rate), sample_rate)
+    
+    def _feed(self, item: _QueuedAudio, blocks: Iterator, resampler):
+        """Decode the rest of a file into a queued item (decoder thread)."""
+        try:
+            for samples, sample_rate in blocks:
+                if item.handle.done:
+                    break
+                converted = self._convert(samples, sample_rate, resampler)
+                with self._lock:
+                    item.blocks.append(converted)
+        except Exception as e:
+            print(f"Error decoding audio: {e}")
+        finally:
+            item.complete = True
+    
+    def _ensure_stream(self):
+        if self._stream is None:
+            self._stream = self._sd.OutputStream(
+                samplerate=self.sample_rate,
+                channels=self.channels,
+                dtype='float32',
+                blocksize=self.blocksize,
+                device=self.device,
+                callback=self._callback
+            )
+            self._stream.start()
+    
+    def _callback(self, outdata, frames, time_info, status):
+        """Fill the output block from the queue (runs on the audio thread)."""
+        filled = 0
+        with self._lock:
+            while filled < frames and not self._paused:
+                if self._current is None:
+                    if not self._queue:
+                        break
+                    self._current = self._queue.popleft()
+                    self._position = 0
+                
+                item = self._current
+                if not item.blocks:
+                    if item.complete:
+                        item.handle._finish()
+                        self._current = None
+                        continue
+                    # Decoder is behind: pad this block with silence
+                    break
+                
+                samples = item.blocks[0]
+                count = min(frames - filled, len(samples) - self._position)
+                outdata[filled:filled + count] = samples[self._position:self._position + count]
+                filled += count
+                self._position += count
+                
+                if self._position >= len(samples):
+                    item.blocks.popleft()
+                    self._position = 0
+        
+        outdata[filled:] = 0
+    
+    def _remove(self, handle: PlaybackHandle):
+        """Drop one item, whether queued or playing."""
+        with self._lock:
+            if self._current is not None and self._current.handle is handle:
+                self._current = None
             else:
-                subprocess.run([*self.player_cmd, audio_file], check=True)
-        except subprocess.CalledProcessError as e:
+                self._queue = deque(item for item in self._queue if item.handle is not handle)
+    
+    def enqueue(self, source) -> PlaybackHandle:
+        """
+        Queue audio without waiting for it to play.
+        
+        Args:
+            source: Audio file path or (samples, sample_rate) tuple
+            
+        Returns:
+            Handle that can stop this item only
+        """
+        from .audio_utils import format_for_path, iter_blocks, StreamResampler
+        
+        handle = PlaybackHandle(self._remove)
+        item = _QueuedAudio(handle)
+        
+        if (isinstance(source, (str, os.PathLike)) and format_for_path(source) != 'wav'
+                and not self.effects_active):
+            # Compressed files play while the rest is still being decoded
+            blocks = iter_blocks(source)
+            samples, sample_rate = next(blocks)
+            # One resampler for the whole file keeps block boundaries continuous
+            resampler = StreamResampler(sample_rate, self.sample_rate or int(sample_rate))
+            item.blocks.append(self._convert(samples, sample_rate, resampler))
+            threading.Thread(target=self._feed, args=(item, blocks, resampler), name="AudioDecoder",
+                             daemon=True).start()
+        else:
+            item.blocks.append(self._load(source))
+            item.complete = True
+        
+        with self._lock:
+            self._queue.append(item)
+        self._ensure_stream()
+        return handle
+    
+    def play(self, source, block: bool = True, preempt: bool = False) -> PlaybackHandle:
+        """
+        Play audio after anything already queued.
+        
+        Args:
+            source: Audio file path or (samples, sample_rate) tuple
+            block: Wait until the audio has finished playing
+            preempt: Drop current and queued audio first (barge-in)
+            
+        Returns:
+            Handle that can stop this item only
+        """
+        if preempt:
+            self.stop()
+        
+        try:
+            handle = self.enqueue(source)
+        except Exception as e:
             print(f"Error playing audio: {e}")
+            handle = PlaybackHandle()
+            handle._finish()
+            return handle
+        
+        if block:
+            handle.wait()
+        return handle
+    
+    def pause(self):
+        """Pause playback, keeping the queue and position."""
+        self._paused = True
+    
+    def resume(self):
+        """Resume paused playback."""
+        self._paused = False
+    
+    @property
+    def is_playing(self) -> bool:
+        with self._lock:
+            return not self._paused and (self._current is not None or bool(self._queue))
     
     def stop(self):
-        """Stop current audio playback."""
-        # This is a basic implementation - could be enhanced with process management
-        if self.system == "darwin":
-            subprocess.run(["pkill", "-f", "afplay"], check=False)
-        elif self.system == "linux":
-            subprocess.run(["pkill", "-f", "aplay"], check=False)
-        # Windows doesn't have a simple way to stop wmplayer from command line
+        """Stop immediately and drop everything queued."""
+        with self._lock:
+            pending = list(self._queue)
+            if self._current is not None:
+                pending.append(self._current)
+            self._queue.clear()
+            self._current = None
+            self._paused = False
+        
+        for item in pending:
+            item.handle.stop()
+    
+    def close(self):
+        """Stop playback and release the output device."""
+        self.stop()
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+
+def create_audio_player(config: Optional[Dict[str, Any]] = None):
+    """
+    Create the audio player for a 'playback' configuration section.
+    
+    The streaming player is used when sounddevice and an output device are
+    available (backend 'auto' or 'stream'); otherwise, or with backend
+    'subprocess', files are played through the system player.
+    """
+    config = config or {}
+    backend = config.get('backend', 'auto')
+    
+    if backend in ('auto', 'stream'):
+        try:
+            player = StreamingAudioPlayer(
+                blocksize=config.get('blocksize', 512),
+                device=config.get('device')
+            )
+            # Fail now rather than on first playback if there is no output device
+            player._sd.check_output_settings(device=player.device, channels=player.channels)
+            return player
+        except Exception as e:
+            if backend == 'stream':
+                print(f"Streaming audio player not available: {e}")
+    
+    return AudioPlayer()
@@ -12,8 +12,9 @@ from pathlib import Path
 from flask import Flask, render_template, request, jsonify, send_from_directory
 import webbrowser
 
-# Add the project root to Python path
+# Add the project root to Python path (and its parent, for the readaloud package)
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 app = Flask(__name__)
 
@@ -25,6 +26,9 @@ current_config = {}
 higgs_service = None
 higgs_service_thread = None
 
+# Shared audio player (keeps one output stream open when sounddevice is available)
+audio_player = None
+
 def load_config():
     """Load configuration from file"""
     global current_config
@@ -230,7 +234,9 @@ def api_tts():
                 }), 500
         
         elif action == 'stop':
-            # Stop current audio
+            # Stop current audio (only playback started by this interface)
+            if audio_player:
+                audio_player.stop()
             return jsonify({
                 'status': 'success',
                 'message': 'Audio stopped'
@@ -344,10 +350,20 @@ def start_higgs_service():
     
     try:
         # Import the service class
-        from higgs_service import HiggsAudioService
+        from readaloud.higgs_service import HiggsAudioService
         
         # Create and start service
-        higgs_service = HiggsAudioService()
+        higgs_config = current_config.get('higgs_config', {})
+        higgs_service = HiggsAudioService({
+            'model_path': higgs_config.get('model_path', 'H:/AI/higgs/higgs-audio'),
+            'model_name': higgs_config.get('model_name'),
+            'python_path': higgs_config.get('python_path', 'python'),
+            'output_dir': os.path.abspath(current_config.get('audio_output_path', './audio_output')),
+            'temperature': current_config.get('temperature', 0.3),
+            'max_queue_depth': higgs_config.get('max_queue_depth', 16),
+            'workers': higgs_config.get('workers', 1),
+            'threads_per_worker': higgs_config.get('threads_per_worker')
+        })
         higgs_service.start_service()
         
         # Start service monitoring in background thread
@@ -372,6 +388,7 @@ def stop_higgs_service():
     
     if higgs_service:
         higgs_service._stop = True
+        higgs_service.stop_service()
         higgs_service = None
     
     if higgs_service_thread:
@@ -386,22 +403,37 @@ def get_higgs_service_status():
         return {
             'running': False,
             'ready': False,
+            'warm': False,
             'processing': False,
             'status': 'Not running'
         }
     
     try:
         status = higgs_service.get_status()
+        workers = status.get('workers', [])
+        failed = [w for w in workers if w.get('state') in ('failed', 'exited')]
+        if status.get('ready', False):
+            state = 'Ready' if status.get('warm', False) else 'Ready (cold)'
+        elif failed and len(failed) == len(workers):
+            state = f"Worker {failed[0]['state']}: {failed[0].get('error')}"
+        else:
+            state = 'Loading model...'
         return {
             'running': True,
             'ready': status.get('ready', False),
+            'warm': status.get('warm', False),
             'processing': status.get('processing', False),
-            'status': 'Ready' if status.get('ready', False) else 'Loading model...'
+            'queue_depth': status.get('queue_depth', 0),
+            'avg_wait_time': status.get('avg_wait_time', 0.0),
+            'utilization': status.get('utilization', 0.0),
+            'workers': workers,
+            'status': state
         }
     except Exception as e:
         return {
             'running': True,
             'ready': False,
+            'warm': False,
             'processing': False,
             'status': f'Error: {str(e)}'
         }
@@ -409,6 +441,13 @@ def get_higgs_service_status():
 def _call_tts_engine(text):
     """Call the TTS engine to synthesize text"""
     try:
+        from readaloud.text_processing import TextProcessor
+        
+        # Strip markup and URLs, spell out numbers and abbreviations
+        text = TextProcessor.from_config(current_config.get('text_processing')).normalize(text)
+        if not text:
+            return {'success': False, 'error': 'No readable text'}
+        
         # Get the current TTS engine configuration
         engine = current_config.get('tts_engine', 'higgs_audio')
         
@@ -422,19 +461,39 @@ def _call_tts_engine(text):
     except Exception as e:
         return {'success': False, 'error': str(e)}
 
+def _get_audio_cache():
+    """Synthesis cache shared with the CLI and the Higgs service"""
+    from readaloud.audio_cache import AudioCache
+    
+    output_dir = os.path.abspath(current_config.get('audio_output_path', './audio_output'))
+    return AudioCache.from_config(current_config.get('cache'), os.path.join(output_dir, 'cache'))
+
 def _call_higgs_audio(text):
     """Call Higgs Audio TTS engine"""
     try:
+        from readaloud.audio_cache import key_for
+        
+        # Replay cached audio for text that was already spoken
+        cache = _get_audio_cache()
+        higgs_config = current_config.get('higgs_config', {})
+        cache_key = key_for(
+            'higgs_audio',
+            higgs_config,
+            text,
+            temperature=current_config.get('temperature', 0.3)
+        )
+        cached = cache.get(cache_key)
+        if cached:
+            print("♻️  Using cached audio...")
+            _play_audio(cached)
+            return {'success': True, 'audio_file': cached, 'cached': True}
+        
         # First, try to use the persistent service if available
         if higgs_service and higgs_service.is_ready:
             print("🎵 Using persistent Higgs Audio service...")
             
-            # Generate unique filename
-            import uuid
-            audio_filename = f"output_{uuid.uuid4().hex[:8]}.wav"
-            
-            # Use the service
-            result = higgs_service.generate_tts(text, audio_filename)
+            # Use the service; new audio lands in the shared cache
+            result = higgs_service.generate_tts(text)
             
             if result['success']:
                 # Play the audio
@@ -443,7 +502,22 @@ def _call_higgs_audio(text):
             else:
                 return result
         
-        # Fallback to direct script call if service not available
+        # Next, use a standalone service (start_higgs_service.bat) if one is listening
+        try:
+            from readaloud.higgs_client import request_tts, ServiceUnavailable
+            
+            result = request_tts(text)
+            print("🎵 Using standalone Higgs Audio service...")
+            if result.get('success'):
+                # Keep a copy in our cache; the service owns its own file
+                result['audio_file'] = cache.put(cache_key, result['audio_file'], move=False)
+                _play_audio(result['audio_file'])
+                return result
+            print(f"⚠️  Standalone service failed: {result.get('error')}")
+        except ServiceUnavailable:
+            pass
+        
+        # Fallback to direct script call if no service produced audio
         print("⚠️  Persistent service not available, using direct script...")
         
         # Get Higgs Audio configuration
@@ -489,6 +563,8 @@ def _call_higgs_audio(text):
         )
         
         if result.returncode == 0 and os.path.exists(audio_path):
+            audio_path = cache.put(cache_key, audio_path)
+            
             # Play the audio
             _play_audio(audio_path)
             return {'success': True, 'audio_file': audio_path}
@@ -505,26 +581,24 @@ def _call_coqui_tts(text):
     """Call Coqui TTS engine (placeholder)"""
     return {'success': False, 'error': 'Coqui TTS not yet implemented'}
 
+def _get_audio_player():
+    """Create the shared audio player on first use"""
+    global audio_player
+    
+    if audio_player is None:
+        from readaloud.tts_engine import create_audio_player
+        audio_player = create_audio_player(current_config.get('playback'))
+    return audio_player
+
 def _play_audio(audio_path):
     """Play the generated audio file"""
     try:
-        import subprocess
-        import platform
+        player = _get_audio_player()
+        # Volume and speed apply at playback, so slider changes need no re-synthesis
+        player.set_effects_from_config(current_config)
         
-        system = platform.system()
-        
-        if system == "Windows":
-            # Use Windows start command
-            subprocess.run(['start', audio_path], shell=True, check=True)
-        elif system == "Darwin":  # macOS
-            # Use afplay
-            subprocess.run(['afplay', audio_path], check=True)
-        else:  # Linux
-            # Use aplay or mpv
-            try:
-                subprocess.run(['aplay', audio_path], check=True)
-            except FileNotFoundError:
-                subprocess.run(['mpv', audio_path], check=True)
+        barge_in = current_config.get('playback', {}).get('barge_in', True)
+        player.play(audio_path, preempt=barge_in)
                 
     except Exception as e:
         print(f"Warning: Could not play audio: {e}")